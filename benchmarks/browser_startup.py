@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Measure what a browser server saves: scraper browser startup when launching Chromium vs attaching to a warm one
+"""
+import argparse
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import config
+from src.browser_server import BrowserServer
+from src.page_pool import PagePool, find_free_port
+
+def startup(pool_size: int, endpoint=None) -> float:
+    """Seconds from creating a page pool to its first blank page loaded, as a scraper pays before each run"""
+    start = time.perf_counter()
+    pool = PagePool(size=pool_size, headless=True, endpoint=endpoint)
+    try:
+        pool.run(lambda page: page.goto('about:blank'))
+        return time.perf_counter() - start
+    finally:
+        pool.close()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--repeat', type=int, default=5, help='Startups per mode')
+    parser.add_argument('--pool-size', type=int, default=config.PAGE_POOL_SIZE, help='Pages per scraper')
+    args = parser.parse_args()
+
+    state_dir = tempfile.TemporaryDirectory()
+    server = BrowserServer(port=find_free_port(), headless=True, state_file=Path(state_dir.name) / "server.json")
+    try:
+        cold = [startup(args.pool_size) for _ in range(args.repeat)]
+        server.start()
+        warm = [startup(args.pool_size, server.endpoint) for _ in range(args.repeat)]
+    except Exception as e:
+        print(f"Browser startup comparison skipped: {str(e).splitlines()[0]}")
+        return
+    finally:
+        server.close()
+        state_dir.cleanup()
+
+    print(f"{'mode':<10}{'median ms':>12}{'min ms':>10}{'max ms':>10}")
+    for name, runs in (('launch', cold), ('attach', warm)):
+        print(f"{name:<10}{statistics.median(runs) * 1000:>12.0f}{min(runs) * 1000:>10.0f}{max(runs) * 1000:>10.0f}")
+    saved = statistics.median(cold) - statistics.median(warm)
+    print(f"Attaching saves {saved * 1000:.0f} ms ({saved / statistics.median(cold):.0%}) per scraper startup "
+          f"with {args.pool_size} page(s)")
+
+if __name__ == '__main__':
+    main()
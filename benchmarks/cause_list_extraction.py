@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Benchmark cause list extraction: per-cell Playwright calls against one round trip
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import config
+from src.parsers import parse_cause_list, CAUSE_LIST_CONTAINER
+
+def synthetic_page(rows: int) -> str:
+    """cause_list_page.html with a result table of the given size"""
+    with open(config.BASE_DIR / "cause_list_page.html", encoding='utf-8') as f:
+        html = f.read()
+    body = ''.join(
+        f"<tr><td>{i}</td><td>O.S./{i}/2024</td><td>Petitioner {i}</td>"
+        f"<td>Respondent {i}</td><td>Advocate {i}</td></tr>"
+        for i in range(1, rows + 1)
+    )
+    table = f"<table><tr><th>Sr No</th><th>Case</th><th>Petitioner</th><th>Respondent</th><th>Advocate</th></tr>{body}</table>"
+    return html.replace('<div id="res_cause_list"></div>', f'<div id="res_cause_list">{table}</div>')
+
+def per_cell(page) -> int:
+    """The previous extraction: one browser call per row and per cell"""
+    count = 0
+    for row in page.query_selector_all(f"{CAUSE_LIST_CONTAINER} table tr")[1:]:
+        cells = row.query_selector_all("td")
+        if len(cells) >= 3:
+            [cell.inner_text().strip() for cell in cells[:5]]
+            count += 1
+    return count
+
+def single_round_trip(page) -> int:
+    """The current extraction: one inner_html call, parsed in Python"""
+    html = page.inner_html(CAUSE_LIST_CONTAINER)
+    return len(parse_cause_list(html, "", "", "", "", "Civil").entries)
+
+def best_time(func, *args, repeat: int = 3):
+    """Fastest of several runs, with the last result"""
+    best, result = float('inf'), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=500, help='Rows in the synthetic cause list')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per method; the fastest is reported')
+    args = parser.parse_args()
+
+    html = synthetic_page(args.rows)
+    seconds, cause_list = best_time(parse_cause_list, html, "", "", "", "", "Civil", repeat=args.repeat)
+    print(f"{args.rows} rows, Python parse of full page: {seconds * 1000:8.1f} ms ({len(cause_list.entries)} entries)")
+
+    try:
+        from playwright.sync_api import sync_playwright
+        with sync_playwright() as playwright:
+            browser = playwright.chromium.launch(headless=True)
+            page = browser.new_page()
+            # The fixture references portal scripts and styles; keep the benchmark offline
+            page.route("**/*", lambda route: route.abort())
+            page.set_content(html, wait_until='domcontentloaded')
+
+            old, old_count = best_time(per_cell, page, repeat=args.repeat)
+            new, new_count = best_time(single_round_trip, page, repeat=args.repeat)
+            browser.close()
+    except Exception as e:
+        print(f"Browser comparison skipped: {str(e).splitlines()[0]}")
+        return
+
+    print(f"{args.rows} rows, per-cell inner_text calls:  {old * 1000:8.1f} ms ({old_count} entries)")
+    print(f"{args.rows} rows, one inner_html + parse:     {new * 1000:8.1f} ms ({new_count} entries)")
+    print(f"Speedup: {old / new:.1f}x")
+
+if __name__ == '__main__':
+    main()
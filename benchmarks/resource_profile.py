@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Measure what a resource profile saves: requests, bytes transferred and load time of the portal pages
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import config
+from src.page_pool import context_options
+from src.resource_profile import PROFILES, blocked_patterns
+
+PAGES = {
+    'cnr_search': config.ECOURTS_CNR_SEARCH_URL,
+    'cause_list': config.ECOURTS_CAUSELIST_URL,
+}
+
+def load(browser, url: str, profile: str) -> dict:
+    """Load a page in a fresh context; returns requests made, blocked, bytes transferred and seconds"""
+    context = browser.new_context(**context_options())
+    page = context.new_page()
+    session = context.new_cdp_session(page)
+    session.send("Network.enable")
+    session.send("Network.setBlockedURLs", {"urls": list(blocked_patterns(profile))})
+
+    stats = {'requests': 0, 'blocked': 0, 'bytes': 0}
+    session.on("Network.requestWillBeSent", lambda event: stats.update(requests=stats['requests'] + 1))
+    session.on("Network.loadingFinished", lambda event: stats.update(bytes=stats['bytes'] + event['encodedDataLength']))
+    session.on("Network.loadingFailed", lambda event: stats.update(
+        blocked=stats['blocked'] + (event.get('blockedReason') is not None
+                                    or event.get('errorText') == 'net::ERR_BLOCKED_BY_CLIENT')))
+
+    start = time.perf_counter()
+    page.goto(url, wait_until='load')
+    stats['seconds'] = time.perf_counter() - start
+    context.close()
+    return stats
+
+def average(runs: list) -> dict:
+    return {key: sum(run[key] for run in runs) / len(runs) for key in runs[0]}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--profile', choices=[name for name in PROFILES if name != 'off'],
+                        default=config.RESOURCE_PROFILE if config.RESOURCE_PROFILE != 'off' else 'lean',
+                        help='Profile to compare against loading everything')
+    parser.add_argument('--repeat', type=int, default=3, help='Loads per page and profile')
+    args = parser.parse_args()
+
+    try:
+        from playwright.sync_api import sync_playwright
+        with sync_playwright() as playwright:
+            browser = playwright.chromium.launch(headless=True, args=config.BROWSER_ARGS)
+            results = {
+                (name, profile): average([load(browser, url, profile) for _ in range(args.repeat)])
+                for name, url in PAGES.items() for profile in ('off', args.profile)
+            }
+            browser.close()
+    except Exception as e:
+        print(f"Resource profile comparison skipped: {str(e).splitlines()[0]}")
+        return
+
+    print(f"{'page':<12}{'profile':<10}{'requests':>10}{'blocked':>9}{'KiB':>10}{'load ms':>10}")
+    for (name, profile), stats in results.items():
+        print(f"{name:<12}{profile:<10}{stats['requests']:>10.1f}{stats['blocked']:>9.1f}"
+              f"{stats['bytes'] / 1024:>10.1f}{stats['seconds'] * 1000:>10.0f}")
+    for name in PAGES:
+        full, lean = results[(name, 'off')], results[(name, args.profile)]
+        print(f"{name}: {args.profile} saves {full['bytes'] - lean['bytes']:,.0f} bytes "
+              f"({1 - lean['bytes'] / max(full['bytes'], 1):.0%}) and {lean['blocked']:.0f} requests per load, "
+              f"{(full['seconds'] - lean['seconds']) * 1000:.0f} ms")
+
+if __name__ == '__main__':
+    main()
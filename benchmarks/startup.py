@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Measure CLI startup: wall time of cheap invocations and what they import (python -X importtime)
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Sequence
+
+ROOT = Path(__file__).parent.parent
+
+# Packages only the scraping code paths should load
+HEAVY = ('playwright', 'cv2', 'numpy', 'pytesseract', 'PIL', 'bs4', 'lxml', 'tesserocr')
+
+COMMANDS = {
+    'python': ['-c', 'pass'],
+    'cli --help': ['cli.py', '--help'],
+    'cli (no args)': ['cli.py'],
+}
+
+def import_times(args: Sequence[str]) -> Dict[str, int]:
+    """Cumulative import time in microseconds of every module a Python invocation loads"""
+    completed = subprocess.run([sys.executable, '-X', 'importtime', *args], cwd=ROOT,
+                               capture_output=True, text=True)
+    times = {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        times[name.strip()] = int(cumulative)
+    return times
+
+def heavy_imports(times: Dict[str, int]) -> List[str]:
+    """Heavy packages among the imported modules"""
+    return sorted({name.split('.')[0] for name in times} & set(HEAVY))
+
+def wall_time(args: Sequence[str], repeat: int = 5) -> float:
+    """Median seconds to run a Python invocation to completion"""
+    runs = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, *args], cwd=ROOT, capture_output=True)
+        runs.append(time.perf_counter() - start)
+    return statistics.median(runs)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--repeat', type=int, default=5, help='Runs per command')
+    parser.add_argument('--top', type=int, default=10, help='Slowest imports to list for cli --help')
+    parser.add_argument('--max-ms', type=float,
+                        help='Exit with status 1 if cli --help takes longer than this beyond bare Python')
+    args = parser.parse_args()
+
+    walls = {name: wall_time(command, args.repeat) for name, command in COMMANDS.items()}
+    print(f"{'command':<16}{'median ms':>10}")
+    for name, seconds in walls.items():
+        print(f"{name:<16}{seconds * 1000:>10.0f}")
+
+    times = import_times(COMMANDS['cli --help'])
+    print("\nSlowest imports for cli --help (cumulative ms):")
+    for name, micros in sorted(times.items(), key=lambda item: -item[1])[:args.top]:
+        print(f"  {micros / 1000:>8.1f}  {name}")
+    heavy = heavy_imports(times)
+    print(f"\nHeavy packages loaded: {', '.join(heavy) or 'none'}")
+
+    overhead = (walls['cli --help'] - walls['python']) * 1000
+    print(f"cli --help costs {overhead:.0f} ms on top of starting Python")
+    if args.max_ms is not None and overhead > args.max_ms:
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+Offline benchmark suite for the parsing, serialization and CAPTCHA solving hot paths
+
+Runs over the checked-in HTML fixtures and synthetic CAPTCHA images, so it needs
+no browser or network. Save a baseline before a change and compare after it:
+
+    python benchmarks/suite.py --save
+    python benchmarks/suite.py --compare
+"""
+import argparse
+import io
+import itertools
+import json
+import logging
+import platform
+import random
+import string
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from PIL import Image, ImageDraw
+import config
+from benchmarks.cause_list_extraction import synthetic_page
+from src.captcha_solver import CaptchaSolver
+from src.ocr import OCREngine
+from src.parsers import parse_case_info, parse_cause_list
+
+DEFAULT_BASELINE = Path(__file__).parent / "baseline.json"
+DEFAULT_TOLERANCE = 0.2  # Fractional slowdown or memory growth reported as a regression
+FIXTURE_CNR = "KARC010037582023"
+
+class StubEngine(OCREngine):
+    """Instant OCR with a weak read, so a solve runs every hypothesis without Tesseract"""
+
+    def recognize_with_confidence(self, image, whitelist=None, psm=7):
+        return "Ab12C3", 0.1
+
+def synthetic_captcha(seed: int) -> bytes:
+    """A PNG resembling the portal CAPTCHA: dark characters over noise lines"""
+    rng = random.Random(seed)
+    image = Image.new('RGB', (120, 40), (rng.randint(200, 255),) * 3)
+    draw = ImageDraw.Draw(image)
+    for _ in range(8):
+        draw.line([(rng.randint(0, 120), rng.randint(0, 40)), (rng.randint(0, 120), rng.randint(0, 40))],
+                  fill=(rng.randint(100, 200),) * 3)
+    text = ''.join(rng.choice(string.ascii_letters + string.digits) for _ in range(6))
+    for index, char in enumerate(text):
+        draw.text((10 + index * 17, rng.randint(5, 20)), char, fill=(rng.randint(0, 60),) * 3)
+    buffer = io.BytesIO()
+    image.save(buffer, format='PNG')
+    return buffer.getvalue()
+
+def build_cases(rows: int = 500) -> Dict[str, Callable[[], object]]:
+    """Benchmark cases by name; each is a no-argument callable doing one operation"""
+    with open(config.BASE_DIR / "case_info_page.html", 'rb') as f:
+        case_html = f.read()
+    cause_html = synthetic_page(rows)
+    case_info = parse_case_info(case_html, FIXTURE_CNR)
+    cause_list = parse_cause_list(cause_html, "Karnataka", "Bangalore", "City Civil Court", "03-11-2025", "Civil")
+
+    # The stub engine stands in for Tesseract; the cases time the image work around it
+    solver = CaptchaSolver(engine=StubEngine())
+    # Time the OCR path even where a trained classifier model exists
+    solver.classifier = None
+    solver.logger.setLevel(logging.WARNING)
+    captchas = itertools.cycle([synthetic_captcha(seed) for seed in range(16)])
+    denoised = solver._denoise(synthetic_captcha(0))
+
+    return {
+        'parse_case_info': lambda: parse_case_info(case_html, FIXTURE_CNR),
+        'parse_cause_list': lambda: parse_cause_list(cause_html, "Karnataka", "Bangalore",
+                                                     "City Civil Court", "03-11-2025", "Civil"),
+        'case_info_to_dict': case_info.to_dict,
+        'cause_list_to_dict': cause_list.to_dict,
+        'captcha_denoise': lambda: solver._denoise(next(captchas)),
+        'captcha_thresholds': lambda: solver._threshold_variants(denoised),
+        'captcha_solve': lambda: solver.solve(next(captchas)),
+    }
+
+def measure(func: Callable[[], object], min_time: float = 1.0, min_ops: int = 5) -> Dict:
+    """Throughput over at least `min_time` seconds and the peak traced memory of one call"""
+    func()  # Warm up caches and lazy imports
+    ops = 0
+    start = time.perf_counter()
+    elapsed = 0.0
+    while elapsed < min_time or ops < min_ops:
+        func()
+        ops += 1
+        elapsed = time.perf_counter() - start
+
+    # Traced separately: tracemalloc slows allocation-heavy code down
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {'ops_per_sec': ops / elapsed, 'peak_kib': peak / 1024}
+
+def compare(results: Dict[str, Dict], baseline: Dict[str, Dict], tolerance: float = DEFAULT_TOLERANCE) -> List[str]:
+    """Describe each case that got slower or used more memory than the baseline allows"""
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if not base:
+            continue
+        if result['ops_per_sec'] < base['ops_per_sec'] * (1 - tolerance):
+            regressions.append(f"{name}: {result['ops_per_sec']:.1f} ops/sec, "
+                               f"baseline {base['ops_per_sec']:.1f}")
+        if result['peak_kib'] > base['peak_kib'] * (1 + tolerance):
+            regressions.append(f"{name}: {result['peak_kib']:.1f} KiB peak, "
+                               f"baseline {base['peak_kib']:.1f}")
+    return regressions
+
+def load_baseline(path: Path) -> Optional[Dict]:
+    """Cases of a saved baseline, or None if there is none"""
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)['cases']
+    except FileNotFoundError:
+        return None
+
+def save_baseline(results: Dict[str, Dict], path: Path):
+    """Save results, with the interpreter and machine they were measured on"""
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({
+            'python': platform.python_version(),
+            'machine': platform.platform(),
+            'cases': results
+        }, f, indent=2)
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Offline benchmarks for the parsing and CAPTCHA hot paths")
+    parser.add_argument('--case', action='append', help='Run only this case (repeatable)')
+    parser.add_argument('--rows', type=int, default=500, help='Rows in the synthetic cause list')
+    parser.add_argument('--min-time', type=float, default=1.0, help='Seconds to run each case')
+    parser.add_argument('--save', nargs='?', const=DEFAULT_BASELINE, type=Path, metavar='PATH',
+                        help='Save results as the baseline')
+    parser.add_argument('--compare', nargs='?', const=DEFAULT_BASELINE, type=Path, metavar='PATH',
+                        help='Compare against a saved baseline; exits 1 on regression')
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help='Allowed fractional slowdown or memory growth')
+    args = parser.parse_args()
+
+    cases = build_cases(args.rows)
+    unknown = set(args.case or []) - set(cases)
+    if unknown:
+        parser.error(f"unknown case(s): {', '.join(sorted(unknown))}; choose from {', '.join(cases)}")
+
+    baseline = None
+    if args.compare:
+        baseline = load_baseline(args.compare)
+        if baseline is None:
+            parser.error(f"no baseline at {args.compare}; run with --save first")
+
+    results = {}
+    print(f"{'case':<22}{'ops/sec':>12}{'peak KiB':>12}{'vs baseline':>14}")
+    for name, func in cases.items():
+        if args.case and name not in args.case:
+            continue
+        result = results[name] = measure(func, args.min_time)
+        change = ''
+        if baseline and name in baseline:
+            change = f"{result['ops_per_sec'] / baseline[name]['ops_per_sec'] - 1:+.1%}"
+        print(f"{name:<22}{result['ops_per_sec']:>12.1f}{result['peak_kib']:>12.1f}{change:>14}")
+
+    if args.save:
+        save_baseline(results, args.save)
+        print(f"Baseline saved to {args.save}")
+
+    if baseline:
+        regressions = compare(results, baseline, args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            return 1
+        print("No regressions")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -3,11 +3,16 @@
 Command Line Interface for eCourts Scraper
 """
 import argparse
+import signal
 import sys
-from src.scraper import eCourtsScraper
-from src.utils import get_today_date, get_tomorrow_date
+from datetime import datetime
+from pathlib import Path
+import config
 import json
 
+# The scraper modules pull in Playwright, OpenCV, NumPy and the parsers; each
+# branch below imports only what it uses, so --help and argument errors stay fast
+
 def main():
     parser = argparse.ArgumentParser(
         description='eCourts Scraper - Download court case information and cause lists',
@@ -23,11 +28,45 @@ Examples:
   # Check if case is listed tomorrow
   python cli.py --cnr KARC010037582023 --tomorrow
 
+  # Check a week of dates with a single case fetch
+  python cli.py --cnr KARC010037582023 --dates 03-11-2025..09-11-2025
+
+  # Ignore the cached result and fetch the case from the portal again
+  python cli.py --cnr KARC010037582023 --refresh
+
+  # Look up many CNRs (one per line) on 4 pages, streaming results to JSONL
+  python cli.py --cnr-file cnrs.txt --output results.jsonl --pool-size 4
+
+  # Read CNRs from stdin; rerunning the same command resumes from the checkpoint
+  cat cnrs.txt | python cli.py --cnr-file - --output results.jsonl
+
+  # Look up CNRs over plain HTTP without launching a browser
+  python cli.py --cnr-file cnrs.txt --transport http
+
+  # Retrain the CAPTCHA classifier from CAPTCHAs the portal has accepted
+  python cli.py --train-captcha
+
+  # Find every listing for an advocate in saved cause lists this month (no browser needed)
+  python cli.py --search-advocate "S N Rao" --from-date 01-11-2025 --to-date 30-11-2025
+
+  # Parse a day's cause list PDFs on every core into JSON entries (and the search index)
+  python cli.py --parse-pdfs output/pdfs
+
   # Download cause list for today
   python cli.py --causelist --state "Karnataka" --district "Bangalore" --court-complex "City Civil Court"
 
+  # Cache the court codes of a state so cause list downloads skip the dropdown round trips
+  python cli.py --refresh-courts Karnataka
+
+  # Download Civil and Criminal lists for every court in a complex on 6 pages
+  python cli.py --causelist-all --state "Karnataka" --district "Bangalore" --court-complex "City Civil Court" --pool-size 6
+
   # Download cause list for specific date
   python cli.py --causelist --state "Delhi" --district "Central" --court-complex "Patiala House" --date "21-10-2025"
+
+  # Keep a warm browser running; later runs with --use-browser-server attach to it instead of launching Chromium
+  python cli.py --browser-server --headless &
+  python cli.py --use-browser-server --cnr KARC010037582023
         """
     )
 
@@ -35,6 +74,11 @@ Examples:
     parser.add_argument('--cnr', type=str, help='CNR number to search')
     parser.add_argument('--today', action='store_true', help='Check if case is listed today')
     parser.add_argument('--tomorrow', action='store_true', help='Check if case is listed tomorrow')
+    parser.add_argument('--dates', type=str,
+                       help="Check listing on several dates with one fetch: 'DD-MM-YYYY,DD-MM-YYYY' or 'DD-MM-YYYY..DD-MM-YYYY'")
+    parser.add_argument('--cnr-file', type=str, help="File with one CNR per line ('-' for stdin)")
+    parser.add_argument('--checkpoint', type=str,
+                       help='Checkpoint file for --cnr-file runs (default: <output>.checkpoint)')
 
     # Cause list options
     parser.add_argument('--causelist', action='store_true', help='Download cause list')
@@ -44,36 +88,183 @@ Examples:
     parser.add_argument('--court-complex', type=str, help='Court complex name')
     parser.add_argument('--court-name', type=str, help='Specific court name (optional)')
     parser.add_argument('--date', type=str, help='Date for cause list (DD-MM-YYYY format, default: today)')
-    parser.add_argument('--type', type=str, choices=['Civil', 'Criminal'], default='Civil', 
-                       help='Type of cause list (Civil/Criminal)')
+    parser.add_argument('--refresh-courts', type=str, nargs='*', metavar='STATE',
+                        help='Fetch the state/district/court complex/court codes of the given states '
+                             '(all states when none are given) into the local court hierarchy cache')
+    parser.add_argument('--type', type=str, choices=['Civil', 'Criminal'],
+                       help='Type of cause list (Civil/Criminal; default Civil, or both with --causelist-all)')
+
+    # Cause list search options
+    parser.add_argument('--search-advocate', type=str, help='Search saved cause lists for an advocate')
+    parser.add_argument('--search-party', type=str, help='Search saved cause lists for a petitioner or respondent')
+    parser.add_argument('--from-date', type=str, help='Earliest cause list date to search')
+    parser.add_argument('--to-date', type=str, help='Latest cause list date to search')
+    parser.add_argument('--limit', type=int, default=config.CAUSE_LIST_SEARCH_LIMIT,
+                        help='Most cause list listings to return')
+    parser.add_argument('--parse-pdfs', type=str, nargs='+', metavar='PATH',
+                       help='Parse cause list PDFs (files or directories) into JSON entries and exit')
 
     # General options
     parser.add_argument('--headless', action='store_true', help='Run browser in headless mode')
-    parser.add_argument('--output', type=str, help='Custom output file path')
+    parser.add_argument('--output', type=str,
+                       help='Custom output file path (JSONL for --cnr-file, JSON otherwise)')
+    parser.add_argument('--pool-size', type=int, default=config.PAGE_POOL_SIZE,
+                       help='Number of browser pages to run lookups on concurrently')
+    parser.add_argument('--train-captcha', action='store_true',
+                       help='Retrain the CAPTCHA classifier from the accepted-CAPTCHA corpus and exit')
+    parser.add_argument('--transport', type=str, choices=['browser', 'http'], default='browser',
+                       help='Run CNR searches in a browser or over plain HTTP sessions')
+    parser.add_argument('--refresh', action='store_true',
+                       help='Fetch CNR results from the portal even if a cached result is still valid')
+    parser.add_argument('--no-cache', action='store_true', help='Neither read nor write the CNR result cache')
+    parser.add_argument('--browser-server', action='store_true',
+                        help=f'Keep a browser running on port {config.BROWSER_SERVER_PORT} for other runs to attach to, '
+                             f'until interrupted')
+    attach = parser.add_mutually_exclusive_group()
+    attach.add_argument('--use-browser-server', dest='use_browser_server', action='store_true',
+                        default=config.BROWSER_SERVER_ENABLED,
+                        help='Attach to your running browser server instead of launching a browser')
+    attach.add_argument('--no-browser-server', dest='use_browser_server', action='store_false',
+                        help='Launch a browser for this run even if a browser server is running')
 
     args = parser.parse_args()
+    if args.limit < 1:
+        parser.error(f"--limit must be at least 1, not {args.limit}")
+
+    if args.browser_server:
+        from src.browser_server import BrowserServer
+        server = BrowserServer(headless=args.headless)
+        signal.signal(signal.SIGTERM, lambda signum, frame: server.stop())
+        try:
+            server.start()
+        except RuntimeError as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+        print(f"Browser server running on {server.endpoint}; press Ctrl+C to stop")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        sys.exit(0)
+
+    if args.train_captcha:
+        from src.captcha_classifier import CaptchaCorpus, train_classifier
+        corpus = CaptchaCorpus()
+        print(f"Training CAPTCHA classifier from {len(corpus)} CAPTCHAs in {corpus.directory}...")
+        stats = train_classifier(corpus)
+        if stats:
+            print(json.dumps(stats, indent=2))
+        else:
+            print("No usable CAPTCHAs in the corpus yet.")
+        sys.exit(0)
+
+    if args.parse_pdfs:
+        from src.cause_list_index import CauseListIndex
+        from src.pdf_parser import parse_cause_list_pdfs
+        from src.utils import save_json
+        paths = []
+        for path in map(Path, args.parse_pdfs):
+            paths.extend(sorted(path.glob("*.pdf")) if path.is_dir() else [path])
+        print(f"Parsing {len(paths)} cause list PDFs...")
+        index = CauseListIndex() if config.CAUSE_LIST_INDEX_ENABLED else None
+        parsed = 0
+        for path, cause_list in parse_cause_list_pdfs(paths):
+            if cause_list is None:
+                print(f"  ✗ {path}")
+                continue
+            filepath = save_json(cause_list, f"{path.stem}.json")
+            if index:
+                index.index_file(filepath)
+            parsed += 1
+            print(f"  ✓ {path}: {cause_list['total_cases']} entries -> {filepath}")
+        print(f"\nParsed {parsed} of {len(paths)} PDFs")
+        sys.exit(0 if parsed == len(paths) else 1)
+
+    if args.search_advocate or args.search_party:
+        from src.cause_list_index import CauseListIndex
+        index = CauseListIndex()
+        stats = index.update()
+        if stats['indexed'] or stats['removed']:
+            print(f"Indexed {stats['indexed']} new or changed cause lists, dropped {stats['removed']}")
+        try:
+            results = index.search(advocate=args.search_advocate, party=args.search_party,
+                                   court_complex=args.court_complex,
+                                   date_from=args.from_date, date_to=args.to_date, limit=args.limit)
+        except ValueError as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+        print(json.dumps(results, indent=2, ensure_ascii=False))
+        if results.truncated:
+            print(f"\nShowing the first {len(results)} listings; more match (raise --limit or narrow the search)")
+        else:
+            print(f"\n{len(results)} listings found")
+        if args.output:
+            with open(args.output, 'w', encoding='utf-8') as f:
+                json.dump(results, f, indent=2, ensure_ascii=False)
+            print(f"Saved to: {args.output}")
+        sys.exit(0)
 
     # Validate arguments
-    if not any([args.cnr, args.causelist, args.causelist_all]):
+    if not any([args.cnr, args.cnr_file, args.causelist, args.causelist_all, args.refresh_courts is not None]):
         parser.print_help()
         sys.exit(1)
 
+    from src.utils import get_today_date, get_tomorrow_date, parse_date_spec
+
+    if args.dates:
+        try:
+            parse_date_spec(args.dates)
+        except ValueError as e:
+            print(f"Error: --dates {e}")
+            sys.exit(1)
+
+    if args.transport == 'http' and (args.today or args.tomorrow or args.dates or args.causelist or args.causelist_all
+                                     or args.refresh_courts is not None):
+        print("Error: --transport http only supports --cnr and --cnr-file searches")
+        sys.exit(1)
+
     # Initialize scraper
     print("Initializing eCourts Scraper...")
-    scraper = eCourtsScraper(headless=args.headless)
+    use_cache = config.CASE_CACHE_ENABLED and not args.no_cache
+    if args.transport == 'http':
+        from src.http_client import ECourtsHttpClient
+        scraper = ECourtsHttpClient(workers=args.pool_size, use_cache=use_cache)
+    else:
+        from src.scraper import eCourtsScraper
+        scraper = eCourtsScraper(headless=args.headless, pool_size=args.pool_size, use_cache=use_cache,
+                                 browser_server=args.use_browser_server)
 
     try:
+        # Bulk CNR search
+        if args.cnr_file:
+            from src.bulk import iter_cnrs, run_bulk_search
+            output = args.output or config.JSON_OUTPUT_DIR / f"bulk_{datetime.now().strftime('%Y%m%d_%H%M%S')}.jsonl"
+            print(f"\nSearching CNRs from {args.cnr_file}, writing to {output}")
+            summary = run_bulk_search(scraper, iter_cnrs(args.cnr_file), output, args.checkpoint,
+                                      refresh=args.refresh)
+            print(f"\n✓ Found: {summary['found']}  Failed: {summary['failed']}  "
+                  f"Skipped (already done): {summary['skipped']}")
+            print(f"  Results: {summary['output']}")
+            print(f"  Checkpoint: {summary['checkpoint']}")
+
         # CNR search
-        if args.cnr:
-            if args.today:
+        elif args.cnr:
+            if args.dates or (args.today and args.tomorrow):
+                # One case fetch answers every requested date
+                dates = [day for day, wanted in ((get_today_date(), args.today), (get_tomorrow_date(), args.tomorrow)) if wanted]
+                if args.dates:
+                    dates.append(args.dates)
+                print(f"\nChecking if case {args.cnr} is listed on {', '.join(dates)}...")
+                result = scraper.check_case_listed_on_dates(args.cnr, dates, refresh=args.refresh)
+            elif args.today:
                 print(f"\nChecking if case {args.cnr} is listed today...")
-                result = scraper.check_case_today(args.cnr)
+                result = scraper.check_case_today(args.cnr, refresh=args.refresh)
             elif args.tomorrow:
                 print(f"\nChecking if case {args.cnr} is listed tomorrow...")
-                result = scraper.check_case_tomorrow(args.cnr)
+                result = scraper.check_case_tomorrow(args.cnr, refresh=args.refresh)
             else:
                 print(f"\nSearching for case: {args.cnr}")
-                result = scraper.search_by_cnr(args.cnr)
+                result = scraper.search_by_cnr(args.cnr, refresh=args.refresh)
 
             if result:
                 print("\n" + "="*50)
@@ -81,9 +272,21 @@ Examples:
                 print("="*50)
                 print(json.dumps(result, indent=2))
                 print("="*50)
+                if args.output:
+                    with open(args.output, 'w', encoding='utf-8') as f:
+                        json.dump(result, f, indent=2, ensure_ascii=False)
+                    print(f"Saved to: {args.output}")
             else:
                 print("\nNo results found or error occurred.")
 
+        # Court hierarchy refresh
+        elif args.refresh_courts is not None:
+            print(f"\nFetching court codes for {', '.join(args.refresh_courts) or 'all states'}...")
+            counts = scraper.refresh_court_hierarchy(args.refresh_courts)
+            print(f"\n✓ Cached {counts['state']} states, {counts['district']} districts, "
+                  f"{counts['court_complex']} court complexes and {counts['court']} courts")
+            print(f"  Saved to: {scraper.court_hierarchy.path}")
+
         # Cause list download
         elif args.causelist or args.causelist_all:
             if not all([args.state, args.district, args.court_complex]):
@@ -92,26 +295,53 @@ Examples:
 
             date = args.date if args.date else get_today_date()
 
-            print(f"\nDownloading cause list:")
-            print(f"  State: {args.state}")
-            print(f"  District: {args.district}")
-            print(f"  Court Complex: {args.court_complex}")
-            print(f"  Date: {date}")
-            print(f"  Type: {args.type}")
-
-            result = scraper.download_cause_list(
-                state=args.state,
-                district=args.district,
-                court_complex=args.court_complex,
-                court_name=args.court_name,
-                date=date,
-                list_type=args.type
-            )
-
-            if result:
-                print(f"\n✓ Cause list saved to: {result}")
+            if args.causelist_all:
+                list_types = [args.type] if args.type else ['Civil', 'Criminal']
+                print(f"\nDownloading {' and '.join(list_types)} cause lists for every court in "
+                      f"{args.court_complex} on {date} ({args.pool_size} pages)...")
+                manifest = scraper.download_all_cause_lists(
+                    state=args.state,
+                    district=args.district,
+                    court_complex=args.court_complex,
+                    date=date,
+                    list_types=list_types
+                )
+                if not manifest['results']:
+                    print("\n✗ No courts found for the court complex")
+                for result in manifest['results']:
+                    if result['file']:
+                        print(f"  ✓ {result['court']} ({result['list_type']}): {result['file']}")
+                    else:
+                        print(f"  ✗ {result['court']} ({result['list_type']}): {result['error']}")
+                print(f"\n✓ Downloaded {manifest['downloaded']} cause lists for {manifest['courts']} courts, "
+                      f"{manifest['failed']} failed")
+                print(f"  Manifest: {manifest['manifest']}")
             else:
-                print("\n✗ Failed to download cause list")
+                list_type = args.type or 'Civil'
+                print(f"\nDownloading cause list:")
+                print(f"  State: {args.state}")
+                print(f"  District: {args.district}")
+                print(f"  Court Complex: {args.court_complex}")
+                print(f"  Date: {date}")
+                print(f"  Type: {list_type}")
+
+                result = scraper.download_cause_list(
+                    state=args.state,
+                    district=args.district,
+                    court_complex=args.court_complex,
+                    court_name=args.court_name,
+                    date=date,
+                    list_type=list_type
+                )
+
+                if result:
+                    print(f"\n✓ Cause list saved to: {result}")
+                else:
+                    print("\n✗ Failed to download cause list")
+
+        if scraper.cache and (args.cnr or args.cnr_file):
+            stats = scraper.cache.stats()
+            print(f"\nCase cache: {stats['hits']} hits, {stats['misses']} misses ({stats['path']})")
 
     finally:
         print("\nClosing scraper...")
@@ -12,25 +12,83 @@ OUTPUT_DIR = BASE_DIR / "output"
 JSON_OUTPUT_DIR = OUTPUT_DIR / "json"
 PDF_OUTPUT_DIR = OUTPUT_DIR / "pdfs"
 LOG_DIR = OUTPUT_DIR / "logs"
-
-# Create directories if they don't exist
-for directory in [OUTPUT_DIR, JSON_OUTPUT_DIR, PDF_OUTPUT_DIR, LOG_DIR]:
-    directory.mkdir(parents=True, exist_ok=True)
+# Nothing is created on import; writers create their directory first (utils.ensure_dir)
 
 # Browser settings
 HEADLESS = True  # Set to False for debugging
 BROWSER_TIMEOUT = 60000  # 60 seconds
 WAIT_TIMEOUT = 20000  # 20 seconds
+BROWSER_ARGS = ['--disable-blink-features=AutomationControlled']
+CHROMIUM_NO_SANDBOX = False  # Disable Chromium's sandbox; only for containers running as root, where it cannot start
+VIEWPORT = {'width': 1280, 'height': 800}  # Smallest size that keeps the portal's desktop layout
+RESOURCE_PROFILE = 'lean'  # 'off', 'lean' (no fonts, images, media or trackers) or 'minimal' (also no CSS)
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+
+# Browser server settings
+BROWSER_SERVER_ENABLED = False  # Attach to a running `cli.py --browser-server` instead of launching Chromium
+BROWSER_SERVER_PORT = 9333  # Local DevTools port the browser server listens on
+BROWSER_SERVER_STATE_FILE = Path.home() / ".ecourts" / "browser_server.json"  # Server record, in a user-private directory
+BROWSER_SERVER_PROBE_TIMEOUT = 0.2  # Seconds to wait for the server to answer before launching Chromium
+
+# Page pool settings
+PAGE_POOL_SIZE = 1  # Isolated pages sharing one Chromium; above 1 lookups run concurrently
+ASYNC_CONCURRENCY = 8  # In-flight lookups for AsyncECourtsScraper
 
 # CAPTCHA settings
 MAX_CAPTCHA_RETRIES = 5
 TESSERACT_CMD = r'C:\Program Files\Tesseract-OCR\tesseract.exe'  # Will auto-detect, set manually if needed
 # For Windows: r'C:\Program Files\Tesseract-OCR\tesseract.exe'
+OCR_BACKEND = 'auto'  # 'auto', 'tesserocr' (in-process, model stays loaded) or 'tesseract' (CLI)
+TESSDATA_DIR = None  # tessdata directory for tesserocr; None uses TESSDATA_PREFIX
+CAPTCHA_CORPUS_ENABLED = True  # Keep CAPTCHAs the portal accepted, for retraining the classifier
+CAPTCHA_CORPUS_DIR = OUTPUT_DIR / "captcha_corpus"
+CAPTCHA_MODEL_PATH = OUTPUT_DIR / "captcha_model.npz"
+CAPTCHA_CLASSIFIER_MIN_CONFIDENCE = 0.6  # Below this the classifier defers to Tesseract
+CAPTCHA_MIN_CONFIDENCE = 0.3  # Weaker reads refresh the CAPTCHA instead of being submitted
+CAPTCHA_OCR_THREADS = 4  # OCR hypotheses read in parallel
+CAPTCHA_FIRST_READ = ('otsu', 'alnum', 7)  # Threshold, whitelist and mode read first; the rest only if it is weak
+CAPTCHA_THRESHOLDS = ('fixed', 'otsu', 'adaptive')
+CAPTCHA_WHITELISTS = ('alnum', 'numeric')
+CAPTCHA_PSM_MODES = (7, 8)  # Single text line, single word
+CAPTCHA_SUBPROCESS_READS = 3  # Extra hypotheses at most when every read starts a tesseract process
+CAPTCHA_RESPONSE_PATTERN = "securimage_show.php"  # URL fragment of CAPTCHA image responses
+CAPTCHA_REFRESH_TIMEOUT = 10000  # Wait for a refreshed CAPTCHA image (ms)
+
+# Case cache settings
+CASE_CACHE_ENABLED = True  # Reuse search_by_cnr results until the case can have changed
+CASE_CACHE_PATH = OUTPUT_DIR / "case_cache.sqlite3"
+CASE_CACHE_TTL = 6 * 3600  # Seconds, when the next hearing is unknown or past
+CASE_CACHE_HEARING_TTL = 30 * 60  # Seconds, from the day before a hearing until it is over
+CASE_CACHE_MAX_TTL = 7 * 24 * 3600  # Longest a result is trusted, however far off the hearing
+
+# Listing check settings
+MAX_LISTING_DATES = 366  # Most dates one listing check may ask about, after expanding ranges
+
+# Lookup coalescing settings
+COALESCE_LOOKUPS = True  # Identical CNR searches and cause list downloads in flight share one scrape
+
+# Cause list index settings
+CAUSE_LIST_INDEX_ENABLED = True  # Index saved cause lists for advocate and party search
+CAUSE_LIST_INDEX_PATH = OUTPUT_DIR / "cause_list_index.sqlite3"
+CAUSE_LIST_SEARCH_LIMIT = 500  # Most listings one search returns; results say when more matched
+CAUSE_LIST_RESULT_TIMEOUT = 30000  # Wait for a download, result or error after a cause list submit (ms)
+CAUSE_LIST_SLOW_THRESHOLD = 25.0  # Seconds after which a cause list submit, which waits for the list, counts as slow
+CAUSE_LIST_POLL_INTERVAL = 250  # How often the sync scraper checks for a download while watching the page (ms)
+PARSE_CAUSE_LIST_PDFS = True  # Turn downloaded cause list PDFs into JSON entries as well
+PDF_PARSE_WORKERS = None  # Processes for batch PDF parsing; None uses every core
+CASE_PARSE_PROCESSES = 0  # Processes for parsing case pages in the async scraper; 0 parses on a thread
+
+# Court hierarchy settings
+COURT_HIERARCHY_PATH = OUTPUT_DIR / "court_hierarchy.json"  # Cause list dropdown codes and labels
+COURT_HIERARCHY_MAX_AGE = 30 * 24 * 3600  # Dropdown options older than this are fetched again
 
 # eCourts URLs
 ECOURTS_BASE_URL = "https://services.ecourts.gov.in/ecourtindia_v6/"
 ECOURTS_CAUSELIST_URL = f"{ECOURTS_BASE_URL}?p=cause_list/index"
 ECOURTS_CNR_SEARCH_URL = f"{ECOURTS_BASE_URL}"
+# Paths relative to ECOURTS_BASE_URL used by the browser-free HTTP transport
+ECOURTS_CAPTCHA_PATH = "vendor/securimage/securimage_show.php"
+ECOURTS_CNR_STATUS_PATH = "?p=cnr_status/searchByCNR/"
 
 # Delhi District Courts URL
 DELHI_COURTS_URL = "https://newdelhi.dcourts.gov.in/cause-list-%e2%81%84-daily-board/"
@@ -39,5 +97,23 @@ DELHI_COURTS_URL = "https://newdelhi.dcourts.gov.in/cause-list-%e2%81%84-daily-b
 LOG_LEVEL = "INFO"
 LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
 
-# Request delays (in seconds)
-REQUEST_DELAY = 2
+# HTTP transport settings
+HTTP_WORKERS = 4  # Concurrent sessions for browser-free bulk lookups
+HTTP_POOL_CONNECTIONS = 4  # Keep-alive connections per session
+HTTP_TIMEOUT = 30  # seconds
+
+# Request pacing, per portal host (see src/scheduler.py)
+REQUEST_DELAY = 0.5  # Average seconds between requests; 0 turns pacing off
+REQUEST_BURST = 4  # Requests that may go back to back after an idle spell
+MAX_CONCURRENT_REQUESTS = 4  # Requests in flight at once
+BACKOFF_BASE = 2.0  # Seconds to back off after a failed or slow response, doubling per repeat
+BACKOFF_MAX = 60.0  # Longest backoff in seconds
+SLOW_RESPONSE_THRESHOLD = 15.0  # Seconds after which a response counts as the portal struggling
+
+# Web UI settings
+WEB_BROWSER_PAGES = 2  # Warm pages the web UI's browser worker serves lookups on
+WEB_JOB_TIMEOUT = 300  # Seconds a web request waits for its lookup
+WEB_JOB_TTL = 3600  # Seconds a finished job's result stays available
+WEB_MAX_JOBS = 1000  # Jobs kept at once; the oldest finished ones are dropped first
+WEB_MAX_BATCH = 100  # CNRs accepted in one batch
+WEB_EVENTS_KEEPALIVE = 15  # Seconds between keep-alive comments on an idle event stream
@@ -10,9 +10,10 @@ def main():
     print("eCourts Scraper - Example Usage")
     print("=" * 50)
 
-    # Example 1: Search by CNR
-    print("\nExample 1: Searching by CNR...")
+    # One browser serves both examples
     with eCourtsScraper() as scraper:
+        # Example 1: Search by CNR
+        print("\nExample 1: Searching by CNR...")
         result = scraper.search_by_cnr("KARC010037582023")
         if result:
             print("Case found!")
@@ -20,9 +21,8 @@ def main():
         else:
             print("Case not found or error occurred")
 
-    # Example 2: Download cause list
-    print("\nExample 2: Downloading cause list...")
-    with eCourtsScraper() as scraper:
+        # Example 2: Download cause list
+        print("\nExample 2: Downloading cause list...")
         result = scraper.download_cause_list(
             state="Karnataka",
             district="Bangalore",
@@ -1,8 +1,27 @@
 """
 eCourts Scraper Package
 """
-from .scraper import eCourtsScraper
-from .captcha_solver import CaptchaSolver
-from .utils import setup_logger, save_json, save_pdf
+from importlib import import_module
 
-__all__ = ['eCourtsScraper', 'CaptchaSolver', 'setup_logger', 'save_json', 'save_pdf']
+# Exports resolve on first use, so importing a light module such as src.utils
+# does not pull in Playwright, OpenCV and the parsers
+_EXPORTS = {
+    'eCourtsScraper': '.scraper',
+    'AsyncECourtsScraper': '.async_scraper',
+    'CaptchaSolver': '.captcha_solver',
+    'setup_logger': '.utils',
+    'save_json': '.utils',
+    'save_pdf': '.utils',
+}
+
+__all__ = list(_EXPORTS)
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
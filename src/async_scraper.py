@@ -0,0 +1,645 @@
+"""
+Asyncio scraper module for eCourts
+"""
+from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeout
+from typing import Optional, Dict, List, Iterable, AsyncIterator, Sequence, Tuple
+from contextlib import asynccontextmanager
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+import asyncio
+import config
+from .browser_server import find_server
+from .cache import CaseCache
+from .captcha_solver import CaptchaSolver
+from .cause_list_index import CauseListIndex
+from .captcha_watcher import CaptchaWatcher
+from .cause_list_outcome import CLEAR_SCRIPT, OUTCOME_SCRIPT, CauseListOutcome, DownloadWatcher, script_args
+from .court_hierarchy import CourtHierarchy, LEVELS, SELECTORS, OPTIONS_SCRIPT, SET_VALUES_SCRIPT, clean_options, find_option, form_values
+from .page_pool import context_options
+from .resource_profile import BlockedRequests, blocked_patterns
+from .scheduler import RequestScheduler, default_scheduler
+from .single_flight import AsyncSingleFlight, cnr_key, cause_list_key
+from .utils import setup_logger, ensure_dir, save_json, get_today_date, get_tomorrow_date, sanitize_filename, cause_list_filename, cause_list_manifest, cause_list_manifest_filename, normalize_dates, listing_verdicts
+from .parsers import parse_case_info_dict, parse_cause_list, CAUSE_LIST_CONTAINER
+from .pdf_parser import parse_cause_list_pdf
+
+class AsyncECourtsScraper:
+    """Asyncio scraper for eCourts India Services built on playwright.async_api"""
+
+    def __init__(self, headless: bool = config.HEADLESS, concurrency: int = config.ASYNC_CONCURRENCY,
+                 use_cache: bool = config.CASE_CACHE_ENABLED, cache: Optional[CaseCache] = None,
+                 scheduler: Optional[RequestScheduler] = None, resource_profile: str = config.RESOURCE_PROFILE,
+                 coalesce: bool = config.COALESCE_LOOKUPS, browser_server: bool = config.BROWSER_SERVER_ENABLED):
+        self.logger = setup_logger(__name__)
+        self.scheduler = scheduler or default_scheduler()
+        self.flights = AsyncSingleFlight() if coalesce else None
+        self.captcha_solver = CaptchaSolver()
+        self.cause_list_index = CauseListIndex() if config.CAUSE_LIST_INDEX_ENABLED else None
+        self.cache = (cache or CaseCache()) if use_cache else None
+        self.court_hierarchy = CourtHierarchy()
+        self.headless = headless
+        self.concurrency = max(1, concurrency)
+        self.browser_server = browser_server
+        self.playwright = None
+        self.browser = None
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        self._idle_pages = asyncio.Queue()
+        self._contexts = []
+        self._captcha_watchers = {}
+        self._parse_executor = None
+        self.blocked_urls = blocked_patterns(resource_profile)
+        self.blocked_requests = BlockedRequests()
+
+    @property
+    def parse_executor(self) -> Optional[ProcessPoolExecutor]:
+        """Process pool for case page parsing, or None to parse on the default thread pool"""
+        if self._parse_executor is None and config.CASE_PARSE_PROCESSES > 0:
+            self._parse_executor = ProcessPoolExecutor(max_workers=config.CASE_PARSE_PROCESSES)
+        return self._parse_executor
+
+    async def start(self):
+        """Launch Playwright and the shared browser, or attach to a running browser server"""
+        try:
+            self.logger.info("Initializing async browser...")
+            self.playwright = await async_playwright().start()
+            endpoint = find_server() if self.browser_server else None
+            if endpoint:
+                try:
+                    self.browser = await self.playwright.chromium.connect_over_cdp(endpoint)
+                    self.logger.info(f"Attached to browser server at {endpoint}")
+                except Exception as e:
+                    self.logger.warning(f"Could not attach to browser server at {endpoint}, launching Chromium: {e}")
+            if self.browser is None:
+                self.browser = await self.playwright.chromium.launch(
+                    headless=self.headless,
+                    args=config.BROWSER_ARGS,
+                    chromium_sandbox=not config.CHROMIUM_NO_SANDBOX
+                )
+            self.logger.info("Async browser initialized successfully")
+        except Exception as e:
+            self.logger.error(f"Error initializing async browser: {e}")
+            raise
+        return self
+
+    async def close(self):
+        """Close browser and cleanup"""
+        try:
+            for context in self._contexts:
+                await context.close()
+            self._contexts = []
+            if self.browser:
+                await self.browser.close()
+            if self.playwright:
+                await self.playwright.stop()
+            self.captcha_solver.close()
+            self._log_blocked_requests()
+            if self._parse_executor:
+                self._parse_executor.shutdown()
+                self._parse_executor = None
+            self.logger.info("Async browser closed successfully")
+        except Exception as e:
+            self.logger.error(f"Error closing async browser: {e}")
+
+    async def __aenter__(self):
+        return await self.start()
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    async def _new_page(self):
+        """Create an isolated context and page"""
+        context = await self.browser.new_context(**context_options())
+        self._contexts.append(context)
+        page = await context.new_page()
+        page.set_default_timeout(config.BROWSER_TIMEOUT)
+        self._captcha_watchers[page] = CaptchaWatcher(page)
+        page.on("close", lambda closed: self._captcha_watchers.pop(closed, None))
+        if self.blocked_urls:
+            # A DevTools blocklist, unlike page.route, keeps the HTTP cache and adds no round trip per request
+            session = await context.new_cdp_session(page)
+            await session.send("Network.enable")
+            await session.send("Network.setBlockedURLs", {"urls": list(self.blocked_urls)})
+            self.blocked_requests.watch(page)
+        return page
+
+    def _log_blocked_requests(self):
+        summary = self.blocked_requests.summary()
+        if summary['blocked']:
+            by_type = ', '.join(f"{kind} {count}" for kind, count in sorted(summary['by_type'].items()))
+            self.logger.info(f"Resource profile blocked {summary['blocked']} requests ({by_type})")
+
+    async def _captcha_bytes(self, page, captcha_img) -> bytes:
+        """Original CAPTCHA image bytes, falling back to a screenshot if no response was seen"""
+        watcher = self._captcha_watchers.get(page)
+        response = watcher.take() if watcher else None
+        if response:
+            try:
+                return await response.body()
+            except Exception as e:
+                self.logger.debug(f"CAPTCHA response body unavailable: {e}")
+        return await captcha_img.screenshot()
+
+    async def _goto(self, page, url: str):
+        """Navigate when the request scheduler allows, reporting throttling or server errors"""
+        async with self.scheduler.arequest(url) as slot:
+            response = await page.goto(url)
+            slot.status(response.status if response else None)
+        return response
+
+    async def _refresh_captcha(self, page, refresh_btn):
+        """Click refresh and wait for the new image to arrive"""
+        watcher = self._captcha_watchers.get(page)
+        matches = watcher.matches if watcher else (lambda response: config.CAPTCHA_RESPONSE_PATTERN in response.url)
+        async with self.scheduler.arequest(page.url):
+            async with page.expect_response(matches, timeout=config.CAPTCHA_REFRESH_TIMEOUT):
+                await refresh_btn.click()
+
+    @asynccontextmanager
+    async def _checkout_page(self):
+        """Hold a concurrency slot and an idle page for the duration of a lookup"""
+        async with self._semaphore:
+            try:
+                page = self._idle_pages.get_nowait()
+            except asyncio.QueueEmpty:
+                # The semaphore caps in-flight lookups, so at most `concurrency` pages exist
+                page = await self._new_page()
+            try:
+                yield page
+            finally:
+                if page.is_closed():
+                    self._contexts.remove(page.context)
+                    await page.context.close()
+                else:
+                    self._idle_pages.put_nowait(page)
+
+    async def _solve_captcha_with_retry(self, page, max_retries: int = config.MAX_CAPTCHA_RETRIES) -> Optional[Tuple[bytes, str]]:
+        """Solve CAPTCHA with retry mechanism, returning the image bytes and the text entered"""
+        for attempt in range(max_retries):
+            try:
+                self.logger.info(f"CAPTCHA solving attempt {attempt + 1}/{max_retries}")
+
+                # Wait for CAPTCHA image to load
+                captcha_img = await page.wait_for_selector("img[id*='captcha' i], img[src*='captcha' i]", timeout=5000)
+
+                if not captcha_img:
+                    self.logger.warning("CAPTCHA image not found")
+                    continue
+
+                # Get CAPTCHA image as served, without re-rendering it
+                captcha_bytes = await self._captcha_bytes(page, captcha_img)
+
+                # OCR is CPU-bound, keep it off the event loop
+                result = await asyncio.to_thread(self.captcha_solver.solve, captcha_bytes)
+                captcha_text = result.text
+
+                if captcha_text and result.confidence < config.CAPTCHA_MIN_CONFIDENCE:
+                    # A weak read is likely wrong; a fresh CAPTCHA is cheaper than a rejected submit
+                    self.logger.info(f"CAPTCHA read {captcha_text} too uncertain ({result.confidence:.2f}), refreshing")
+                    captcha_text = None
+
+                if captcha_text:
+                    # Find and fill CAPTCHA input
+                    captcha_input = await page.query_selector("input[placeholder='Enter Captcha']")
+                    if captcha_input:
+                        await captcha_input.fill(captcha_text)
+                        self.logger.info(f"CAPTCHA filled: {captcha_text}")
+                        return captcha_bytes, captcha_text
+
+                # Refresh CAPTCHA if available
+                refresh_btn = await page.query_selector("a[onclick*='captcha' i], button[onclick*='captcha' i]")
+                if refresh_btn:
+                    try:
+                        await self._refresh_captcha(page, refresh_btn)
+                    except Exception as e:
+                        # The scheduled request has already counted this failure and backed off
+                        self.logger.error(f"Error refreshing CAPTCHA on attempt {attempt + 1}: {e}")
+
+            except Exception as e:
+                self.logger.error(f"Error in CAPTCHA solving attempt {attempt + 1}: {e}")
+                # Back off before the next attempt touches the portal again
+                self.scheduler.record(page.url, ok=False)
+
+        self.logger.error("Failed to solve CAPTCHA after all retries")
+        return None
+
+    async def _on_page(self, func, *args):
+        """Await func(page, *args) on a checked out page"""
+        async with self._checkout_page() as page:
+            return await func(page, *args)
+
+    async def _run_coalesced(self, key: Tuple, func, *args):
+        """_on_page, sharing one scrape between identical calls in flight at the same time"""
+        if self.flights is None:
+            return await self._on_page(func, *args)
+        return await self.flights.do(key, lambda: self._on_page(func, *args))
+
+    async def _cached(self, cnr: str, refresh: bool = False) -> Optional[Dict]:
+        """Cached result for a CNR, unless the cache is off or a refresh was asked for"""
+        if self.cache and not refresh:
+            # SQLite may wait on a lock held by another process, so keep it off the event loop
+            return await asyncio.to_thread(self.cache.get, cnr)
+        return None
+
+    async def search_by_cnr(self, cnr: str, refresh: bool = False) -> Optional[Dict]:
+        """Search case by CNR number, reusing a cached result unless refresh is set"""
+        return await self._cached(cnr, refresh) or await self._run_coalesced(cnr_key(cnr), self._search_by_cnr, cnr)
+
+    async def search_many(self, cnrs: Iterable[str], refresh: bool = False) -> AsyncIterator[Tuple[str, Optional[Dict]]]:
+        """Search many CNRs concurrently, yielding (cnr, result) as each finishes"""
+        max_pending = self.concurrency * 2
+        pending = {}
+
+        async def search(cnr):
+            return cnr, await self.search_by_cnr(cnr, refresh)
+
+        for cnr in cnrs:
+            pending[asyncio.ensure_future(search(cnr))] = cnr
+            if len(pending) >= max_pending:
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    pending.pop(task)
+                    yield task.result()
+
+        while pending:
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                pending.pop(task)
+                yield task.result()
+
+    async def _search_by_cnr(self, page, cnr: str) -> Optional[Dict]:
+        """Search case by CNR number using the given page"""
+        try:
+            self.logger.info(f"Searching case with CNR: {cnr}")
+
+            # Navigate to CNR search page
+            await self._goto(page, config.ECOURTS_CNR_SEARCH_URL)
+
+            # Click on the CNR Number button in the search menu
+            try:
+                await page.click("text=CNR Number", timeout=config.WAIT_TIMEOUT)
+            except PlaywrightTimeout:
+                self.logger.error("'CNR Number' button not found.")
+                return None
+
+            # Wait for the page to load and check for the CNR input field
+            try:
+                cnr_input = await page.wait_for_selector("#cino", timeout=config.WAIT_TIMEOUT)
+                await cnr_input.fill(cnr)
+            except PlaywrightTimeout:
+                self.logger.error("CNR input field not found.")
+                return None
+
+            # Solve CAPTCHA
+            solved = await self._solve_captcha_with_retry(page)
+            if not solved:
+                return None
+
+            # Click search
+            search_btn = await page.query_selector("button:has-text('Search')")
+            if search_btn:
+                async with self.scheduler.arequest(page.url):
+                    await search_btn.click()
+                    await page.wait_for_load_state('networkidle')
+            else:
+                self.logger.error("Search button not found.")
+                return None
+
+            # Extract case information
+            case_info = await self._extract_case_info(page, cnr)
+
+            if case_info:
+                if case_info.get('case_type') or case_info.get('case_number'):
+                    # Case details only render once the portal accepts the CAPTCHA
+                    self.captcha_solver.record_accepted(*solved)
+                    if self.cache:
+                        await asyncio.to_thread(self.cache.put, cnr, case_info)
+
+                # Save to JSON
+                filename = f"case_{sanitize_filename(cnr)}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+                save_json(case_info, filename)
+                self.logger.info(f"Case info saved to {filename}")
+
+            return case_info
+
+        except Exception as e:
+            self.logger.error(f"Error searching by CNR: {e}")
+            return None
+
+    async def _extract_case_info(self, page, cnr: str) -> Optional[Dict]:
+        """Extract case information from the page"""
+        try:
+            html = await page.content()
+            # Parse off the event loop so other pages keep moving
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.parse_executor, parse_case_info_dict, html, cnr)
+
+        except Exception as e:
+            self.logger.error(f"Error extracting case info: {e}")
+            return None
+
+    async def check_case_listed(self, cnr: str, date: str, refresh: bool = False) -> Optional[Dict]:
+        """Check if case is listed on specific date"""
+        result = await self.check_case_listed_on_dates(cnr, [date], refresh)
+        if not result:
+            return None
+        return {
+            'cnr': cnr,
+            'date_checked': date,
+            'is_listed': result['dates'][0]['is_listed'],
+            'case_info': result['case_info']
+        }
+
+    async def check_case_listed_on_dates(self, cnr: str, dates: Iterable[str], refresh: bool = False) -> Optional[Dict]:
+        """Check whether a case is listed on each of several dates from one case fetch"""
+        try:
+            days = normalize_dates(dates)
+            self.logger.info(f"Checking if case {cnr} is listed on {len(days)} dates")
+
+            case_info = await self.search_by_cnr(cnr, refresh)
+
+            if not case_info:
+                return None
+
+            verdicts = listing_verdicts(case_info, days)
+            return {
+                'cnr': cnr,
+                'next_hearing': case_info.get('next_hearing'),
+                'dates': verdicts,
+                'listed_dates': [verdict['date'] for verdict in verdicts if verdict['is_listed']],
+                'case_info': case_info
+            }
+
+        except Exception as e:
+            self.logger.error(f"Error checking case listing: {e}")
+            return None
+
+    async def check_case_today(self, cnr: str, refresh: bool = False) -> Optional[Dict]:
+        """Check if case is listed today"""
+        return await self.check_case_listed(cnr, get_today_date(), refresh)
+
+    async def check_case_tomorrow(self, cnr: str, refresh: bool = False) -> Optional[Dict]:
+        """Check if case is listed tomorrow"""
+        return await self.check_case_listed(cnr, get_tomorrow_date(), refresh)
+
+    async def download_cause_list(self, state: str, district: str, court_complex: str,
+                                  court_name: Optional[str] = None, date: Optional[str] = None,
+                                  list_type: str = "Civil") -> Optional[str]:
+        """Download cause list for specified parameters"""
+        key = cause_list_key(state, district, court_complex, court_name, date, list_type)
+        return await self._run_coalesced(key, self._download_cause_list, state, district, court_complex,
+                                         court_name, date, list_type)
+
+    async def download_all_cause_lists(self, state: str, district: str, court_complex: str,
+                                       date: Optional[str] = None,
+                                       list_types: Sequence[str] = ("Civil", "Criminal")) -> Dict:
+        """Download the cause lists of every court in a complex concurrently; returns a manifest
+        of files and failures, which is also saved as JSON"""
+        date = date or get_today_date()
+        started = datetime.now()
+        courts = self.court_hierarchy.options(state, district, court_complex)
+        if courts is None:
+            # Read the court dropdown once, recording it in the court hierarchy
+            async with self._checkout_page() as page:
+                try:
+                    await self._open_cause_list_form(page)
+                    walked = await self._walk_court_hierarchy(page, (state, district, court_complex))
+                except Exception as e:
+                    self.logger.error(f"Error reading courts of {court_complex}: {e}")
+                    walked = None
+            courts = walked[1] if walked else []
+
+        async def download(court, list_type):
+            async with self._checkout_page() as page:
+                return await self._download_court_cause_list(page, state, district, court_complex, date,
+                                                             court, list_type)
+
+        results = await asyncio.gather(*(download(court, list_type)
+                                         for court in courts for list_type in list_types))
+        manifest = cause_list_manifest(state, district, court_complex, date, list_types, started, list(results))
+        manifest['manifest'] = str(save_json(manifest, cause_list_manifest_filename(state, district, court_complex, date)))
+        self.logger.info(f"Downloaded {manifest['downloaded']} cause lists, {manifest['failed']} failed; "
+                         f"manifest saved to {manifest['manifest']}")
+        return manifest
+
+    async def _download_court_cause_list(self, page, state: str, district: str, court_complex: str, date: str,
+                                         court: Dict, list_type: str) -> Dict:
+        """Download one court's list for download_all_cause_lists; never raises, so one court cannot stop the rest"""
+        result = {'court': court['name'], 'court_code': court['code'], 'list_type': list_type,
+                  'status': 'failed', 'file': None, 'error': None}
+        try:
+            result['file'] = await self._download_cause_list(page, state, district, court_complex, court['name'],
+                                                             date, list_type)
+        except Exception as e:
+            result['error'] = str(e)
+        if result['file']:
+            result['status'] = 'downloaded'
+        elif not result['error']:
+            result['error'] = "No cause list downloaded"
+        return result
+
+    async def _download_cause_list(self, page, state: str, district: str, court_complex: str,
+                                   court_name: Optional[str] = None, date: Optional[str] = None,
+                                   list_type: str = "Civil") -> Optional[str]:
+        """Download cause list using the given page"""
+        try:
+            if not date:
+                date = get_today_date()
+
+            self.logger.info(f"Downloading cause list for {state}/{district}/{court_complex} on {date}")
+
+            await self._open_cause_list_form(page)
+            names = (state, district, court_complex, court_name)
+            codes = self.court_hierarchy.resolve(*names)
+            if codes:
+                # Cached codes skip the round trips that fill each dropdown
+                await page.evaluate(SET_VALUES_SCRIPT, form_values(codes))
+            elif not await self._walk_court_hierarchy(page, names):
+                return None
+
+            # The complex, and a named court, get their own files, so lists of one district do not overwrite each other
+            court_parts = (court_complex, court_name)
+
+            # Fill date
+            await page.fill("#causelist_date", date)
+
+            # Solve CAPTCHA
+            solved = await self._solve_captcha_with_retry(page)
+            if not solved:
+                self.logger.error("Failed to solve CAPTCHA")
+                return None
+
+            # Click appropriate button (Civil/Criminal)
+            if list_type.lower() == "civil":
+                submit_btn = await page.query_selector("button:has-text('Civil')")
+            else:
+                submit_btn = await page.query_selector("button:has-text('Criminal')")
+
+            if not submit_btn:
+                return None
+
+            # Branch on whichever answer comes first instead of waiting out the download timeout
+            outcome = await self._submit_cause_list(page, submit_btn)
+            if outcome.kind == 'download':
+                filename = cause_list_filename(state, district, date, list_type, 'pdf', *court_parts)
+                filepath = ensure_dir(config.PDF_OUTPUT_DIR) / filename
+                await outcome.download.save_as(filepath)
+                self.logger.info(f"Cause list downloaded: {filepath}")
+                await asyncio.to_thread(self._save_pdf_cause_list, filepath, state, district,
+                                        court_complex, date, list_type, court_name)
+                self.captcha_solver.record_accepted(*solved)
+                return str(filepath)
+
+            if outcome.kind == 'table':
+                cause_list_data = await self._extract_cause_list_from_page(page, state, district, court_complex, date, list_type)
+
+                if cause_list_data:
+                    cause_list_data['court_name'] = court_name or ""
+                    filename = cause_list_filename(state, district, date, list_type, 'json', *court_parts)
+                    filepath = save_json(cause_list_data, filename)
+                    await asyncio.to_thread(self._index_cause_list, filepath)
+                    if cause_list_data['total_cases']:
+                        self.captcha_solver.record_accepted(*solved)
+                    self.logger.info(f"Cause list data saved: {filepath}")
+                    return str(filepath)
+            elif outcome.kind == 'timeout':
+                self.logger.error("No answer to the cause list submit")
+            else:
+                self.logger.warning(f"No cause list for {court_name or court_complex} on {date}: {outcome.message}")
+
+            if codes and outcome.kind in ('error', 'message', 'timeout'):
+                # The cached codes may have gone stale on the portal; forget them and retry once
+                # through the dropdowns (the retry walks the form, so it cannot come back here)
+                self.logger.warning(f"Retrying {court_complex} with court codes read from the form")
+                self.court_hierarchy.invalidate(state, district, court_complex)
+                return await self._download_cause_list(page, state, district, court_complex, court_name, date, list_type)
+
+            return None
+
+        except Exception as e:
+            self.logger.error(f"Error downloading cause list: {e}")
+            return None
+
+    async def _submit_cause_list(self, page, submit_btn) -> CauseListOutcome:
+        """Click a cause list submit button and wait for the first answer: a download, the result table,
+        a message or an error banner"""
+        await page.evaluate(CLEAR_SCRIPT, script_args())
+        watcher = DownloadWatcher(page)
+        answered = None
+        try:
+            async with self.scheduler.arequest(page.url, config.CAUSE_LIST_SLOW_THRESHOLD) as slot:
+                await submit_btn.click()
+                downloaded = watcher.arrived()
+                answered = asyncio.ensure_future(page.wait_for_function(
+                    OUTCOME_SCRIPT, arg=script_args(), timeout=config.CAUSE_LIST_RESULT_TIMEOUT))
+                # A watch that loses to the download may still fail; that is expected, not an error
+                answered.add_done_callback(lambda task: task.cancelled() or task.exception())
+                await asyncio.wait({downloaded, answered}, return_when=asyncio.FIRST_COMPLETED)
+                if downloaded.done():
+                    return CauseListOutcome('download', download=downloaded.result())
+                try:
+                    return CauseListOutcome(**await (await answered).json_value())
+                except PlaywrightTimeout:
+                    slot.fail()
+                    return CauseListOutcome('timeout')
+        finally:
+            if answered and not answered.done():
+                answered.cancel()
+            watcher.close()
+
+    async def _open_cause_list_form(self, page):
+        """Load the cause list form"""
+        await self._goto(page, config.ECOURTS_CAUSELIST_URL)
+        await page.click("text=Cause List")
+
+    async def _read_court_options(self, page, level: str) -> List[Dict]:
+        """Options currently loaded in one dropdown of the cause list form"""
+        return clean_options(await page.eval_on_selector_all(f"{SELECTORS[level]} option", OPTIONS_SCRIPT))
+
+    async def _choose_court_level(self, page, level: str, code: str) -> List[Dict]:
+        """Select a code in one dropdown of the cause list form; returns the options the portal loads into the next"""
+        selector = SELECTORS[level]
+        if level == LEVELS[-1]:
+            await page.select_option(selector, value=code)
+            return []
+
+        next_level = LEVELS[LEVELS.index(level) + 1]
+        # Drop the previous options so the wait below ends only once the new ones arrive
+        await page.eval_on_selector(SELECTORS[next_level], "select => { select.length = 1; }")
+        await page.select_option(selector, value=code)
+        # Each choice makes the portal fetch the next level's options
+        async with self.scheduler.arequest(page.url) as slot:
+            if level == 'state':
+                await page.evaluate("code => fillDistrict(code)", code)
+            elif level == 'district':
+                await page.evaluate("code => fillCourtComplex(code)", code)
+            else:
+                await page.dispatch_event(selector, 'change')
+            try:
+                await page.wait_for_function("selector => document.querySelector(selector).options.length > 1",
+                                             arg=SELECTORS[next_level], timeout=config.WAIT_TIMEOUT)
+            except PlaywrightTimeout:
+                slot.fail()
+                self.logger.warning(f"No {next_level.replace('_', ' ')} options loaded for {level.replace('_', ' ')} {code}")
+                return []
+        return await self._read_court_options(page, next_level)
+
+    async def _walk_court_hierarchy(self, page, names: Sequence[Optional[str]]) -> Optional[Tuple[Dict[str, str], List[Dict]]]:
+        """Choose each named level of the cause list form in turn, recording the options seen;
+        returns the chosen codes and the options loaded below the last one"""
+        options = await self._read_court_options(page, LEVELS[0])
+        self.court_hierarchy.set_options([], options, save=False)
+        codes, path = {}, []
+        try:
+            for level, name in zip(LEVELS, names):
+                option = find_option(options, name)
+                if option is None:
+                    self.logger.error(f"No {level.replace('_', ' ')} named {name!r} in the cause list form")
+                    return None
+                codes[level] = option['code']
+                path.append(option['name'])
+                options = await self._choose_court_level(page, level, option['code'])
+                if level != LEVELS[-1]:
+                    self.court_hierarchy.set_options(path, options, save=False)
+            return codes, options
+        finally:
+            self.court_hierarchy.save()
+
+    def _save_pdf_cause_list(self, pdf_path, state: str, district: str, court_complex: str,
+                             date: str, list_type: str, court_name: Optional[str] = None):
+        """Save the entries of a downloaded cause list PDF as JSON, like the HTML path"""
+        if not config.PARSE_CAUSE_LIST_PDFS:
+            return
+        try:
+            cause_list_data = parse_cause_list_pdf(pdf_path, state, district, court_complex, date, list_type,
+                                                   court_name or "")
+            filepath = save_json(cause_list_data, cause_list_filename(state, district, date, list_type, 'json',
+                                                                      court_complex, court_name))
+            self.logger.info(f"Parsed {cause_list_data['total_cases']} entries from {pdf_path} into {filepath}")
+            self._index_cause_list(filepath)
+        except Exception as e:
+            self.logger.error(f"Error parsing cause list PDF: {e}")
+
+    def _index_cause_list(self, filepath):
+        """Add a saved cause list to the search index"""
+        if not self.cause_list_index:
+            return
+        try:
+            entries = self.cause_list_index.index_file(filepath)
+            self.logger.info(f"Indexed {entries} cause list entries from {filepath}")
+        except Exception as e:
+            self.logger.error(f"Error indexing cause list: {e}")
+
+    async def _extract_cause_list_from_page(self, page, state: str, district: str, court_complex: str,
+                                            date: str, list_type: str) -> Optional[Dict]:
+        """Extract cause list data from HTML page"""
+        try:
+            # Wait for the result table, not just any table on the page
+            await page.wait_for_selector(f"{CAUSE_LIST_CONTAINER} table", timeout=10000)
+
+            # Fetch the whole result in one round trip and parse it here
+            html = await page.inner_html(CAUSE_LIST_CONTAINER)
+            return parse_cause_list(html, state, district, court_complex, date, list_type).to_dict()
+
+        except Exception as e:
+            self.logger.error(f"Error extracting cause list from page: {e}")
+            return None
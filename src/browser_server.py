@@ -0,0 +1,153 @@
+"""
+Warm browser server: one Chromium kept running so short-lived scrapers attach instead of launching
+"""
+import json
+import os
+import shutil
+import subprocess
+import tempfile
+import threading
+import urllib.request
+from pathlib import Path
+from typing import Dict, Optional
+import config
+from .page_pool import chromium_executable, launch_chromium, wait_for_cdp_endpoint
+from .utils import setup_logger
+
+def server_endpoint(port: int = config.BROWSER_SERVER_PORT) -> str:
+    return f"http://127.0.0.1:{port}"
+
+def browser_websocket(endpoint: str, timeout: float = config.BROWSER_SERVER_PROBE_TIMEOUT) -> Optional[str]:
+    """WebSocket URL of the browser answering on a DevTools endpoint, or None"""
+    try:
+        with urllib.request.urlopen(f"{endpoint}/json/version", timeout=timeout) as response:
+            return json.load(response).get('webSocketDebuggerUrl')
+    except (OSError, ValueError, AttributeError):
+        return None
+
+def _private(path: Path, mask: int) -> bool:
+    """Whether a path belongs to this user and has none of the mask's permission bits"""
+    info = os.stat(path)
+    getuid = getattr(os, 'getuid', None)  # Windows has no owner bits; the profile directory's ACL applies
+    return getuid is None or (info.st_uid == getuid() and not info.st_mode & mask)
+
+def read_server_state(state_file: Path = config.BROWSER_SERVER_STATE_FILE) -> Optional[Dict]:
+    """Record a browser server of this user wrote, or None when missing or writable by anyone else"""
+    state_file = Path(state_file)
+    try:
+        if not (_private(state_file.parent, 0o077) and _private(state_file, 0o022)):
+            return None
+        with open(state_file, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def find_server(state_file: Path = config.BROWSER_SERVER_STATE_FILE,
+                timeout: float = config.BROWSER_SERVER_PROBE_TIMEOUT) -> Optional[str]:
+    """DevTools endpoint of this user's browser server, or None.
+
+    Only the browser recorded in the state file counts: whatever else answers
+    on the port has a different WebSocket URL, which holds a random id
+    Chromium picks at launch.
+    """
+    state = read_server_state(state_file)
+    if not isinstance(state, dict) or not state.get('websocket'):
+        return None
+    endpoint = state.get('endpoint')
+    if endpoint and browser_websocket(endpoint, timeout) == state['websocket']:
+        return endpoint
+    return None
+
+class BrowserServer:
+    """Keep one Chromium with a DevTools endpoint on a fixed local port.
+
+    Scrapers created while it runs open their own contexts in this browser
+    instead of launching one, which skips Chromium's cold start; closing a
+    scraper closes its contexts and leaves the browser up. Chromium is
+    started again if it exits. Scrapers only attach (BROWSER_SERVER_ENABLED
+    or --use-browser-server) to the browser recorded in `state_file`, which
+    lives in a directory only this user can write. The endpoint only listens
+    on 127.0.0.1, but anyone on the machine can drive the browser through it.
+    """
+
+    def __init__(self, port: int = config.BROWSER_SERVER_PORT, headless: bool = True,
+                 state_file: Path = config.BROWSER_SERVER_STATE_FILE):
+        self.logger = setup_logger(__name__)
+        self.port = port
+        self.headless = headless
+        self.endpoint = server_endpoint(port)
+        self.state_file = Path(state_file)
+        self._executable = None
+        self._user_data_dir = None
+        self._process = None
+        self._stopped = threading.Event()
+
+    def start(self):
+        """Launch Chromium; fails if a server is already recorded or something answers on the port"""
+        if find_server(self.state_file):
+            raise RuntimeError(f"A browser server is already running ({self.state_file})")
+        if browser_websocket(self.endpoint):
+            raise RuntimeError(f"Another browser already answers on {self.endpoint}")
+        self._executable = chromium_executable()
+        self._user_data_dir = tempfile.mkdtemp(prefix="ecourts_server_")
+        self._launch()
+
+    def _launch(self):
+        self._process = launch_chromium(self.port, self._user_data_dir, self.headless, self._executable)
+        if not wait_for_cdp_endpoint(self.endpoint):
+            self.close()
+            raise RuntimeError(f"Chromium did not expose a DevTools endpoint on {self.endpoint}")
+        self._write_state()
+        self.logger.info(f"Browser server listening on {self.endpoint} (pid {self._process.pid})")
+
+    def _write_state(self):
+        """Record this browser for find_server, in a directory only this user can write"""
+        websocket = browser_websocket(self.endpoint, timeout=5)
+        if not websocket:
+            self.close()
+            raise RuntimeError(f"Chromium on {self.endpoint} did not report its WebSocket URL")
+        self.state_file.parent.mkdir(parents=True, exist_ok=True)
+        os.chmod(self.state_file.parent, 0o700)
+        tmp = self.state_file.with_suffix(f'.{os.getpid()}.tmp')
+        with open(os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600), 'w', encoding='utf-8') as f:
+            json.dump({'endpoint': self.endpoint, 'websocket': websocket, 'pid': os.getpid(),
+                       'chromium_pid': self._process.pid}, f)
+        os.replace(tmp, self.state_file)
+
+    def _remove_state(self):
+        """Delete the state file if this process wrote it"""
+        state = read_server_state(self.state_file)
+        if isinstance(state, dict) and state.get('pid') == os.getpid():
+            self.state_file.unlink(missing_ok=True)
+
+    def serve_forever(self, poll_interval: float = 1.0):
+        """Keep Chromium running until stop() is called, restarting it if it exits"""
+        if self._process is None:
+            self.start()
+        try:
+            while not self._stopped.wait(poll_interval):
+                if self._process.poll() is not None:
+                    self.logger.warning(f"Browser server Chromium exited with code {self._process.returncode}; "
+                                        f"restarting")
+                    self._launch()
+        finally:
+            self.close()
+
+    def stop(self):
+        """Ask serve_forever to shut the browser down; safe from signal handlers"""
+        self._stopped.set()
+
+    def close(self):
+        """Stop Chromium and remove its profile directory and state file"""
+        self._remove_state()
+        if self._process:
+            self._process.terminate()
+            try:
+                self._process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                self._process.kill()
+            self._process = None
+        if self._user_data_dir:
+            shutil.rmtree(self._user_data_dir, ignore_errors=True)
+            self._user_data_dir = None
+        self.logger.info("Browser server stopped")
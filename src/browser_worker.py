@@ -0,0 +1,99 @@
+"""
+Long-lived browser worker for servers: one warm scraper, fed from a job queue
+"""
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+import config
+from .utils import setup_logger
+
+class BrowserWorker:
+    """Keeps one eCourtsScraper and its Chromium running for the life of a server.
+
+    Callers on any thread submit scraper method calls; they queue and run on
+    the worker's own threads, so request handlers never touch Playwright
+    objects. With a single page the scraper is pinned to the one thread that
+    created it, as the sync API requires. With more pages, one thread per
+    page feeds the scraper's page pool, which runs lookups side by side.
+    The scraper starts on the first job, and again on the next job if it
+    failed to launch.
+    """
+
+    def __init__(self, pages: int = config.WEB_BROWSER_PAGES, factory: Optional[Callable[[], Any]] = None):
+        self.logger = setup_logger(__name__)
+        self.pages = max(1, pages)
+        self.factory = factory or self._default_factory
+        # The owner thread starts and closes the scraper; with one page it also runs every job
+        self._owner = ThreadPoolExecutor(max_workers=1, thread_name_prefix="browser-owner")
+        self._jobs = self._owner if self.pages == 1 else ThreadPoolExecutor(max_workers=self.pages,
+                                                                            thread_name_prefix="browser-worker")
+        self._scraper = None
+        self._lock = threading.Lock()
+        self._start_lock = threading.Lock()
+        self._pending = 0
+        self._closed = False
+
+    def _default_factory(self):
+        from .scraper import eCourtsScraper
+        return eCourtsScraper(headless=True, pool_size=self.pages)
+
+    def _ensure_scraper(self):
+        with self._start_lock:
+            if self._scraper is None:
+                self.logger.info(f"Starting browser worker with {self.pages} page(s)")
+                # Job threads hand the launch to the owner; with one page this already is the owner
+                if self._jobs is self._owner:
+                    self._scraper = self.factory()
+                else:
+                    self._scraper = self._owner.submit(self.factory).result()
+            return self._scraper
+
+    def _run(self, method: str, args: tuple, kwargs: Dict) -> Any:
+        try:
+            return getattr(self._ensure_scraper(), method)(*args, **kwargs)
+        finally:
+            with self._lock:
+                self._pending -= 1
+
+    def submit(self, method: str, *args, **kwargs) -> Future:
+        """Queue a scraper method call; the future holds its result"""
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Browser worker is closed")
+            self._pending += 1
+        return self._jobs.submit(self._run, method, args, kwargs)
+
+    def call(self, method: str, *args, timeout: Optional[float] = config.WEB_JOB_TIMEOUT, **kwargs) -> Any:
+        """Run a scraper method on the worker and wait for its result"""
+        return self.submit(method, *args, **kwargs).result(timeout=timeout)
+
+    def stats(self) -> Dict:
+        """Pages, whether the browser is up, and jobs queued or running"""
+        with self._lock:
+            return {'pages': self.pages, 'running': self._scraper is not None, 'pending': self._pending}
+
+    def close(self):
+        """Finish queued jobs, then close the scraper on the thread that owns it"""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+        if self._jobs is not self._owner:
+            self._jobs.shutdown(wait=True)
+        try:
+            # Queued after every job already submitted
+            self._owner.submit(self._close_scraper).result()
+        except RuntimeError:
+            # At interpreter exit the owner thread is already gone; the browser goes with the process
+            self.logger.debug("Browser worker owner thread already stopped")
+        self._owner.shutdown(wait=True)
+
+    def _close_scraper(self):
+        with self._lock:
+            scraper, self._scraper = self._scraper, None
+        if scraper is None:
+            return
+        try:
+            scraper.close()
+        except Exception as e:
+            self.logger.error(f"Error closing browser worker: {e}")
@@ -0,0 +1,110 @@
+"""
+Bulk CNR lookups with streaming JSONL output and resumable checkpoints
+"""
+import json
+import os
+import sys
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, Optional
+from .utils import setup_logger, ensure_dir
+
+def iter_cnrs(source: str) -> Iterator[str]:
+    """Yield CNRs one per line from a file path, or stdin when source is '-'"""
+    if source == '-':
+        for line in sys.stdin:
+            cnr = line.strip()
+            if cnr and not cnr.startswith('#'):
+                yield cnr
+        return
+
+    with open(source, encoding='utf-8') as f:
+        for line in f:
+            cnr = line.strip()
+            if cnr and not cnr.startswith('#'):
+                yield cnr
+
+class Checkpoint:
+    """Append-only record of CNRs whose results have been written"""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.done = set()
+        if self.path.exists():
+            with open(self.path, encoding='utf-8') as f:
+                self.done = {line.strip() for line in f if line.strip()}
+        ensure_dir(self.path.parent)
+        self._file = open(self.path, 'a', encoding='utf-8')
+
+    def __contains__(self, cnr: str) -> bool:
+        return cnr in self.done
+
+    def __len__(self) -> int:
+        return len(self.done)
+
+    def mark(self, cnr: str):
+        """Durably record a finished CNR"""
+        self._file.write(cnr + '\n')
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self.done.add(cnr)
+
+    def close(self):
+        self._file.close()
+
+class JsonlWriter:
+    """Append one JSON record per line, flushed as soon as it is written"""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        ensure_dir(self.path.parent)
+        self._file = open(self.path, 'a', encoding='utf-8')
+
+    def write(self, record: Dict):
+        self._file.write(json.dumps(record, ensure_ascii=False) + '\n')
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+def run_bulk_search(scraper, cnrs: Iterable[str], output_path: Path,
+                    checkpoint_path: Optional[Path] = None, refresh: bool = False) -> Dict:
+    """Stream search_by_cnr results for many CNRs to a JSONL file.
+
+    A CNR is checkpointed only after its record is flushed, so a killed run
+    resumes after the last written result. Failed lookups are not
+    checkpointed and are retried on the next run.
+    """
+    logger = setup_logger(__name__)
+    output_path = Path(output_path)
+    checkpoint_path = Path(checkpoint_path) if checkpoint_path else output_path.with_name(output_path.name + '.checkpoint')
+
+    checkpoint = Checkpoint(checkpoint_path)
+    writer = JsonlWriter(output_path)
+    summary = {'found': 0, 'failed': 0, 'skipped': 0}
+
+    def pending():
+        for cnr in cnrs:
+            if cnr in checkpoint:
+                summary['skipped'] += 1
+                continue
+            yield cnr
+
+    try:
+        if len(checkpoint):
+            logger.info(f"Resuming from checkpoint with {len(checkpoint)} CNRs already done")
+
+        for cnr, result in scraper.search_many(pending(), refresh=refresh):
+            if result:
+                writer.write(result)
+                checkpoint.mark(cnr)
+                summary['found'] += 1
+            else:
+                logger.warning(f"No result for {cnr}, it will be retried on the next run")
+                summary['failed'] += 1
+    finally:
+        writer.close()
+        checkpoint.close()
+
+    summary['output'] = str(output_path)
+    summary['checkpoint'] = str(checkpoint_path)
+    return summary
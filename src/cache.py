@@ -0,0 +1,123 @@
+"""
+Disk-backed cache of CNR lookups with a hearing-aware expiry policy
+"""
+import json
+import sqlite3
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, Iterator, Optional
+import config
+from .utils import setup_logger, parse_date
+
+class CaseCache:
+    """SQLite cache of search_by_cnr results.
+
+    A case's status only changes around its hearings, so a result is trusted
+    until the day before the next hearing (capped at `max_ttl`), re-checked
+    every `hearing_ttl` from then until the hearing is over, and kept for
+    `default_ttl` when the next hearing is unknown or already past. Each
+    operation opens its own connection, so one cache can be shared by pool
+    worker threads and by several processes.
+    """
+
+    def __init__(self, path: Path = config.CASE_CACHE_PATH, default_ttl: float = config.CASE_CACHE_TTL,
+                 hearing_ttl: float = config.CASE_CACHE_HEARING_TTL, max_ttl: float = config.CASE_CACHE_MAX_TTL):
+        self.logger = setup_logger(__name__)
+        self.path = Path(path)
+        self.default_ttl = default_ttl
+        self.hearing_ttl = hearing_ttl
+        self.max_ttl = max_ttl
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS cases (
+                    cnr TEXT PRIMARY KEY,
+                    data TEXT NOT NULL,
+                    fetched_at REAL NOT NULL,
+                    expires_at REAL NOT NULL
+                )
+            """)
+            # Counters live in the database so CLI runs and web workers add up
+            conn.execute("CREATE TABLE IF NOT EXISTS counters (name TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+            conn.executemany("INSERT OR IGNORE INTO counters (name, value) VALUES (?, 0)",
+                             [('hits',), ('misses',)])
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Open a connection for one operation, committing and closing it afterwards"""
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def expires_at(self, case_info: Dict, now: Optional[datetime] = None) -> datetime:
+        """When a freshly fetched result stops being trusted"""
+        now = now or datetime.now()
+        hearing = parse_date(case_info.get('next_hearing') or '')
+        if not hearing or hearing < now.date():
+            return now + timedelta(seconds=self.default_ttl)
+
+        day_before = datetime.combine(hearing - timedelta(days=1), datetime.min.time())
+        if now < day_before:
+            return min(day_before, now + timedelta(seconds=self.max_ttl))
+        # The cause list for the hearing is out: the case may be heard, adjourned or disposed any time
+        return now + timedelta(seconds=self.hearing_ttl)
+
+    def get(self, cnr: str, now: Optional[datetime] = None) -> Optional[Dict]:
+        """Return the cached result for a CNR if it has not expired"""
+        now = now or datetime.now()
+        try:
+            with self._connect() as conn:
+                row = conn.execute(
+                    "SELECT data FROM cases WHERE cnr = ? AND expires_at > ?",
+                    (cnr, now.timestamp())
+                ).fetchone()
+                conn.execute("UPDATE counters SET value = value + 1 WHERE name = ?",
+                             ('hits' if row else 'misses',))
+        except sqlite3.Error as e:
+            self.logger.error(f"Error reading case cache: {e}")
+            return None
+
+        if row:
+            self.logger.info(f"Case cache hit for {cnr}")
+            return json.loads(row[0])
+        return None
+
+    def put(self, cnr: str, case_info: Dict, now: Optional[datetime] = None):
+        """Store a result with an expiry derived from its next hearing"""
+        now = now or datetime.now()
+        try:
+            with self._connect() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO cases (cnr, data, fetched_at, expires_at) VALUES (?, ?, ?, ?)",
+                    (cnr, json.dumps(case_info, ensure_ascii=False), now.timestamp(),
+                     self.expires_at(case_info, now).timestamp())
+                )
+        except sqlite3.Error as e:
+            self.logger.error(f"Error writing case cache: {e}")
+
+    def invalidate(self, cnr: str):
+        """Forget the cached result for a CNR"""
+        with self._connect() as conn:
+            conn.execute("DELETE FROM cases WHERE cnr = ?", (cnr,))
+
+    def stats(self) -> Dict:
+        """Hit/miss counters and the number of live entries"""
+        with self._connect() as conn:
+            entries = conn.execute("SELECT COUNT(*) FROM cases WHERE expires_at > ?", (time.time(),)).fetchone()[0]
+            counters = dict(conn.execute("SELECT name, value FROM counters"))
+        hits, misses = counters.get('hits', 0), counters.get('misses', 0)
+        lookups = hits + misses
+        return {
+            'hits': hits,
+            'misses': misses,
+            'hit_rate': hits / lookups if lookups else 0.0,
+            'entries': entries,
+            'path': str(self.path)
+        }
@@ -0,0 +1,178 @@
+"""
+Segment-and-classify CAPTCHA solver trained on accepted CAPTCHAs
+"""
+import hashlib
+import json
+import threading
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple
+import cv2
+import numpy as np
+import config
+
+GLYPH_SIZE = 16
+MIN_GLYPH_WIDTH = 2
+
+def binarize(image_bytes: bytes) -> np.ndarray:
+    """Decode a CAPTCHA and return a 0/1 mask with ink set to 1"""
+    gray = cv2.imdecode(np.frombuffer(image_bytes, np.uint8), cv2.IMREAD_GRAYSCALE)
+    _, binary = cv2.threshold(gray, 0, 1, cv2.THRESH_BINARY_INV + cv2.THRESH_OTSU)
+    # Drop single-pixel speckle before looking for glyph columns
+    return cv2.morphologyEx(binary, cv2.MORPH_OPEN, np.ones((2, 2), np.uint8))
+
+def segment_glyphs(binary: np.ndarray, length: Optional[int] = None) -> np.ndarray:
+    """Split a binary CAPTCHA into fixed-size glyph vectors, one row per character"""
+    ink = np.concatenate(([0], binary.any(axis=0).astype(np.int8), [0]))
+    edges = np.flatnonzero(np.diff(ink))
+    spans = [(start, end) for start, end in zip(edges[::2], edges[1::2]) if end - start >= MIN_GLYPH_WIDTH]
+
+    # Touching characters show up as one wide span: split the widest until the count fits
+    if length:
+        while spans and len(spans) < length:
+            widest = max(range(len(spans)), key=lambda i: spans[i][1] - spans[i][0])
+            start, end = spans[widest]
+            if end - start < 2 * MIN_GLYPH_WIDTH:
+                break
+            middle = (start + end) // 2
+            spans[widest:widest + 1] = [(start, middle), (middle, end)]
+
+    glyphs = np.zeros((len(spans), GLYPH_SIZE * GLYPH_SIZE), dtype=np.float32)
+    for index, (start, end) in enumerate(spans):
+        column = binary[:, start:end]
+        rows = np.flatnonzero(column.any(axis=1))
+        crop = column[rows[0]:rows[-1] + 1].astype(np.float32)
+        glyphs[index] = cv2.resize(crop, (GLYPH_SIZE, GLYPH_SIZE), interpolation=cv2.INTER_AREA).ravel()
+    return glyphs
+
+class CaptchaClassifier:
+    """k-nearest-neighbour classifier over normalised glyph images"""
+
+    def __init__(self, features: np.ndarray, labels: np.ndarray, length: Optional[int] = None, k: int = 3):
+        self.features = features.astype(np.float32)
+        self.labels = np.asarray(labels)
+        self.length = length
+        self.k = max(1, min(k, len(self.labels)))
+        self._norms = (self.features ** 2).sum(axis=1)
+
+    @classmethod
+    def load(cls, path: Path) -> Optional['CaptchaClassifier']:
+        """Load a saved model, or return None if there is none yet"""
+        path = Path(path)
+        if not path.exists():
+            return None
+        data = np.load(path)
+        length = int(data['length']) or None
+        return cls(data['features'], data['labels'], length=length, k=int(data['k']))
+
+    def save(self, path: Path):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'wb') as f:
+            np.savez_compressed(f, features=self.features, labels=self.labels,
+                                length=self.length or 0, k=self.k)
+
+    def predict(self, glyphs: np.ndarray) -> Tuple[str, np.ndarray]:
+        """Classify glyph vectors, returning the text and a confidence per glyph"""
+        distances = (glyphs ** 2).sum(axis=1)[:, None] + self._norms[None, :] - 2 * glyphs @ self.features.T
+        order = np.argsort(distances, axis=1)
+        nearest_labels = self.labels[order[:, :self.k]]
+
+        chars = []
+        confidences = np.zeros(len(glyphs), dtype=np.float32)
+        for index, row in enumerate(nearest_labels):
+            label, votes = Counter(row).most_common(1)[0]
+            chars.append(label)
+
+            # Compare the closest match with the closest glyph of any other class
+            ranked = self.labels[order[index]]
+            best = distances[index, order[index][ranked == label][0]]
+            others = order[index][ranked != label]
+            runner_up = distances[index, others[0]] if len(others) else best + 1.0
+            margin = 1.0 - max(best, 0.0) / max(runner_up, 1e-6)
+            confidences[index] = votes / self.k * max(margin, 0.0)
+        return ''.join(chars), confidences
+
+    def solve(self, image_bytes: bytes) -> Tuple[Optional[str], float]:
+        """Read a CAPTCHA, returning (text, confidence of the weakest glyph)"""
+        glyphs = segment_glyphs(binarize(image_bytes), self.length)
+        if len(glyphs) == 0 or (self.length and len(glyphs) != self.length):
+            return None, 0.0
+        text, confidences = self.predict(glyphs)
+        return text, float(confidences.min())
+
+class CaptchaCorpus:
+    """CAPTCHA images stored with the text the portal accepted for them"""
+
+    def __init__(self, directory: Path = config.CAPTCHA_CORPUS_DIR):
+        self.directory = Path(directory)
+        self.images_dir = self.directory / "images"
+        self.labels_file = self.directory / "labels.jsonl"
+        self._lock = threading.Lock()
+
+    def add(self, image_bytes: bytes, text: str, source: str = "portal"):
+        """Store an accepted CAPTCHA; identical images are stored once"""
+        digest = hashlib.sha1(image_bytes).hexdigest()
+        image_path = self.images_dir / f"{digest}.png"
+        with self._lock:
+            if image_path.exists():
+                return
+            self.images_dir.mkdir(parents=True, exist_ok=True)
+            image_path.write_bytes(image_bytes)
+            with open(self.labels_file, 'a', encoding='utf-8') as f:
+                f.write(json.dumps({
+                    'image': image_path.name,
+                    'text': text,
+                    'source': source,
+                    'added': datetime.now().isoformat(timespec='seconds')
+                }) + '\n')
+
+    def __iter__(self) -> Iterator[Tuple[bytes, str]]:
+        if not self.labels_file.exists():
+            return
+        with open(self.labels_file, encoding='utf-8') as f:
+            for line in f:
+                record = json.loads(line)
+                image_path = self.images_dir / record['image']
+                if image_path.exists():
+                    yield image_path.read_bytes(), record['text']
+
+    def __len__(self) -> int:
+        if not self.labels_file.exists():
+            return 0
+        with open(self.labels_file, encoding='utf-8') as f:
+            return sum(1 for _ in f)
+
+def train_classifier(corpus: CaptchaCorpus, model_path: Path = config.CAPTCHA_MODEL_PATH,
+                     k: int = 3) -> Optional[dict]:
+    """Retrain the glyph classifier from a corpus and save it; returns training stats"""
+    samples = list(corpus)
+    if not samples:
+        return None
+
+    length = Counter(len(text) for _, text in samples).most_common(1)[0][0]
+    features: List[np.ndarray] = []
+    labels: List[str] = []
+    skipped = 0
+    for image_bytes, text in samples:
+        glyphs = segment_glyphs(binarize(image_bytes), len(text))
+        if len(glyphs) != len(text):
+            skipped += 1
+            continue
+        features.append(glyphs)
+        labels.extend(text)
+
+    if not labels:
+        return None
+
+    classifier = CaptchaClassifier(np.vstack(features), np.array(labels), length=length, k=k)
+    classifier.save(model_path)
+    return {
+        'captchas': len(samples),
+        'skipped': skipped,
+        'glyphs': len(labels),
+        'classes': len(set(labels)),
+        'length': length,
+        'model': str(model_path)
+    }
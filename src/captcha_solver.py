@@ -4,103 +4,172 @@ CAPTCHA Solver using Tesseract OCR
 import cv2
 import numpy as np
 from PIL import Image
-import pytesseract
-import io
 import re
-from typing import Optional
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, List, Dict, Sequence, Tuple
 import config
+from .ocr import OCREngine, create_ocr_engine, ALPHANUMERIC_WHITELIST, NUMERIC_WHITELIST
+from .captcha_classifier import CaptchaClassifier, CaptchaCorpus
+from .models import CaptchaCandidate, CaptchaResult
 from .utils import setup_logger
 
+WHITELISTS = {'alnum': ALPHANUMERIC_WHITELIST, 'numeric': NUMERIC_WHITELIST}
+
 class CaptchaSolver:
     """Solve image-based CAPTCHAs using Tesseract OCR"""
 
-    def __init__(self):
+    def __init__(self, engine: Optional[OCREngine] = None, classifier: Optional[CaptchaClassifier] = None,
+                 corpus: Optional[CaptchaCorpus] = None):
         self.logger = setup_logger(__name__)
 
-        # Set tesseract command path if configured
-        if config.TESSERACT_CMD:
-            pytesseract.pytesseract.tesseract_cmd = config.TESSERACT_CMD
+        # Long-lived OCR engine shared by every solve
+        self.engine = engine or create_ocr_engine()
+
+        # Trained glyph classifier, tried before Tesseract when available
+        self.classifier = classifier or CaptchaClassifier.load(config.CAPTCHA_MODEL_PATH)
+        self.corpus = corpus or (CaptchaCorpus() if config.CAPTCHA_CORPUS_ENABLED else None)
+
+        # Thread pool for OCR hypotheses, created on first use
+        self._executor = None
+        self._executor_lock = threading.Lock()
+
+    def _denoise(self, image_bytes: bytes) -> np.ndarray:
+        """Decode, grayscale and denoise once; every hypothesis starts from this"""
+        nparr = np.frombuffer(image_bytes, np.uint8)
+        gray = cv2.imdecode(nparr, cv2.IMREAD_GRAYSCALE)
+        return cv2.fastNlMeansDenoising(gray)
+
+    def _threshold_variants(self, denoised: np.ndarray,
+                            names: Sequence[str] = config.CAPTCHA_THRESHOLDS) -> Dict[str, Image.Image]:
+        """Binarise the denoised image several ways for OCR"""
+        variants = {}
+        for name in names:
+            if name == 'fixed':
+                _, thresh = cv2.threshold(denoised, 150, 255, cv2.THRESH_BINARY)
+            elif name == 'otsu':
+                _, thresh = cv2.threshold(denoised, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+            elif name == 'adaptive':
+                thresh = cv2.adaptiveThreshold(denoised, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C,
+                                               cv2.THRESH_BINARY, 11, 2)
+            else:
+                raise ValueError(f"Unknown CAPTCHA threshold: {name}")
+            morph = cv2.morphologyEx(thresh, cv2.MORPH_CLOSE, np.ones((2, 2), np.uint8))
+            variants[name] = Image.fromarray(morph)
+        return variants
 
-    def preprocess_image(self, image_bytes: bytes) -> Image.Image:
-        """Preprocess CAPTCHA image for better OCR accuracy"""
+    def _ocr_candidate(self, image: Image.Image, whitelist: str, psm: int, source: str) -> Optional[CaptchaCandidate]:
         try:
-            # Convert bytes to numpy array
-            nparr = np.frombuffer(image_bytes, np.uint8)
-            img = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
-
-            # Convert to grayscale
-            gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
-
-            # Apply thresholding
-            _, thresh = cv2.threshold(gray, 150, 255, cv2.THRESH_BINARY)
-
-            # Denoise
-            denoised = cv2.fastNlMeansDenoising(thresh)
-
-            # Apply morphological operations to remove noise
-            kernel = np.ones((2, 2), np.uint8)
-            morph = cv2.morphologyEx(denoised, cv2.MORPH_CLOSE, kernel)
-
-            # Convert back to PIL Image
-            pil_image = Image.fromarray(morph)
-
-            # Increase contrast
-            from PIL import ImageEnhance
-            enhancer = ImageEnhance.Contrast(pil_image)
-            pil_image = enhancer.enhance(2.0)
-
-            return pil_image
-
+            text, confidence = self.engine.recognize_with_confidence(image, WHITELISTS[whitelist], psm)
         except Exception as e:
-            self.logger.error(f"Error preprocessing image: {e}")
-            # Return original image as fallback
-            return Image.open(io.BytesIO(image_bytes))
+            self.logger.debug(f"OCR hypothesis {source} failed: {e}")
+            return None
+        text = re.sub(r'[^a-zA-Z0-9]', '', text.strip())
+        if len(text) < 4:  # Most CAPTCHAs are 4-6 characters
+            return None
+        return CaptchaCandidate(text=text, confidence=confidence, source=source)
+
+    def _fan_out_hypotheses(self) -> List[Tuple[str, str, int]]:
+        """(threshold, whitelist, psm) to read after a weak first read, most useful first"""
+        hypotheses = [
+            (name, whitelist, psm)
+            for whitelist in config.CAPTCHA_WHITELISTS
+            for psm in config.CAPTCHA_PSM_MODES
+            for name in config.CAPTCHA_THRESHOLDS
+            if (name, whitelist, psm) != tuple(config.CAPTCHA_FIRST_READ)
+        ]
+        if self.engine.spawns_process:
+            # One tesseract process per read: keep the retry cheap
+            hypotheses = hypotheses[:config.CAPTCHA_SUBPROCESS_READS]
+        return hypotheses
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=config.CAPTCHA_OCR_THREADS,
+                                                    thread_name_prefix="captcha-ocr")
+            return self._executor
+
+    def solve(self, image_bytes: bytes) -> CaptchaResult:
+        """Read a CAPTCHA under several hypotheses and rank them by confidence.
+
+        The classifier answers alone when it is confident. Otherwise the image
+        is denoised once and read under CAPTCHA_FIRST_READ. Only when that read
+        is missing or below CAPTCHA_MIN_CONFIDENCE are the other thresholds,
+        whitelists and page-segmentation modes read, in parallel (and only a
+        few of them with the tesseract CLI). Identical reads from different
+        hypotheses add to each other's confidence.
+        """
+        candidates = []
+        if self.classifier:
+            try:
+                text, confidence = self.classifier.solve(image_bytes)
+            except Exception as e:
+                # A broken model must not cost the Tesseract reads
+                self.logger.error(f"Error classifying CAPTCHA, falling back to OCR: {e}")
+                text, confidence = None, 0.0
+            if text:
+                candidates.append(CaptchaCandidate(text=text, confidence=confidence, source='classifier'))
+                if confidence >= config.CAPTCHA_CLASSIFIER_MIN_CONFIDENCE:
+                    self.logger.info(f"CAPTCHA classified: {text} (confidence {confidence:.2f})")
+                    return CaptchaResult(text=text, confidence=confidence, alternatives=candidates)
 
-    def solve_captcha(self, image_bytes: bytes) -> Optional[str]:
-        """Solve CAPTCHA from image bytes"""
         try:
-            # Preprocess image
-            processed_image = self.preprocess_image(image_bytes)
-
-            # Configure tesseract
-            custom_config = r'--oem 3 --psm 7 -c tessedit_char_whitelist=0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz'
-
-            # Extract text
-            text = pytesseract.image_to_string(processed_image, config=custom_config)
-
-            # Clean text
-            text = text.strip()
-            text = re.sub(r'[^a-zA-Z0-9]', '', text)
-
-            if len(text) >= 4:  # Most CAPTCHAs are 4-6 characters
-                self.logger.info(f"CAPTCHA solved: {text}")
-                return text
-            else:
-                self.logger.warning(f"CAPTCHA text too short: {text}")
-                return None
+            denoised = self._denoise(image_bytes)
+            name, whitelist, psm = config.CAPTCHA_FIRST_READ
+            first = self._ocr_candidate(self._threshold_variants(denoised, [name])[name], whitelist, psm,
+                                        f"{whitelist}/psm{psm}/{name}")
+            if first:
+                candidates.append(first)
+            if not first or first.confidence < config.CAPTCHA_MIN_CONFIDENCE:
+                hypotheses = self._fan_out_hypotheses()
+                variants = self._threshold_variants(denoised, sorted({name for name, _, _ in hypotheses}))
+                futures = [
+                    self.executor.submit(self._ocr_candidate, variants[name], whitelist, psm,
+                                         f"{whitelist}/psm{psm}/{name}")
+                    for name, whitelist, psm in hypotheses
+                ]
+                candidates.extend(c for c in (future.result() for future in futures) if c)
 
         except Exception as e:
             self.logger.error(f"Error solving CAPTCHA: {e}")
-            return None
 
-    def solve_numeric_captcha(self, image_bytes: bytes) -> Optional[str]:
-        """Solve numeric-only CAPTCHA"""
+        if not candidates:
+            self.logger.warning("No CAPTCHA hypothesis produced a plausible read")
+            return CaptchaResult()
+
+        # Agreement between independent hypotheses raises confidence
+        scores = {}
+        for candidate in candidates:
+            best, votes = scores.get(candidate.text, (0.0, 0))
+            scores[candidate.text] = (max(best, candidate.confidence), votes + 1)
+        ranked = sorted(
+            ((text, min(1.0, best + 0.1 * (votes - 1))) for text, (best, votes) in scores.items()),
+            key=lambda item: item[1], reverse=True
+        )
+        text, confidence = ranked[0]
+        candidates.sort(key=lambda c: c.confidence, reverse=True)
+        self.logger.info(f"CAPTCHA solved: {text} (confidence {confidence:.2f}, {len(candidates)} reads)")
+        return CaptchaResult(text=text, confidence=confidence, alternatives=candidates)
+
+    def record_accepted(self, image_bytes: bytes, text: str):
+        """Add a CAPTCHA the portal accepted to the training corpus"""
+        if not self.corpus or not image_bytes or not text:
+            return
         try:
-            processed_image = self.preprocess_image(image_bytes)
-
-            # Configure for numbers only
-            custom_config = r'--oem 3 --psm 7 -c tessedit_char_whitelist=0123456789'
-
-            text = pytesseract.image_to_string(processed_image, config=custom_config)
-            text = re.sub(r'[^0-9]', '', text.strip())
-
-            if len(text) >= 4:
-                self.logger.info(f"Numeric CAPTCHA solved: {text}")
-                return text
-            else:
-                self.logger.warning(f"Numeric CAPTCHA text too short: {text}")
-                return None
-
+            self.corpus.add(image_bytes, text)
         except Exception as e:
-            self.logger.error(f"Error solving numeric CAPTCHA: {e}")
-            return None
+            self.logger.error(f"Error recording accepted CAPTCHA: {e}")
+
+    def solve_captcha(self, image_bytes: bytes) -> Optional[str]:
+        """Solve CAPTCHA from image bytes"""
+        return self.solve(image_bytes).text
+
+    def close(self):
+        """Release the OCR engine and thread pool"""
+        with self._executor_lock:
+            if self._executor:
+                self._executor.shutdown()
+                self._executor = None
+        self.engine.close()
@@ -0,0 +1,32 @@
+"""
+Capture CAPTCHA images from network responses instead of screenshots
+"""
+from typing import Optional
+import config
+
+class CaptchaWatcher:
+    """Remember the latest CAPTCHA image response a page received.
+
+    The CAPTCHA endpoint returns a new image on every request, so the bytes
+    the page displayed can only be had from the response that delivered
+    them. Works with sync and async Playwright pages alike: the listener
+    only stores the response, and `body()` is called by the owner later.
+    """
+
+    def __init__(self, page, pattern: str = config.CAPTCHA_RESPONSE_PATTERN):
+        self.pattern = pattern
+        self.latest = None
+        page.on("response", self._on_response)
+
+    def matches(self, response) -> bool:
+        """Predicate for CAPTCHA image responses, usable with page.expect_response"""
+        return self.pattern in response.url and response.ok
+
+    def _on_response(self, response):
+        if self.matches(response):
+            self.latest = response
+
+    def take(self) -> Optional[object]:
+        """Return the latest CAPTCHA response once, so a stale image is never solved twice"""
+        response, self.latest = self.latest, None
+        return response
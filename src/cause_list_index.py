@@ -0,0 +1,214 @@
+"""
+Full-text index over saved cause lists for party and advocate search
+"""
+import json
+import re
+import sqlite3
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+import config
+from .utils import setup_logger, parse_date
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS lists (
+    id INTEGER PRIMARY KEY,
+    source TEXT UNIQUE NOT NULL,
+    mtime REAL NOT NULL,
+    date TEXT,
+    state TEXT,
+    district TEXT,
+    court_complex TEXT,
+    court_name TEXT,
+    judge_name TEXT,
+    list_type TEXT
+);
+CREATE INDEX IF NOT EXISTS lists_date_complex ON lists (date, court_complex);
+
+CREATE TABLE IF NOT EXISTS entries (
+    id INTEGER PRIMARY KEY,
+    list_id INTEGER NOT NULL,
+    serial_number TEXT,
+    case_number TEXT,
+    case_type TEXT,
+    petitioner TEXT,
+    respondent TEXT,
+    advocate TEXT
+);
+CREATE INDEX IF NOT EXISTS entries_list ON entries (list_id);
+CREATE INDEX IF NOT EXISTS entries_case_number ON entries (case_number);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS entries_fts USING fts5(
+    case_number, petitioner, respondent, advocate,
+    content='entries', content_rowid='id', tokenize='unicode61 remove_diacritics 2'
+);
+CREATE TRIGGER IF NOT EXISTS entries_ai AFTER INSERT ON entries BEGIN
+    INSERT INTO entries_fts (rowid, case_number, petitioner, respondent, advocate)
+    VALUES (new.id, new.case_number, new.petitioner, new.respondent, new.advocate);
+END;
+CREATE TRIGGER IF NOT EXISTS entries_ad AFTER DELETE ON entries BEGIN
+    INSERT INTO entries_fts (entries_fts, rowid, case_number, petitioner, respondent, advocate)
+    VALUES ('delete', old.id, old.case_number, old.petitioner, old.respondent, old.advocate);
+END;
+"""
+
+def match_terms(text: str) -> str:
+    """Quote each word of free text as an FTS5 term, so user input is never parsed as query syntax"""
+    words = re.findall(r'\w+', text)
+    return ' AND '.join('"' + word + '"' for word in words)
+
+class SearchResults(list):
+    """Entries a search found, with `truncated` set when more matched than its limit"""
+    truncated = False
+
+class CauseListIndex:
+    """SQLite FTS5 index of cause list entries, keyed by list date and court complex.
+
+    Each saved cause list file is indexed once and re-indexed only when its
+    modification time changes, so `update()` after every scrape is cheap.
+    """
+
+    def __init__(self, path: Path = config.CAUSE_LIST_INDEX_PATH):
+        self.logger = setup_logger(__name__)
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Open a connection for one operation, committing and closing it afterwards"""
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _remove(self, conn: sqlite3.Connection, source: str):
+        row = conn.execute("SELECT id FROM lists WHERE source = ?", (source,)).fetchone()
+        if row:
+            conn.execute("DELETE FROM entries WHERE list_id = ?", (row['id'],))
+            conn.execute("DELETE FROM lists WHERE id = ?", (row['id'],))
+
+    def add_cause_list(self, cause_list: Dict, source: str, mtime: float = 0.0) -> int:
+        """Index one cause list (as produced by CauseList.to_dict), replacing any earlier copy of the source"""
+        day = parse_date(cause_list.get('date') or '')
+        with self._connect() as conn:
+            self._remove(conn, source)
+            list_id = conn.execute(
+                "INSERT INTO lists (source, mtime, date, state, district, court_complex, court_name, judge_name, list_type) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (source, mtime, day.isoformat() if day else None, cause_list.get('state'),
+                 cause_list.get('district'), cause_list.get('court_complex'), cause_list.get('court_name'),
+                 cause_list.get('judge_name'), cause_list.get('list_type'))
+            ).lastrowid
+            entries = cause_list.get('entries') or []
+            conn.executemany(
+                "INSERT INTO entries (list_id, serial_number, case_number, case_type, petitioner, respondent, advocate) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [(list_id, entry.get('serial_number'), entry.get('case_number'), entry.get('case_type'),
+                  entry.get('petitioner'), entry.get('respondent'), entry.get('advocate')) for entry in entries]
+            )
+        return len(entries)
+
+    def index_file(self, path: Path) -> int:
+        """Index a saved cause list JSON file; returns the number of entries"""
+        path = Path(path)
+        with open(path, encoding='utf-8') as f:
+            cause_list = json.load(f)
+        return self.add_cause_list(cause_list, str(path.resolve()), path.stat().st_mtime)
+
+    def update(self, directory: Path = config.JSON_OUTPUT_DIR) -> Dict:
+        """Index new or changed cause list files in a directory and drop deleted ones"""
+        with self._connect() as conn:
+            known = {row['source']: row['mtime'] for row in conn.execute("SELECT source, mtime FROM lists")}
+
+        stats = {'indexed': 0, 'unchanged': 0, 'removed': 0, 'entries': 0}
+        seen = set()
+        for path in sorted(Path(directory).glob("causelist_*.json")):
+            source = str(path.resolve())
+            seen.add(source)
+            if known.get(source) == path.stat().st_mtime:
+                stats['unchanged'] += 1
+                continue
+            try:
+                stats['entries'] += self.index_file(path)
+                stats['indexed'] += 1
+            except (OSError, ValueError) as e:
+                self.logger.error(f"Error indexing cause list {path}: {e}")
+
+        # Only forget lists that came from this directory
+        directory = Path(directory).resolve()
+        stale = [source for source in known if source not in seen and Path(source).parent == directory]
+        if stale:
+            with self._connect() as conn:
+                for source in stale:
+                    self._remove(conn, source)
+            stats['removed'] = len(stale)
+        return stats
+
+    def search(self, advocate: Optional[str] = None, party: Optional[str] = None, text: Optional[str] = None,
+               case_number: Optional[str] = None, court_complex: Optional[str] = None,
+               date_from: Optional[str] = None, date_to: Optional[str] = None,
+               limit: int = config.CAUSE_LIST_SEARCH_LIMIT) -> SearchResults:
+        """Find cause list entries by advocate, party (petitioner or respondent), free text,
+        case number, court complex and date range; at most `limit` are returned"""
+        if limit < 1:
+            # SQLite reads a negative LIMIT as no limit at all
+            raise ValueError(f"limit must be at least 1, not {limit}")
+        for field, value in (('advocate', advocate), ('party', party), ('text', text)):
+            if value and not match_terms(value):
+                raise ValueError(f"Nothing to search for in {field} {value!r}; use letters or digits")
+        match = []
+        if advocate and match_terms(advocate):
+            match.append(f"advocate : ({match_terms(advocate)})")
+        if party and match_terms(party):
+            match.append(f"{{petitioner respondent}} : ({match_terms(party)})")
+        if text and match_terms(text):
+            match.append(f"({match_terms(text)})")
+
+        where, params = [], []
+        if match:
+            where.append("e.id IN (SELECT rowid FROM entries_fts WHERE entries_fts MATCH ?)")
+            params.append(' AND '.join(match))
+        if case_number:
+            where.append("e.case_number = ?")
+            params.append(case_number)
+        if court_complex:
+            where.append("l.court_complex = ? COLLATE NOCASE")
+            params.append(court_complex)
+        for bound, operator in ((date_from, '>='), (date_to, '<=')):
+            if bound:
+                day = parse_date(bound)
+                if not day:
+                    raise ValueError(f"Invalid date: {bound}")
+                where.append(f"l.date {operator} ?")
+                params.append(day.isoformat())
+
+        query = (
+            "SELECT l.date, l.state, l.district, l.court_complex, l.court_name, l.list_type, l.source, "
+            "e.serial_number, e.case_number, e.case_type, e.petitioner, e.respondent, e.advocate "
+            "FROM entries e JOIN lists l ON l.id = e.list_id"
+        )
+        if where:
+            query += " WHERE " + " AND ".join(where)
+        query += " ORDER BY l.date, l.court_complex, e.id LIMIT ?"
+        # One row past the limit tells whether the results were cut short
+        params.append(limit + 1)
+
+        with self._connect() as conn:
+            results = SearchResults(dict(row) for row in conn.execute(query, params))
+        if len(results) > limit:
+            del results[limit:]
+            results.truncated = True
+        return results
+
+    def stats(self) -> Dict:
+        """Number of indexed lists and entries"""
+        with self._connect() as conn:
+            lists = conn.execute("SELECT COUNT(*) FROM lists").fetchone()[0]
+            entries = conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+        return {'lists': lists, 'entries': entries, 'path': str(self.path)}
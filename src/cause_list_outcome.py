@@ -0,0 +1,80 @@
+"""
+Tell how the portal answered a cause list submit: a PDF download, a result
+table, a message in the result container or an error banner
+"""
+import asyncio
+from dataclasses import dataclass
+from typing import List, Optional
+from .parsers import CAUSE_LIST_CONTAINER
+
+# Banners the portal shows a rejected submit in (errorAlert fills the modal, the alert bar is inline)
+ERROR_BANNERS = ("#validateError .alert-danger-cust", "#msg-danger")
+
+# Empties the result container and the banners, so only the answer to the next submit is seen
+CLEAR_SCRIPT = """([container, banners]) => {
+    const results = document.querySelector(container);
+    if (results) results.innerHTML = '';
+    for (const selector of banners) {
+        document.querySelectorAll(selector).forEach(banner => { banner.textContent = ''; });
+    }
+}"""
+
+# Resolves (for wait_for_function) once the page shows an answer; null until then
+OUTCOME_SCRIPT = """([container, banners]) => {
+    const shown = element => element.getClientRects().length > 0 && element.textContent.trim();
+    for (const selector of banners) {
+        const banner = [...document.querySelectorAll(selector)].find(shown);
+        if (banner) return {kind: 'error', message: banner.textContent.trim()};
+    }
+    const results = document.querySelector(container);
+    if (results && results.querySelector('table')) return {kind: 'table'};
+    if (results && results.textContent.trim()) return {kind: 'message', message: results.textContent.trim()};
+    return null;
+}"""
+
+def script_args() -> List:
+    """Argument for CLEAR_SCRIPT and OUTCOME_SCRIPT"""
+    return [CAUSE_LIST_CONTAINER, list(ERROR_BANNERS)]
+
+@dataclass
+class CauseListOutcome:
+    """What a cause list submit produced: 'download', 'table', 'message', 'error' or 'timeout'"""
+    kind: str
+    message: Optional[str] = None
+    download: Optional[object] = None
+
+class DownloadWatcher:
+    """Catch the download a submit starts, on sync and async Playwright pages alike.
+
+    Listening from before the click means a download that starts while the
+    click is still returning is not missed. Close the watcher afterwards to
+    detach the listener.
+    """
+
+    def __init__(self, page):
+        self.page = page
+        self.download = None
+        self._waiters = []
+        page.on("download", self._on_download)
+
+    def _on_download(self, download):
+        if self.download is not None:
+            return
+        self.download = download
+        for waiter in self._waiters:
+            if not waiter.done():
+                waiter.set_result(download)
+
+    def arrived(self) -> asyncio.Future:
+        """Future resolved with the download, for racing it against other waits on the running loop"""
+        future = asyncio.get_running_loop().create_future()
+        if self.download is not None:
+            future.set_result(self.download)
+        else:
+            self._waiters.append(future)
+        return future
+
+    def close(self):
+        self.page.remove_listener("download", self._on_download)
+        for waiter in self._waiters:
+            waiter.cancel()
@@ -0,0 +1,167 @@
+"""
+Local cache of the cause list court hierarchy: state → district → court complex → court
+"""
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+import config
+from .utils import setup_logger
+
+LEVELS = ('state', 'district', 'court_complex', 'court')
+
+# Cause list form dropdown for each level
+SELECTORS = {
+    'state': "select[name='sess_state_code']",
+    'district': "select[name='sees_dist_code']",
+    'court_complex': "select[id='court_complex_code']",
+    'court': "select[name='CL_court_no']",
+}
+
+# Reads [value, label] pairs from a dropdown's options (for eval_on_selector_all)
+OPTIONS_SCRIPT = "options => options.map(option => [option.value, option.textContent.trim()])"
+
+# Sets each [selector, value] dropdown, adding the option when the portal has not loaded it
+SET_VALUES_SCRIPT = """values => {
+    for (const [selector, value] of values) {
+        const select = document.querySelector(selector);
+        if (![...select.options].some(option => option.value === value)) {
+            select.add(new Option(value, value));
+        }
+        select.value = value;
+    }
+}"""
+
+def clean_options(raw: Sequence[Sequence[str]]) -> List[Dict]:
+    """Turn [value, label] pairs into {'code', 'name'} dicts, dropping 'Select ...' placeholders"""
+    return [{'code': value, 'name': label} for value, label in raw
+            if value and value != '0' and label and not label.lower().startswith('select')]
+
+def find_option(options: Sequence[Dict], name: Optional[str]) -> Optional[Dict]:
+    """Option with a name, ignoring case and spacing; the first option when no name is given"""
+    if not name:
+        return options[0] if options else None
+    wanted = ' '.join(name.split()).casefold()
+    return next((option for option in options if ' '.join(option['name'].split()).casefold() == wanted), None)
+
+def form_values(codes: Dict[str, str]) -> List[List[str]]:
+    """[selector, value] pairs for SET_VALUES_SCRIPT from resolved codes"""
+    return [[SELECTORS[level], codes[level]] for level in LEVELS if level in codes]
+
+class CourtHierarchy:
+    """JSON cache of the codes and labels behind the cause list dropdowns.
+
+    Every node records the options of the level below it and when they were
+    fetched. Options older than `max_age` count as missing, so callers fetch
+    them again from the portal. The file is replaced atomically on save.
+    """
+
+    def __init__(self, path: Path = config.COURT_HIERARCHY_PATH, max_age: float = config.COURT_HIERARCHY_MAX_AGE):
+        self.logger = setup_logger(__name__)
+        self.path = Path(path)
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._mtime = None
+        self._root = self._load()
+
+    def _load(self) -> Dict:
+        try:
+            # Noted before reading, so a save racing the read is picked up by the next reload_if_changed
+            self._mtime = self.path.stat().st_mtime_ns
+            with open(self.path, encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            self.logger.error(f"Error reading court hierarchy {self.path}: {e}")
+            return {}
+
+    def save(self):
+        """Write the hierarchy to disk"""
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_suffix(f'.{os.getpid()}.tmp')
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump(self._root, f, ensure_ascii=False)
+            os.replace(tmp, self.path)
+            self._mtime = self.path.stat().st_mtime_ns
+
+    def reload_if_changed(self):
+        """Read the file again if something else saved it since this instance last read or wrote it"""
+        try:
+            mtime = self.path.stat().st_mtime_ns
+        except OSError:
+            return
+        if mtime == self._mtime:
+            return
+        root = self._load()
+        with self._lock:
+            self._root = root
+
+    def _node(self, path: Sequence[str]) -> Optional[Dict]:
+        node = self._root
+        for name in path:
+            node = find_option(node.get('options') or [], name)
+            if node is None:
+                return None
+        return node
+
+    def options(self, *path: str, now: Optional[float] = None) -> Optional[List[Dict]]:
+        """Codes and names one level below a path of names (no path gives the states);
+        None when they are not cached or are stale"""
+        now = now or time.time()
+        with self._lock:
+            node = self._node(path)
+            if node is None or 'options' not in node or now - node.get('fetched_at', 0) > self.max_age:
+                return None
+            return [{'code': option['code'], 'name': option['name']} for option in node['options']]
+
+    def set_options(self, path: Sequence[str], options: Sequence[Dict], now: Optional[float] = None,
+                    save: bool = True):
+        """Record the options one level below a path, keeping what is known below unchanged entries"""
+        with self._lock:
+            node = self._node(path)
+            if node is None:
+                self.logger.warning(f"Cannot record court options below unknown path {' / '.join(path)}")
+                return
+            known = {option['code']: option for option in node.get('options') or []}
+            node['options'] = [{**known.get(option['code'], {}), 'code': option['code'], 'name': option['name']}
+                               for option in options]
+            node['fetched_at'] = now or time.time()
+        if save:
+            self.save()
+
+    def resolve(self, state: str, district: str, court_complex: str, court: Optional[str] = None,
+                now: Optional[float] = None) -> Optional[Dict[str, str]]:
+        """Codes for each level, taking the first court when none is named;
+        None unless every level is cached and fresh"""
+        codes, path = {}, []
+        for level, name in zip(LEVELS, (state, district, court_complex, court)):
+            option = find_option(self.options(*path, now=now) or [], name)
+            if option is None:
+                return None
+            codes[level] = option['code']
+            path.append(option['name'])
+        return codes
+
+    def invalidate(self, *path: str):
+        """Forget the options below a path, so they are fetched again"""
+        with self._lock:
+            node = self._node(path)
+            if node is None:
+                return
+            node.pop('options', None)
+            node.pop('fetched_at', None)
+        self.save()
+
+    def counts(self) -> Dict[str, int]:
+        """Number of cached entries at each level"""
+        counts = dict.fromkeys(LEVELS, 0)
+        with self._lock:
+            nodes = [self._root]
+            for level in LEVELS:
+                nodes = [option for node in nodes for option in node.get('options') or []]
+                counts[level] = len(nodes)
+        return counts
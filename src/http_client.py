@@ -0,0 +1,190 @@
+"""
+Browser-free HTTP transport for eCourts CNR lookups
+"""
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from datetime import datetime
+from typing import Optional, Dict, Iterable, Iterator, Tuple
+import requests
+from requests.adapters import HTTPAdapter
+import config
+from .cache import CaseCache
+from .captcha_solver import CaptchaSolver
+from .parsers import parse_case_info_dict
+from .scheduler import RequestScheduler, default_scheduler
+from .utils import setup_logger, save_json, sanitize_filename
+
+APP_TOKEN_INPUT_PATTERN = re.compile(r'id=["\']app_token["\'][^>]*value=["\']([0-9a-f]+)["\']')
+APP_TOKEN_LINK_PATTERN = re.compile(r'app_token=([0-9a-f]+)')
+
+class ECourtsHttpClient:
+    """CNR lookups over keep-alive requests.Session objects instead of a browser.
+
+    The portal ties each CAPTCHA to the session cookie, so every worker thread
+    gets its own session; each session keeps its connections alive between
+    lookups through a pooled HTTPAdapter.
+    """
+
+    def __init__(self, base_url: str = config.ECOURTS_BASE_URL, captcha_solver: Optional[CaptchaSolver] = None,
+                 workers: int = config.HTTP_WORKERS, timeout: float = config.HTTP_TIMEOUT,
+                 use_cache: bool = config.CASE_CACHE_ENABLED, cache: Optional[CaseCache] = None,
+                 scheduler: Optional[RequestScheduler] = None):
+        self.logger = setup_logger(__name__)
+        self.scheduler = scheduler or default_scheduler()
+        self.captcha_solver = captcha_solver or CaptchaSolver()
+        self.cache = (cache or CaseCache()) if use_cache else None
+        self.base_url = base_url if base_url.endswith('/') else base_url + '/'
+        self.captcha_url = self.base_url + config.ECOURTS_CAPTCHA_PATH
+        self.search_url = self.base_url + config.ECOURTS_CNR_STATUS_PATH
+        self.workers = max(1, workers)
+        self.timeout = timeout
+        self._local = threading.local()
+        self._sessions = []
+        self._sessions_lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        """Close every pooled session"""
+        with self._sessions_lock:
+            for session in self._sessions:
+                session.close()
+            self._sessions = []
+        self.captcha_solver.close()
+
+    @property
+    def session(self) -> requests.Session:
+        """Keep-alive session owned by the calling thread"""
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=config.HTTP_POOL_CONNECTIONS,
+                                  pool_maxsize=config.HTTP_POOL_CONNECTIONS)
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            session.headers.update({
+                'User-Agent': config.USER_AGENT,
+                'X-Requested-With': 'XMLHttpRequest',
+            })
+            self._local.session = session
+            self._local.app_token = None
+            with self._sessions_lock:
+                self._sessions.append(session)
+        return session
+
+    def _update_app_token(self, text: str):
+        # The hidden input holds the live token; links may carry stale ones
+        match = APP_TOKEN_INPUT_PATTERN.search(text) or APP_TOKEN_LINK_PATTERN.search(text)
+        if match:
+            self._local.app_token = match.group(1)
+
+    def _landing(self):
+        """Load the portal home page to obtain the session cookie and app token"""
+        with self.scheduler.request(self.base_url) as slot:
+            response = self.session.get(self.base_url, timeout=self.timeout)
+            slot.status(response.status_code)
+        response.raise_for_status()
+        self._update_app_token(response.text)
+
+    def _fetch_captcha(self) -> bytes:
+        """Fetch a fresh CAPTCHA image for the current session"""
+        with self.scheduler.request(self.captcha_url) as slot:
+            response = self.session.get(self.captcha_url, params={str(time.time()): ''}, timeout=self.timeout)
+            slot.status(response.status_code)
+        response.raise_for_status()
+        return response.content
+
+    def _submit_cnr(self, cnr: str, captcha_text: str) -> Dict:
+        """Submit the CNR search form and return the JSON reply"""
+        with self.scheduler.request(self.search_url) as slot:
+            response = self.session.post(self.search_url, data={
+                'cino': cnr,
+                'fcaptcha_code': captcha_text,
+                'ajax_req': 'true',
+                'app_token': getattr(self._local, 'app_token', None) or '',
+            }, timeout=self.timeout)
+            slot.status(response.status_code)
+        response.raise_for_status()
+        reply = response.json()
+        if reply.get('app_token'):
+            self._local.app_token = reply['app_token']
+        return reply
+
+    def search_by_cnr(self, cnr: str, max_retries: int = config.MAX_CAPTCHA_RETRIES,
+                      refresh: bool = False) -> Optional[Dict]:
+        """Search case by CNR number without a browser, reusing a cached result unless refresh is set;
+        never raises, so one failed lookup cannot stop a bulk run"""
+        try:
+            if self.cache and not refresh:
+                cached = self.cache.get(cnr)
+                if cached:
+                    return cached
+
+            self.logger.info(f"Searching case with CNR over HTTP: {cnr}")
+            if not getattr(self._local, 'app_token', None):
+                self._landing()
+
+            for attempt in range(max_retries):
+                self.logger.info(f"CAPTCHA solving attempt {attempt + 1}/{max_retries}")
+                captcha_bytes = self._fetch_captcha()
+                result = self.captcha_solver.solve(captcha_bytes)
+                if not result.text or result.confidence < config.CAPTCHA_MIN_CONFIDENCE:
+                    # Fetching another CAPTCHA is cheaper than a submit that will be rejected
+                    self.logger.info(f"Skipping uncertain CAPTCHA read ({result.confidence:.2f})")
+                    continue
+                captcha_text = result.text
+
+                reply = self._submit_cnr(cnr, captcha_text)
+                error = reply.get('errormsg')
+                if error:
+                    if 'captcha' in error.lower():
+                        self.logger.warning(f"CAPTCHA rejected: {error}")
+                        continue
+                    self.logger.error(f"Portal returned an error for {cnr}: {error}")
+                    return None
+
+                html = reply.get('casetype_list') or ''
+                case_info = parse_case_info_dict(html, cnr)
+                if not case_info.get('case_type') and not case_info.get('case_number'):
+                    self.logger.warning(f"No case details in response for {cnr}")
+                    return None
+
+                self.captcha_solver.record_accepted(captcha_bytes, captcha_text)
+                if self.cache:
+                    self.cache.put(cnr, case_info)
+
+                filename = f"case_{sanitize_filename(cnr)}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+                save_json(case_info, filename)
+                self.logger.info(f"Case info saved to {filename}")
+                return case_info
+
+            self.logger.error("Failed to solve CAPTCHA after all retries")
+            return None
+
+        except Exception as e:
+            self.logger.error(f"Error searching by CNR over HTTP: {e}")
+            # Start over with a fresh landing request next time
+            self._local.app_token = None
+            return None
+
+    def search_many(self, cnrs: Iterable[str], refresh: bool = False) -> Iterator[Tuple[str, Optional[Dict]]]:
+        """Search many CNRs on worker threads, yielding (cnr, result) as each finishes"""
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="ecourts-http") as executor:
+            pending = {}
+            for cnr in cnrs:
+                pending[executor.submit(self.search_by_cnr, cnr, refresh=refresh)] = cnr
+                if len(pending) >= self.workers * 2:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        yield pending.pop(future), future.result()
+
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield pending.pop(future), future.result()
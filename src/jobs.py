@@ -0,0 +1,139 @@
+"""
+Background jobs for the web UI: lookups queued on the browser worker, with stage-by-stage progress
+"""
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+import config
+from .utils import setup_logger
+
+@dataclass
+class Job:
+    """One queued lookup: its state, the stages it reached and its result"""
+    id: str
+    kind: str
+    params: Dict
+    status: str = 'queued'  # queued, running, done or failed
+    stage: Optional[str] = None
+    events: List[Dict] = field(default_factory=list)
+    result: Any = None
+    error: Optional[str] = None
+    batch_id: Optional[str] = None
+    created: float = field(default_factory=time.time)
+    finished: Optional[float] = None
+
+    @property
+    def is_finished(self) -> bool:
+        return self.status in ('done', 'failed')
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'kind': self.kind,
+            'params': self.params,
+            'status': self.status,
+            'stage': self.stage,
+            'events': list(self.events),
+            'result': self.result,
+            'error': self.error,
+            'batch_id': self.batch_id,
+            'created': self.created,
+            'finished': self.finished
+        }
+
+class JobManager:
+    """Queue scraper calls on a BrowserWorker and track them as jobs.
+
+    Every job records the stages the scraper reports, so clients can poll a
+    job or stream its events instead of holding a request open for the whole
+    lookup. Finished jobs are kept for `ttl` seconds; at most `max_jobs` are
+    kept in all, the oldest finished ones going first.
+    """
+
+    def __init__(self, worker, ttl: float = config.WEB_JOB_TTL, max_jobs: int = config.WEB_MAX_JOBS):
+        self.logger = setup_logger(__name__)
+        self.worker = worker
+        self.ttl = ttl
+        self.max_jobs = max_jobs
+        self._jobs: Dict[str, Job] = {}
+        self._batches: Dict[str, List[str]] = {}
+        self._changed = threading.Condition()
+
+    def submit(self, kind: str, method: str, kwargs: Dict, failure: str, batch_id: Optional[str] = None) -> Job:
+        """Queue a scraper method call as a job; `failure` is the error recorded if it finds nothing"""
+        job = Job(id=uuid.uuid4().hex, kind=kind, params=kwargs, batch_id=batch_id)
+        with self._changed:
+            self._prune()
+            self._jobs[job.id] = job
+        try:
+            future = self.worker.submit(method, progress=lambda stage: self._progress(job, stage), **kwargs)
+        except Exception:
+            with self._changed:
+                del self._jobs[job.id]
+            raise
+        future.add_done_callback(lambda done: self._finish(job, done, failure))
+        return job
+
+    def submit_batch(self, calls: List[Tuple[str, str, Dict, str]]) -> Tuple[str, List[Job]]:
+        """Queue several (kind, method, kwargs, failure) calls under one batch id"""
+        batch_id = uuid.uuid4().hex
+        with self._changed:
+            self._batches[batch_id] = []
+        jobs = [self.submit(kind, method, kwargs, failure, batch_id) for kind, method, kwargs, failure in calls]
+        with self._changed:
+            self._batches[batch_id] = [job.id for job in jobs]
+        return batch_id, jobs
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._changed:
+            return self._jobs.get(job_id)
+
+    def batch(self, batch_id: str) -> Optional[List[Job]]:
+        """Jobs of a batch still kept, in submission order"""
+        with self._changed:
+            ids = self._batches.get(batch_id)
+            if ids is None:
+                return None
+            return [self._jobs[job_id] for job_id in ids if job_id in self._jobs]
+
+    def wait(self, job: Job, seen: int, timeout: float) -> List[Dict]:
+        """Events of a job after the first `seen`, waiting up to timeout for one if there are none yet"""
+        with self._changed:
+            self._changed.wait_for(lambda: len(job.events) > seen or job.is_finished, timeout=timeout)
+            return job.events[seen:]
+
+    def _progress(self, job: Job, stage: str):
+        with self._changed:
+            job.status = 'running'
+            job.stage = stage
+            job.events.append({'stage': stage, 'at': time.time()})
+            self._changed.notify_all()
+
+    def _finish(self, job: Job, future, failure: str):
+        try:
+            result, error = future.result(), None
+        except Exception as e:
+            self.logger.error(f"Job {job.id} ({job.kind}) failed: {e}")
+            result, error = None, str(e) or type(e).__name__
+        with self._changed:
+            job.result = result
+            job.error = error or (None if result else failure)
+            job.status = 'failed' if job.error else 'done'
+            job.stage = job.status
+            job.finished = time.time()
+            job.events.append({'stage': job.status, 'at': job.finished})
+            self._changed.notify_all()
+
+    def _prune(self):
+        """Forget finished jobs past their ttl, and the oldest finished ones beyond max_jobs"""
+        now = time.time()
+        finished = sorted((job for job in self._jobs.values() if job.is_finished), key=lambda job: job.finished)
+        excess = len(self._jobs) + 1 - self.max_jobs
+        for index, job in enumerate(finished):
+            if now - job.finished > self.ttl or index < excess:
+                del self._jobs[job.id]
+        live = {job.batch_id for job in self._jobs.values()}
+        for batch_id in [batch_id for batch_id, ids in self._batches.items() if ids and batch_id not in live]:
+            del self._batches[batch_id]
@@ -5,36 +5,90 @@ from dataclasses import dataclass, field
 from typing import Optional, List
 from datetime import datetime
 
+@dataclass
+class HearingRecord:
+    """One row of a case's hearing history"""
+    judge: Optional[str] = None
+    business_on_date: Optional[str] = None
+    hearing_date: Optional[str] = None
+    purpose: Optional[str] = None
+
+    def to_dict(self):
+        return {
+            'judge': self.judge,
+            'business_on_date': self.business_on_date,
+            'hearing_date': self.hearing_date,
+            'purpose': self.purpose
+        }
+
+@dataclass
+class ActSection:
+    """An act a case is filed under and the sections invoked"""
+    act: str
+    sections: Optional[str] = None
+
+    def to_dict(self):
+        return {
+            'act': self.act,
+            'sections': self.sections
+        }
+
+@dataclass
+class FIRDetails:
+    """First information report a criminal case arises from"""
+    police_station: Optional[str] = None
+    fir_number: Optional[str] = None
+    year: Optional[str] = None
+
+    def to_dict(self):
+        return {
+            'police_station': self.police_station,
+            'fir_number': self.fir_number,
+            'year': self.year
+        }
+
 @dataclass
 class CaseInfo:
     """Case information model"""
     cnr: str
     case_number: Optional[str] = None
     case_type: Optional[str] = None
+    filing_number: Optional[str] = None
     filing_date: Optional[str] = None
     registration_date: Optional[str] = None
     status: Optional[str] = None
+    sub_stage: Optional[str] = None
     court_name: Optional[str] = None
     judge_name: Optional[str] = None
     petitioner: Optional[str] = None
     respondent: Optional[str] = None
     listed_on: Optional[List[str]] = field(default_factory=list)
+    first_hearing: Optional[str] = None
     next_hearing: Optional[str] = None
+    acts: List[ActSection] = field(default_factory=list)
+    fir: Optional[FIRDetails] = None
+    history: List[HearingRecord] = field(default_factory=list)
 
     def to_dict(self):
         return {
             'cnr': self.cnr,
             'case_number': self.case_number,
             'case_type': self.case_type,
+            'filing_number': self.filing_number,
             'filing_date': self.filing_date,
             'registration_date': self.registration_date,
             'status': self.status,
+            'sub_stage': self.sub_stage,
             'court_name': self.court_name,
             'judge_name': self.judge_name,
             'petitioner': self.petitioner,
             'respondent': self.respondent,
             'listed_on': self.listed_on,
-            'next_hearing': self.next_hearing
+            'first_hearing': self.first_hearing,
+            'next_hearing': self.next_hearing,
+            'acts': [act.to_dict() for act in self.acts],
+            'fir': self.fir.to_dict() if self.fir else None,
+            'history': [record.to_dict() for record in self.history]
         }
 
 @dataclass
@@ -81,3 +135,31 @@ class CauseList:
             'total_cases': len(self.entries),
             'entries': [entry.to_dict() for entry in self.entries]
         }
+
+@dataclass
+class CaptchaCandidate:
+    """One reading of a CAPTCHA and how it was produced"""
+    text: str
+    confidence: float
+    source: str
+
+    def to_dict(self):
+        return {
+            'text': self.text,
+            'confidence': self.confidence,
+            'source': self.source
+        }
+
+@dataclass
+class CaptchaResult:
+    """Best CAPTCHA reading plus the alternatives that were considered"""
+    text: Optional[str] = None
+    confidence: float = 0.0
+    alternatives: List[CaptchaCandidate] = field(default_factory=list)
+
+    def to_dict(self):
+        return {
+            'text': self.text,
+            'confidence': self.confidence,
+            'alternatives': [candidate.to_dict() for candidate in self.alternatives]
+        }
@@ -0,0 +1,161 @@
+"""
+OCR backends for the CAPTCHA solver
+"""
+import subprocess
+import tempfile
+import threading
+from pathlib import Path
+from typing import List, Optional, Tuple
+from PIL import Image
+import pytesseract
+import config
+from .utils import setup_logger
+
+try:
+    import tesserocr
+except ImportError:  # optional, from requirements-ocr.txt; without it OCR falls back to the CLI
+    tesserocr = None
+
+ALPHANUMERIC_WHITELIST = '0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz'
+NUMERIC_WHITELIST = '0123456789'
+
+class OCREngine:
+    """Base class for OCR backends used by CaptchaSolver"""
+
+    name = 'base'
+    # Whether each read starts a process, which makes extra hypotheses expensive
+    spawns_process = False
+
+    def recognize(self, image: Image.Image, whitelist: str = ALPHANUMERIC_WHITELIST, psm: int = 7) -> str:
+        """Read the text in one image"""
+        raise NotImplementedError
+
+    def recognize_with_confidence(self, image: Image.Image, whitelist: str = ALPHANUMERIC_WHITELIST,
+                                  psm: int = 7) -> Tuple[str, float]:
+        """Read the text in one image with a 0-1 confidence; 0.5 when the engine cannot tell"""
+        return self.recognize(image, whitelist, psm), 0.5
+
+    def recognize_batch(self, images: List[Image.Image], whitelist: str = ALPHANUMERIC_WHITELIST,
+                        psm: int = 7) -> List[str]:
+        """Read the text in several images"""
+        return [self.recognize(image, whitelist, psm) for image in images]
+
+    def close(self):
+        """Release any long-lived resources"""
+
+class TesserocrEngine(OCREngine):
+    """In-process Tesseract that loads the language model once per thread and mode"""
+
+    name = 'tesserocr'
+
+    def __init__(self, tessdata: Optional[str] = config.TESSDATA_DIR, lang: str = 'eng'):
+        if tesserocr is None:
+            raise ImportError("tesserocr is not installed")
+        self.tessdata = tessdata
+        self.lang = lang
+        self._local = threading.local()
+        self._apis = []
+        self._apis_lock = threading.Lock()
+
+    def _api(self, psm: int):
+        # PyTessBaseAPI is not thread-safe, so each thread keeps its own instances
+        apis = getattr(self._local, 'apis', None)
+        if apis is None:
+            apis = self._local.apis = {}
+        api = apis.get(psm)
+        if api is None:
+            kwargs = {'lang': self.lang, 'psm': psm, 'oem': tesserocr.OEM.DEFAULT}
+            if self.tessdata:
+                kwargs['path'] = self.tessdata
+            api = apis[psm] = tesserocr.PyTessBaseAPI(**kwargs)
+            with self._apis_lock:
+                self._apis.append(api)
+        return api
+
+    def recognize(self, image: Image.Image, whitelist: str = ALPHANUMERIC_WHITELIST, psm: int = 7) -> str:
+        api = self._api(psm)
+        api.SetVariable('tessedit_char_whitelist', whitelist)
+        api.SetImage(image)
+        return api.GetUTF8Text()
+
+    def recognize_with_confidence(self, image: Image.Image, whitelist: str = ALPHANUMERIC_WHITELIST,
+                                  psm: int = 7) -> Tuple[str, float]:
+        api = self._api(psm)
+        api.SetVariable('tessedit_char_whitelist', whitelist)
+        api.SetImage(image)
+        text = api.GetUTF8Text()
+        return text, api.MeanTextConf() / 100
+
+    def close(self):
+        with self._apis_lock:
+            for api in self._apis:
+                api.End()
+            self._apis = []
+
+class TesseractEngine(OCREngine):
+    """Tesseract command line engine that reads a whole batch in one process"""
+
+    name = 'tesseract'
+    spawns_process = True
+
+    def __init__(self, tesseract_cmd: Optional[str] = config.TESSERACT_CMD):
+        if tesseract_cmd:
+            pytesseract.pytesseract.tesseract_cmd = tesseract_cmd
+
+    def _config(self, whitelist: str, psm: int) -> List[str]:
+        return ['--oem', '3', '--psm', str(psm), '-c', f'tessedit_char_whitelist={whitelist}']
+
+    def recognize(self, image: Image.Image, whitelist: str = ALPHANUMERIC_WHITELIST, psm: int = 7) -> str:
+        return pytesseract.image_to_string(image, config=' '.join(self._config(whitelist, psm)))
+
+    def recognize_with_confidence(self, image: Image.Image, whitelist: str = ALPHANUMERIC_WHITELIST,
+                                  psm: int = 7) -> Tuple[str, float]:
+        data = pytesseract.image_to_data(image, config=' '.join(self._config(whitelist, psm)),
+                                         output_type=pytesseract.Output.DICT)
+        words = [(word, float(conf)) for word, conf in zip(data['text'], data['conf'])
+                 if word.strip() and float(conf) >= 0]
+        if not words:
+            return '', 0.0
+        text = ''.join(word for word, _ in words)
+        return text, sum(conf for _, conf in words) / len(words) / 100
+
+    def recognize_batch(self, images: List[Image.Image], whitelist: str = ALPHANUMERIC_WHITELIST,
+                        psm: int = 7) -> List[str]:
+        if len(images) < 2:
+            return super().recognize_batch(images, whitelist, psm)
+
+        # Tesseract accepts a text file listing images and loads the model once for all of them
+        with tempfile.TemporaryDirectory(prefix="ecourts_ocr_") as tmp:
+            tmp = Path(tmp)
+            paths = []
+            for index, image in enumerate(images):
+                path = tmp / f"{index}.png"
+                image.save(path)
+                paths.append(str(path))
+            list_file = tmp / "images.txt"
+            list_file.write_text('\n'.join(paths) + '\n')
+
+            result = subprocess.run(
+                [pytesseract.pytesseract.tesseract_cmd, str(list_file), 'stdout', *self._config(whitelist, psm)],
+                capture_output=True, text=True, check=True
+            )
+        return split_batch_output(result.stdout, len(images))
+
+def split_batch_output(output: str, count: int) -> List[str]:
+    """Split multi-image Tesseract output, which ends each page with a form feed"""
+    pages = output.split('\f')
+    pages = pages[:count] + [''] * (count - len(pages))
+    return [page.strip() for page in pages]
+
+def create_ocr_engine(backend: str = config.OCR_BACKEND) -> OCREngine:
+    """Create the configured OCR engine; 'auto' prefers the in-process backend"""
+    if backend == 'auto':
+        backend = 'tesserocr' if tesserocr is not None else 'tesseract'
+        if tesserocr is None:
+            setup_logger(__name__).warning("tesserocr is not installed; reading CAPTCHAs with the slower "
+                                           "tesseract command (pip install tesserocr)")
+    if backend == 'tesserocr':
+        return TesserocrEngine()
+    if backend == 'tesseract':
+        return TesseractEngine()
+    raise ValueError(f"Unknown OCR backend: {backend}")
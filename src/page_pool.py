@@ -0,0 +1,339 @@
+"""
+Browser page pool for eCourts Scraper
+"""
+import queue
+import shutil
+import socket
+import subprocess
+import tempfile
+import threading
+import time
+import urllib.request
+from concurrent.futures import Future, wait, FIRST_COMPLETED
+from typing import Any, Callable, Iterable, Iterator, Optional, Tuple
+
+from playwright.sync_api import sync_playwright
+import config
+from .utils import setup_logger
+
+
+def context_options() -> dict:
+    """Options shared by every browser context the scraper creates"""
+    return {
+        'viewport': config.VIEWPORT,
+        'user_agent': config.USER_AGENT,
+    }
+
+
+def find_free_port() -> int:
+    """Ask the OS for a free local TCP port"""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def wait_for_cdp_endpoint(endpoint: str, timeout: float = 30.0) -> bool:
+    """Poll a Chromium DevTools endpoint until it answers or timeout expires"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with urllib.request.urlopen(f"{endpoint}/json/version", timeout=1):
+                return True
+        except OSError:
+            time.sleep(0.1)
+    return False
+
+
+def chromium_executable() -> str:
+    """Path of the Chromium build Playwright installed"""
+    playwright = sync_playwright().start()
+    try:
+        return playwright.chromium.executable_path
+    finally:
+        playwright.stop()
+
+
+def launch_chromium(port: int, user_data_dir: str, headless: bool = config.HEADLESS,
+                    executable: Optional[str] = None, no_sandbox: bool = config.CHROMIUM_NO_SANDBOX) -> subprocess.Popen:
+    """Start a Chromium process exposing a DevTools endpoint on a local port"""
+    args = [
+        executable or chromium_executable(),
+        f"--remote-debugging-port={port}",
+        f"--user-data-dir={user_data_dir}",
+        '--no-first-run',
+        '--no-default-browser-check',
+        *config.BROWSER_ARGS,
+    ]
+    if no_sandbox:
+        args.append('--no-sandbox')
+    if headless:
+        args.append('--headless=new')
+    args.append('about:blank')
+    return subprocess.Popen(args, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+class PagePool:
+    """Pool of isolated browser contexts/pages inside a single Chromium.
+
+    With size 1 the pool keeps one context and page on the calling thread,
+    like the original single-page scraper. With a larger size one Chromium
+    process is started with a local DevTools endpoint and every page is owned
+    by a worker thread attached to it. Playwright's sync API pins objects to
+    the thread that created them, so callers hand work to the pool and it runs
+    on whichever page is checked in, instead of pages moving between threads.
+
+    Given the `endpoint` of a Chromium that is already running (see
+    browser_server.py), the pool opens its contexts there instead of
+    launching a browser, and leaves that browser running on close.
+    """
+
+    def __init__(self, size: int = config.PAGE_POOL_SIZE, headless: bool = config.HEADLESS,
+                 on_page: Optional[Callable] = None, endpoint: Optional[str] = None):
+        self.logger = setup_logger(__name__)
+        self.size = max(1, size)
+        self.headless = headless
+        # Called with every new page, on the thread that owns it
+        self.on_page = on_page
+        self.page = None
+
+        # Inline (size 1) state
+        self._playwright = None
+        self._browser = None
+        self._context = None
+        self._lock = threading.RLock()
+        self._busy = False
+
+        # Worker (size > 1) state; an endpoint given here belongs to a browser the pool does not own
+        self.endpoint = endpoint
+        self.attached = endpoint is not None
+        self._process = None
+        self._user_data_dir = None
+        self._jobs = queue.Queue()
+        self._workers = []
+        self._idle = 0
+        self._live = 0
+        self._idle_lock = threading.Lock()
+
+        if self.size == 1:
+            self._start_inline()
+        else:
+            self._start_workers()
+
+    @property
+    def available(self) -> int:
+        """Number of pages currently checked in and waiting for work"""
+        if self.size == 1:
+            return 0 if self._busy else 1
+        with self._idle_lock:
+            return self._idle
+
+    def _start_inline(self):
+        """Launch one browser, context and page on the calling thread"""
+        self._playwright = sync_playwright().start()
+        try:
+            if self.attached:
+                self._browser = self._playwright.chromium.connect_over_cdp(self.endpoint)
+            else:
+                self._browser = self._playwright.chromium.launch(
+                    headless=self.headless,
+                    args=config.BROWSER_ARGS,
+                    chromium_sandbox=not config.CHROMIUM_NO_SANDBOX
+                )
+            self._context = self._browser.new_context(**context_options())
+            self.page = self._new_page(self._context)
+        except Exception:
+            # Stop the driver too, or its event loop stays attached to this thread
+            self.close()
+            raise
+
+    def _start_workers(self):
+        """Start one shared Chromium, unless attached to one, and a worker thread per pooled page"""
+        if not self.attached:
+            self._launch_shared_browser()
+
+        ready = []
+        for index in range(self.size):
+            started = Future()
+            worker = threading.Thread(
+                target=self._worker_loop,
+                args=(index, started),
+                name=f"page-pool-{index}",
+                daemon=True
+            )
+            worker.start()
+            self._workers.append(worker)
+            ready.append(started)
+
+        try:
+            for started in ready:
+                started.result(timeout=config.BROWSER_TIMEOUT / 1000)
+        except Exception:
+            self.close()
+            raise
+
+        self.logger.info(f"Page pool ready with {self.size} pages on {self.endpoint}")
+
+    def _launch_shared_browser(self):
+        """Start a Chromium process exposing a local DevTools endpoint"""
+        port = find_free_port()
+        self._user_data_dir = tempfile.mkdtemp(prefix="ecourts_chromium_")
+        self._process = launch_chromium(port, self._user_data_dir, self.headless)
+        self.endpoint = f"http://127.0.0.1:{port}"
+        if not wait_for_cdp_endpoint(self.endpoint):
+            self.close()
+            raise RuntimeError(f"Chromium did not expose a DevTools endpoint on {self.endpoint}")
+
+    def _new_page(self, context):
+        page = context.new_page()
+        page.set_default_timeout(config.BROWSER_TIMEOUT)
+        if self.on_page:
+            self.on_page(page)
+        return page
+
+    def _worker_loop(self, index: int, started: Future):
+        """Own one isolated context/page and run jobs from the shared queue"""
+        try:
+            playwright = sync_playwright().start()
+            browser = playwright.chromium.connect_over_cdp(self.endpoint)
+            context = browser.new_context(**context_options())
+            page = self._new_page(context)
+        except Exception as e:
+            self.logger.error(f"Page pool worker {index} failed to start: {e}")
+            started.set_exception(e)
+            return
+        with self._idle_lock:
+            self._live += 1
+        started.set_result(True)
+
+        while True:
+            with self._idle_lock:
+                self._idle += 1
+            job = self._jobs.get()
+            with self._idle_lock:
+                self._idle -= 1
+            if job is None:
+                break
+
+            future, func, args, kwargs = job
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(func(page, *args, **kwargs))
+            except BaseException as e:
+                future.set_exception(e)
+
+            # Return a usable page to the pool even if the job crashed it
+            if page.is_closed():
+                self.logger.warning(f"Page pool worker {index} replacing closed page")
+                try:
+                    context, page = self._replace_page(index, browser, context)
+                except Exception as e:
+                    self.logger.error(f"Page pool worker {index} could not replace its page, stopping: {e}")
+                    self._worker_lost()
+                    break
+
+        try:
+            context.close()
+            browser.close()
+            playwright.stop()
+        except Exception as e:
+            self.logger.error(f"Error closing page pool worker {index}: {e}")
+
+    def _replace_page(self, index: int, browser, context) -> Tuple[Any, Any]:
+        """A new page in the worker's context, or in a new context if that one is gone too"""
+        try:
+            return context, self._new_page(context)
+        except Exception as e:
+            self.logger.warning(f"Page pool worker {index} rebuilding its context: {e}")
+        try:
+            context.close()
+        except Exception:
+            pass
+        context = browser.new_context(**context_options())
+        return context, self._new_page(context)
+
+    def _worker_lost(self):
+        """Fail queued jobs once no worker is left to run them, rather than leave callers waiting"""
+        with self._idle_lock:
+            self._live -= 1
+            if self._live:
+                return
+            while True:
+                try:
+                    job = self._jobs.get_nowait()
+                except queue.Empty:
+                    break
+                if job and job[0].set_running_or_notify_cancel():
+                    job[0].set_exception(RuntimeError("Page pool has no working pages left"))
+
+    def submit(self, func: Callable, *args, **kwargs) -> Future:
+        """Schedule func(page, *args, **kwargs) on the next free page"""
+        future = Future()
+        if self.size == 1:
+            with self._lock:
+                self._busy = True
+                future.set_running_or_notify_cancel()
+                try:
+                    future.set_result(func(self.page, *args, **kwargs))
+                except BaseException as e:
+                    future.set_exception(e)
+                finally:
+                    self._busy = False
+            return future
+
+        with self._idle_lock:
+            if not self._live:
+                future.set_exception(RuntimeError("Page pool has no working pages left"))
+                return future
+            self._jobs.put((future, func, args, kwargs))
+        return future
+
+    def run(self, func: Callable, *args, **kwargs) -> Any:
+        """Run func(page, *args, **kwargs) on a free page and return its result"""
+        return self.submit(func, *args, **kwargs).result()
+
+    def imap(self, func: Callable, items: Iterable, max_pending: Optional[int] = None) -> Iterator[Tuple[Any, Any]]:
+        """Yield (item, result) pairs as pages finish, keeping few jobs in flight"""
+        max_pending = max_pending or self.size * 2
+        pending = {}
+        for item in items:
+            pending[self.submit(func, item)] = item
+            if len(pending) >= max_pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield pending.pop(future), future.result()
+
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield pending.pop(future), future.result()
+
+    def close(self):
+        """Close every page and context, and the shared browser unless the pool attached to it"""
+        if self.size == 1:
+            if self.page:
+                self.page.close()
+            if self._context:
+                self._context.close()
+            if self._browser:
+                self._browser.close()
+            if self._playwright:
+                self._playwright.stop()
+            return
+
+        for _ in self._workers:
+            self._jobs.put(None)
+        for worker in self._workers:
+            worker.join(timeout=30)
+        self._workers = []
+
+        if self._process:
+            self._process.terminate()
+            try:
+                self._process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                self._process.kill()
+            self._process = None
+        if self._user_data_dir:
+            shutil.rmtree(self._user_data_dir, ignore_errors=True)
+            self._user_data_dir = None
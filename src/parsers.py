@@ -0,0 +1,156 @@
+"""
+HTML parsers for eCourts pages
+
+Parsing is a pure function of the page source, built on lxml with XPath
+expressions compiled once at import, so it can run in worker threads or
+processes away from the browser loop.
+"""
+from typing import Dict, List, Optional, Union
+from lxml import etree, html as lxml_html
+from .models import ActSection, CaseInfo, CauseList, CauseListEntry, FIRDetails, HearingRecord
+
+# Container the portal renders cause list results into
+CAUSE_LIST_CONTAINER = '#res_cause_list'
+
+def _table_rows(css_class: str) -> etree.XPath:
+    """Rows of the first table carrying a class, header rows included"""
+    return etree.XPath(
+        f'(//table[contains(concat(" ", normalize-space(@class), " "), " {css_class} ")])[1]//tr'
+    )
+
+CASE_DETAILS_ROWS = _table_rows('case_details_table')
+CASE_STATUS_ROWS = _table_rows('case_status_table')
+PETITIONER_ROWS = _table_rows('Petitioner_Advocate_table')
+RESPONDENT_ROWS = _table_rows('Respondent_Advocate_table')
+ACTS_ROWS = _table_rows('acts_table')
+FIR_ROWS = _table_rows('FIR_details_table')
+HISTORY_ROWS = _table_rows('history_table')
+ROW_CELLS = etree.XPath('./th | ./td')
+DATA_CELLS = etree.XPath('./td')
+CELL_TEXT = etree.XPath('.//text()')
+CAUSE_LIST_RESULTS = etree.XPath(f'//*[@id="{CAUSE_LIST_CONTAINER.lstrip("#")}"]')
+FIRST_TABLE_ROWS = etree.XPath('(.//table)[1]//tr')
+
+Markup = Union[str, bytes]
+
+def _document(html: Markup):
+    """Parse page source into an lxml tree; an empty page gives an empty document"""
+    if not html or not html.strip():
+        return lxml_html.fromstring('<html></html>')
+    return lxml_html.fromstring(html)
+
+def _text(element) -> str:
+    """Text of an element with runs of whitespace (including <br> breaks) collapsed"""
+    return ' '.join(' '.join(CELL_TEXT(element)).split())
+
+def _cells(row) -> List[str]:
+    return [_text(cell) for cell in ROW_CELLS(row)]
+
+def _rows(xpath: etree.XPath, tree) -> List[List[str]]:
+    """Cell texts of each row, skipping empty rows"""
+    return [cells for cells in (_cells(row) for row in xpath(tree)) if cells]
+
+def _cell(cells: List[str], index: int) -> Optional[str]:
+    return (cells[index] or None) if len(cells) > index else None
+
+def _labelled(rows: List[List[str]]) -> Dict[str, List[str]]:
+    """Map the label in each row's first cell (without a trailing colon) to the row"""
+    return {cells[0].rstrip(':').strip(): cells for cells in rows if len(cells) > 1}
+
+def _parties(rows: List[List[str]]) -> Optional[str]:
+    return ' '.join(' '.join(cells) for cells in rows) or None
+
+def _header_skipped(rows: List[List[str]], first_header: str) -> List[List[str]]:
+    """Drop a leading header row, recognised by its first cell"""
+    if rows and rows[0][0].lower().startswith(first_header):
+        return rows[1:]
+    return rows
+
+def parse_case_info(html: Markup, cnr: str) -> CaseInfo:
+    """Parse case information, acts, FIR and hearing history from a CNR search result page"""
+    tree = _document(html)
+    case_info = CaseInfo(cnr=cnr)
+
+    # Case details: label/value pairs, with filing and registration dates in the fourth cell
+    details = _labelled(_rows(CASE_DETAILS_ROWS, tree))
+    if 'Case Type' in details:
+        case_info.case_type = _cell(details['Case Type'], 1)
+    if 'Filing Number' in details:
+        case_info.filing_number = _cell(details['Filing Number'], 1)
+        case_info.filing_date = _cell(details['Filing Number'], 3)
+    if 'Registration Number' in details:
+        case_info.case_number = _cell(details['Registration Number'], 1)
+        case_info.registration_date = _cell(details['Registration Number'], 3)
+
+    # Case status
+    status = _labelled(_rows(CASE_STATUS_ROWS, tree))
+    if 'First Hearing Date' in status:
+        case_info.first_hearing = _cell(status['First Hearing Date'], 1)
+    if 'Next Hearing Date' in status:
+        case_info.next_hearing = _cell(status['Next Hearing Date'], 1)
+    if 'Case Stage' in status:
+        case_info.status = _cell(status['Case Stage'], 1)
+        case_info.sub_stage = _cell(status['Case Stage'], 3)
+    if 'Court Number and Judge' in status:
+        case_info.court_name = _cell(status['Court Number and Judge'], 1)
+
+    case_info.petitioner = _parties(_rows(PETITIONER_ROWS, tree))
+    case_info.respondent = _parties(_rows(RESPONDENT_ROWS, tree))
+
+    for cells in _header_skipped(_rows(ACTS_ROWS, tree), 'under act'):
+        if cells[0]:
+            case_info.acts.append(ActSection(act=cells[0], sections=_cell(cells, 1)))
+
+    fir = _labelled(_rows(FIR_ROWS, tree))
+    if fir:
+        case_info.fir = FIRDetails(
+            police_station=_cell(fir.get('Police Station', []), 1),
+            fir_number=_cell(fir.get('FIR Number', []), 1),
+            year=_cell(fir.get('Year', []), 1)
+        )
+
+    for cells in _header_skipped(_rows(HISTORY_ROWS, tree), 'judge'):
+        case_info.history.append(HearingRecord(
+            judge=_cell(cells, 0),
+            business_on_date=_cell(cells, 1),
+            hearing_date=_cell(cells, 2),
+            purpose=_cell(cells, 3)
+        ))
+    # Each business date in the history is a day the case was on the board
+    case_info.listed_on = [record.business_on_date for record in case_info.history if record.business_on_date]
+
+    return case_info
+
+def parse_case_info_dict(html: Markup, cnr: str) -> Dict:
+    """parse_case_info as a plain dict, for executors that pickle results across processes"""
+    return parse_case_info(html, cnr).to_dict()
+
+def parse_cause_list(html: Markup, state: str, district: str, court_complex: str,
+                     date: str, list_type: str) -> CauseList:
+    """Parse cause list entries from the result table of a cause list page or its result fragment"""
+    tree = _document(html)
+    # A full page has other tables; only the one in the result container is the cause list
+    containers = CAUSE_LIST_RESULTS(tree)
+    rows = FIRST_TABLE_ROWS(containers[0] if containers else tree.getroottree().getroot())
+
+    entries = []
+    for row in rows[1:]:  # Skip header
+        cells = [_text(cell) for cell in DATA_CELLS(row)]
+        if len(cells) >= 3:
+            entries.append(CauseListEntry(
+                serial_number=cells[0],
+                case_number=cells[1],
+                petitioner=cells[2] if len(cells) > 2 else None,
+                respondent=cells[3] if len(cells) > 3 else None,
+                advocate=cells[4] if len(cells) > 4 else None
+            ))
+
+    return CauseList(
+        date=date,
+        state=state,
+        district=district,
+        court_complex=court_complex,
+        court_name="",
+        list_type=list_type,
+        entries=entries
+    )
@@ -0,0 +1,192 @@
+"""
+Streaming parser for cause list PDFs
+"""
+import re
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from pdfminer.high_level import extract_pages
+from pdfminer.layout import LAParams, LTTextBox, LTTextLineHorizontal
+import config
+from .models import CauseList, CauseListEntry
+from .utils import setup_logger
+
+# Header cell patterns, checked in order; the first match names the column.
+# Advocate comes first, so "Petitioner Advocate" and "Name of Advocate" are not taken for parties.
+HEADER_PATTERNS = [
+    ('serial_number', re.compile(r'^(sr|sl|s\.?\s*no|serial|#)', re.I)),
+    ('advocate', re.compile(r'advocate|counsel', re.I)),
+    ('petitioner', re.compile(r'petitioner|appellant|plaintiff|complainant', re.I)),
+    ('respondent', re.compile(r'respondent|defendant|accused', re.I)),
+    ('party', re.compile(r'part(y|ies)|name of', re.I)),
+    ('case_number', re.compile(r'case', re.I)),
+]
+HEADER_MIN_COLUMNS = 3  # Recognised cells a header needs, besides making up most of its row
+# Column order assumed when a list has no recognisable header, as on the HTML path
+DEFAULT_COLUMNS = ['serial_number', 'case_number', 'petitioner', 'respondent', 'advocate']
+SERIAL_PATTERN = re.compile(r'^\d+\.?$')
+VERSUS_PATTERN = re.compile(r'\s+(?:vs\.?|v/s\.?|versus)\s+', re.I)
+ROW_TOLERANCE = 3.0  # Points between line tops still treated as one row
+COLUMN_TOLERANCE = 6.0  # Points a cell may start left of its header
+
+def _text_lines(page) -> Iterator[LTTextLineHorizontal]:
+    for element in page:
+        if isinstance(element, LTTextBox):
+            for line in element:
+                if isinstance(line, LTTextLineHorizontal):
+                    yield line
+        elif isinstance(element, LTTextLineHorizontal):
+            yield element
+
+def page_rows(page) -> List[List[Tuple[float, str]]]:
+    """Group a page's text lines into rows of (x0, text) cells, top to bottom"""
+    lines = sorted(((line.y1, line.x0, line.get_text().strip()) for line in _text_lines(page)),
+                   key=lambda item: (-item[0], item[1]))
+    rows = []
+    row_top = None
+    for top, x0, text in lines:
+        if not text:
+            continue
+        if row_top is None or row_top - top > ROW_TOLERANCE:
+            rows.append([])
+            row_top = top
+        rows[-1].append((x0, text))
+    return [sorted(row) for row in rows]
+
+def _header_columns(row: List[Tuple[float, str]]) -> Optional[List[Tuple[float, str]]]:
+    """Column start positions if the row is a table header: most of its cells, and at least
+    HEADER_MIN_COLUMNS, name a column, and it does not start with a serial number like an entry"""
+    if not row or SERIAL_PATTERN.match(row[0][1]):
+        return None
+    columns = []
+    for x0, text in row:
+        for field, pattern in HEADER_PATTERNS:
+            if pattern.search(text):
+                columns.append((x0, field))
+                break
+    if len(columns) < HEADER_MIN_COLUMNS or len(columns) * 2 <= len(row):
+        return None
+    return columns
+
+class _EntryBuilder:
+    """Turn table rows into entries; rows without a serial number continue the previous entry"""
+
+    def __init__(self):
+        self.columns = None
+        self.fields = None
+
+    def _assign(self, row: List[Tuple[float, str]]) -> Dict[str, List[str]]:
+        cells = {}
+        if self.columns:
+            for x0, text in row:
+                field = self.columns[0][1]
+                for start, name in self.columns:
+                    if start <= x0 + COLUMN_TOLERANCE:
+                        field = name
+                cells.setdefault(field, []).append(text)
+        else:
+            for (_, text), field in zip(row, DEFAULT_COLUMNS):
+                cells.setdefault(field, []).append(text)
+        return cells
+
+    def feed(self, row: List[Tuple[float, str]]) -> Optional[CauseListEntry]:
+        """Add a row; returns the previous entry once a new one starts"""
+        header = _header_columns(row)
+        if header:
+            self.columns = header
+            return None
+
+        cells = self._assign(row)
+        serial = ' '.join(cells.get('serial_number', []))
+        if SERIAL_PATTERN.match(serial):
+            finished = self.finish()
+            self.fields = cells
+            return finished
+
+        if self.fields is not None:
+            for field, texts in cells.items():
+                self.fields.setdefault(field, []).extend(texts)
+        return None
+
+    def finish(self) -> Optional[CauseListEntry]:
+        """Return the entry in progress, if any"""
+        if self.fields is None:
+            return None
+        fields = {name: ' '.join(texts).strip() or None for name, texts in self.fields.items()}
+        self.fields = None
+
+        petitioner, respondent = fields.get('petitioner'), fields.get('respondent')
+        party = fields.get('party')
+        if party:
+            parts = VERSUS_PATTERN.split(party, maxsplit=1)
+            petitioner = petitioner or parts[0]
+            respondent = respondent or (parts[1] if len(parts) > 1 else None)
+
+        return CauseListEntry(
+            serial_number=(fields.get('serial_number') or '').rstrip('.'),
+            case_number=fields.get('case_number') or '',
+            petitioner=petitioner,
+            respondent=respondent,
+            advocate=fields.get('advocate')
+        )
+
+def iter_cause_list_entries(path: Path) -> Iterator[CauseListEntry]:
+    """Yield entries from a cause list PDF, laying out one page at a time"""
+    builder = _EntryBuilder()
+    # A small character margin keeps closely spaced table columns as separate lines
+    laparams = LAParams(char_margin=1.0, line_margin=0.3)
+    for page in extract_pages(str(path), laparams=laparams):
+        for row in page_rows(page):
+            entry = builder.feed(row)
+            if entry:
+                yield entry
+    entry = builder.finish()
+    if entry:
+        yield entry
+
+def parse_cause_list_pdf(path: Path, state: str = "", district: str = "", court_complex: str = "",
+                         date: str = "", list_type: str = "Civil", court_name: str = "") -> Dict:
+    """Parse a cause list PDF into the same dict the HTML extraction path saves"""
+    cause_list = CauseList(
+        date=date,
+        state=state,
+        district=district,
+        court_complex=court_complex,
+        court_name=court_name,
+        list_type=list_type,
+        entries=list(iter_cause_list_entries(path))
+    )
+    return cause_list.to_dict()
+
+def metadata_from_filename(path: Path) -> Dict:
+    """Recover state, district, date, list type and any court complex and court from a cause_list_filename() name"""
+    parts = Path(path).stem.split('_')
+    if not 5 <= len(parts) <= 7 or parts[0] != 'causelist' or not re.fullmatch(r'\d{8}', parts[3]):
+        return {}
+    day = parts[3]
+    metadata = {
+        'state': parts[1],
+        'district': parts[2],
+        'date': f"{day[:2]}-{day[2:4]}-{day[4:]}",
+        'list_type': parts[4]
+    }
+    metadata.update(zip(('court_complex', 'court_name'), parts[5:]))
+    return metadata
+
+def _parse_file(path: str) -> Dict:
+    return parse_cause_list_pdf(path, **metadata_from_filename(path))
+
+def parse_cause_list_pdfs(paths: Iterable[Path], workers: Optional[int] = config.PDF_PARSE_WORKERS
+                          ) -> Iterator[Tuple[Path, Optional[Dict]]]:
+    """Parse many cause list PDFs on a process pool, yielding (path, cause list) in input order"""
+    logger = setup_logger(__name__)
+    paths = [Path(path) for path in paths]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(_parse_file, str(path)) for path in paths]
+        for path, future in zip(paths, futures):
+            try:
+                yield path, future.result()
+            except Exception as e:
+                # A damaged PDF should not stop the rest of the batch
+                logger.error(f"Error parsing cause list PDF {path}: {e}")
+                yield path, None
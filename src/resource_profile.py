@@ -0,0 +1,74 @@
+"""
+Resource profiles: what the browser skips fetching while scraping the portal
+"""
+import re
+import threading
+from collections import Counter
+from functools import lru_cache
+from typing import Dict, Tuple
+import config
+
+def extension_patterns(*extensions: str) -> Tuple[str, ...]:
+    """Patterns for URLs whose path ends in an extension, with or without a query string.
+    Chromium matches case-sensitively, so the upper-case spelling is listed too."""
+    return tuple(pattern for extension in extensions for spelling in (extension, extension.upper())
+                 for pattern in (f'*.{spelling}', f'*.{spelling}?*'))
+
+FONTS = extension_patterns('woff', 'woff2', 'ttf', 'otf', 'eot')
+# Decorative images only; the CAPTCHA is served by a .php endpoint and never matches
+IMAGES = extension_patterns('png', 'jpg', 'jpeg', 'gif', 'svg', 'ico', 'webp')
+MEDIA = extension_patterns('mp4', 'webm', 'mp3')
+TRACKERS = ('*google-analytics.com*', '*googletagmanager.com*', '*doubleclick.net*', '*facebook.net*')
+STYLESHEETS = extension_patterns('css')
+
+# Profile name -> URL patterns (Chromium's Network.setBlockedURLs wildcards).
+# Scripts, documents and XHR are never blocked: the forms and CAPTCHA refresh need them.
+PROFILES: Dict[str, Tuple[str, ...]] = {
+    'off': (),
+    'lean': FONTS + IMAGES + MEDIA + TRACKERS,
+    # Also drops CSS; element visibility then ignores stylesheets, so check a flow before relying on it
+    'minimal': FONTS + IMAGES + MEDIA + TRACKERS + STYLESHEETS,
+}
+
+# Chromium's failure text for a request stopped by the blocklist
+BLOCKED_ERROR = 'net::ERR_BLOCKED_BY_CLIENT'
+
+def blocked_patterns(profile: str = config.RESOURCE_PROFILE) -> Tuple[str, ...]:
+    """URL patterns a profile blocks"""
+    try:
+        return PROFILES[profile]
+    except KeyError:
+        raise ValueError(f"Unknown resource profile {profile!r}; choose from {', '.join(PROFILES)}") from None
+
+@lru_cache(maxsize=None)
+def _pattern_regex(pattern: str) -> re.Pattern:
+    # Only '*' is a wildcard for Chromium; '?' and everything else match literally
+    return re.compile('.*'.join(re.escape(part) for part in pattern.split('*')), re.DOTALL)
+
+def is_blocked(url: str, profile: str = config.RESOURCE_PROFILE) -> bool:
+    """Whether a URL matches one of a profile's patterns, case-sensitively as Chromium does"""
+    return any(_pattern_regex(pattern).fullmatch(url) for pattern in blocked_patterns(profile))
+
+class BlockedRequests:
+    """Count the requests a profile stopped, by resource type.
+
+    Listens for requestfailed events, so it works with sync and async
+    Playwright pages alike and costs nothing for requests that go through.
+    """
+
+    def __init__(self):
+        self.counts = Counter()
+        self._lock = threading.Lock()
+
+    def watch(self, page):
+        page.on("requestfailed", self._on_failed)
+
+    def _on_failed(self, request):
+        if request.failure == BLOCKED_ERROR:
+            with self._lock:
+                self.counts[request.resource_type] += 1
+
+    def summary(self) -> Dict:
+        """Total blocked requests and the count per resource type"""
+        with self._lock:
+            return {'blocked': sum(self.counts.values()), 'by_type': dict(self.counts)}
@@ -0,0 +1,179 @@
+"""
+Request pacing for the eCourts portal: per-host token buckets, a cap on
+requests in flight and jittered backoff when the portal slows down or fails
+"""
+import asyncio
+import random
+import threading
+import time
+import weakref
+from contextlib import asynccontextmanager, contextmanager
+from typing import AsyncIterator, Callable, Dict, Iterator, Optional
+from urllib.parse import urlparse
+import config
+from .utils import setup_logger
+
+# Statuses that mean the portal is overloaded or throttling us
+BACKOFF_STATUSES = {429, 500, 502, 503, 504}
+
+def host_of(url: str) -> str:
+    """Host part of a URL; the bare string when it is not a URL"""
+    return urlparse(url).netloc or url
+
+class RequestSlot:
+    """Handed to the caller for one scheduled request, to report a failing status"""
+
+    def __init__(self):
+        self.ok = True
+
+    def status(self, code: Optional[int]):
+        """Count the request as failed when the portal answered with a throttling or server error"""
+        if code in BACKOFF_STATUSES:
+            self.ok = False
+
+    def fail(self):
+        """Count the request as failed"""
+        self.ok = False
+
+class _HostState:
+    def __init__(self, burst: float, concurrency: int):
+        self.tokens = burst
+        self.updated = None
+        self.failures = 0
+        self.blocked_until = 0.0
+        self.requests = 0
+        self.errors = 0
+        self.waited = 0.0
+        self.slots = threading.BoundedSemaphore(concurrency)
+        # asyncio semaphores are bound to the loop that first waits on them, so each loop gets its own
+        self.async_slots = weakref.WeakKeyDictionary()
+
+class RequestScheduler:
+    """Paces every request to a host through a token bucket that gains one
+    token every `delay` seconds and holds up to `burst` tokens.
+
+    At most `concurrency` requests per host are in flight. A request that
+    fails or takes longer than `slow_threshold` seconds pushes the next
+    request to that host back by a jittered, exponentially growing delay
+    (capped at `backoff_max`); a normal response resets it. Thread-safe, and
+    usable from asyncio code through `arequest`.
+    """
+
+    def __init__(self, delay: float = config.REQUEST_DELAY, burst: float = config.REQUEST_BURST,
+                 concurrency: int = config.MAX_CONCURRENT_REQUESTS, backoff_base: float = config.BACKOFF_BASE,
+                 backoff_max: float = config.BACKOFF_MAX, slow_threshold: float = config.SLOW_RESPONSE_THRESHOLD,
+                 clock: Callable[[], float] = time.monotonic):
+        self.logger = setup_logger(__name__)
+        self.delay = max(0.0, delay)
+        self.burst = max(1.0, burst)
+        self.concurrency = max(1, concurrency)
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.slow_threshold = slow_threshold
+        self.clock = clock
+        self._hosts: Dict[str, _HostState] = {}
+        self._lock = threading.Lock()
+
+    def _host(self, host: str) -> _HostState:
+        state = self._hosts.get(host)
+        if state is None:
+            state = self._hosts[host] = _HostState(self.burst, self.concurrency)
+        return state
+
+    def reserve(self, url: str) -> float:
+        """Take a token for a request to the URL's host; returns how long to wait before sending it"""
+        host = host_of(url)
+        with self._lock:
+            state = self._host(host)
+            now = self.clock()
+            delay = max(0.0, state.blocked_until - now)
+            if self.delay:
+                if state.updated is not None:
+                    state.tokens = min(self.burst, state.tokens + (now - state.updated) / self.delay)
+                state.updated = now
+                # Tokens may go negative: each waiting request owns a later slot in the bucket
+                state.tokens -= 1
+                delay = max(delay, -state.tokens * self.delay)
+            state.requests += 1
+            state.waited += delay
+            return delay
+
+    def record(self, url: str, ok: bool, elapsed: float = 0.0, slow_threshold: Optional[float] = None):
+        """Report how a request went, backing off the host after failures or responses slower than
+        `slow_threshold` (the scheduler's own when None)"""
+        host = host_of(url)
+        with self._lock:
+            state = self._host(host)
+            if ok and elapsed <= (self.slow_threshold if slow_threshold is None else slow_threshold):
+                state.failures = 0
+                return
+            state.failures += 1
+            state.errors += 1
+            delay = min(self.backoff_max, self.backoff_base * 2 ** (state.failures - 1))
+            # Full jitter keeps parallel workers from retrying in lockstep
+            delay = random.uniform(delay / 2, delay)
+            state.blocked_until = max(state.blocked_until, self.clock() + delay)
+        reason = 'failed' if not ok else f'took {elapsed:.1f}s'
+        self.logger.warning(f"Request to {host} {reason}; backing off {delay:.1f}s")
+
+    @contextmanager
+    def request(self, url: str, slow_threshold: Optional[float] = None) -> Iterator[RequestSlot]:
+        """Wait for the host's turn, then time the request made inside the block; requests that are
+        slow by nature can pass a higher `slow_threshold`"""
+        state = self._host_state(url)
+        # Wait out the pacing before taking a slot, so a paced request does not hold one while it sleeps
+        delay = self.reserve(url)
+        if delay:
+            time.sleep(delay)
+        with state.slots:
+            slot = RequestSlot()
+            start = self.clock()
+            try:
+                yield slot
+            except BaseException:
+                self.record(url, False, self.clock() - start)
+                raise
+            self.record(url, slot.ok, self.clock() - start, slow_threshold)
+
+    @asynccontextmanager
+    async def arequest(self, url: str, slow_threshold: Optional[float] = None) -> AsyncIterator[RequestSlot]:
+        """`request` for asyncio code; the cap on requests in flight applies per event loop"""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            state = self._host(host_of(url))
+            slots = state.async_slots.get(loop)
+            if slots is None:
+                slots = state.async_slots[loop] = asyncio.Semaphore(self.concurrency)
+        delay = self.reserve(url)
+        if delay:
+            await asyncio.sleep(delay)
+        async with slots:
+            slot = RequestSlot()
+            start = self.clock()
+            try:
+                yield slot
+            except BaseException:
+                self.record(url, False, self.clock() - start)
+                raise
+            self.record(url, slot.ok, self.clock() - start, slow_threshold)
+
+    def _host_state(self, url: str) -> _HostState:
+        with self._lock:
+            return self._host(host_of(url))
+
+    def stats(self) -> Dict[str, Dict]:
+        """Requests, failures and total seconds spent waiting, per host"""
+        with self._lock:
+            return {host: {'requests': state.requests, 'errors': state.errors, 'waited': round(state.waited, 2)}
+                    for host, state in self._hosts.items()}
+
+_default_scheduler = None
+_default_lock = threading.Lock()
+
+def default_scheduler() -> RequestScheduler:
+    """Process-wide scheduler, so every scraper and client shares one budget per host"""
+    global _default_scheduler
+    with _default_lock:
+        if _default_scheduler is None:
+            _default_scheduler = RequestScheduler()
+        return _default_scheduler
@@ -1,46 +1,68 @@
 """
 Main scraper module for eCourts
 """
-from playwright.sync_api import sync_playwright, TimeoutError as PlaywrightTimeout
-from typing import Optional, Dict, List
+from playwright.sync_api import TimeoutError as PlaywrightTimeout
+from typing import Callable, Optional, Dict, List, Iterable, Iterator, Sequence, Tuple
 import time
 from datetime import datetime, timedelta
 import json
 import config
+from .browser_server import find_server
+from .cache import CaseCache
 from .captcha_solver import CaptchaSolver
-from .utils import setup_logger, save_json, save_pdf, get_today_date, get_tomorrow_date, sanitize_filename
-from .models import CaseInfo, CauseList, CauseListEntry
-from bs4 import BeautifulSoup
+from .cause_list_index import CauseListIndex
+from .captcha_watcher import CaptchaWatcher
+from .cause_list_outcome import CLEAR_SCRIPT, OUTCOME_SCRIPT, CauseListOutcome, DownloadWatcher, script_args
+from .court_hierarchy import CourtHierarchy, LEVELS, SELECTORS, OPTIONS_SCRIPT, SET_VALUES_SCRIPT, clean_options, find_option, form_values
+from .page_pool import PagePool
+from .resource_profile import BlockedRequests, blocked_patterns
+from .scheduler import RequestScheduler, default_scheduler
+from .single_flight import SingleFlight, cnr_key, cause_list_key
+from .utils import setup_logger, ensure_dir, save_json, save_pdf, get_today_date, get_tomorrow_date, sanitize_filename, cause_list_filename, cause_list_manifest, cause_list_manifest_filename, normalize_dates, listing_verdicts
+from .parsers import parse_case_info_dict, parse_cause_list, CAUSE_LIST_CONTAINER
+from .pdf_parser import parse_cause_list_pdf
 
 class eCourtsScraper:
     """Main scraper class for eCourts India Services"""
 
-    def __init__(self, headless: bool = config.HEADLESS):
+    def __init__(self, headless: bool = config.HEADLESS, pool_size: int = config.PAGE_POOL_SIZE,
+                 use_cache: bool = config.CASE_CACHE_ENABLED, cache: Optional[CaseCache] = None,
+                 scheduler: Optional[RequestScheduler] = None, resource_profile: str = config.RESOURCE_PROFILE,
+                 coalesce: bool = config.COALESCE_LOOKUPS, browser_server: bool = config.BROWSER_SERVER_ENABLED):
         self.logger = setup_logger(__name__)
+        self.scheduler = scheduler or default_scheduler()
+        self.flights = SingleFlight() if coalesce else None
         self.captcha_solver = CaptchaSolver()
+        self.cause_list_index = CauseListIndex() if config.CAUSE_LIST_INDEX_ENABLED else None
+        self.cache = (cache or CaseCache()) if use_cache else None
+        self.court_hierarchy = CourtHierarchy()
         self.headless = headless
-        self.playwright = None
-        self.browser = None
-        self.context = None
+        self.pool_size = pool_size
+        self.browser_server = browser_server
+        self.pool = None
         self.page = None
+        self._captcha_watchers = {}
+        self._progress = {}
+        self.blocked_urls = blocked_patterns(resource_profile)
+        self.blocked_requests = BlockedRequests()
 
         self._initialize_browser()
 
     def _initialize_browser(self):
-        """Initialize Playwright browser"""
+        """Initialize Playwright browser and page pool"""
         try:
             self.logger.info("Initializing browser...")
-            self.playwright = sync_playwright().start()
-            self.browser = self.playwright.chromium.launch(
-                headless=self.headless,
-                args=['--disable-blink-features=AutomationControlled']
-            )
-            self.context = self.browser.new_context(
-                viewport={'width': 1920, 'height': 1080},
-                user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-            )
-            self.page = self.context.new_page()
-            self.page.set_default_timeout(config.BROWSER_TIMEOUT)
+            endpoint = find_server() if self.browser_server else None
+            if endpoint:
+                try:
+                    self.pool = PagePool(size=self.pool_size, on_page=self._prepare_page, endpoint=endpoint)
+                    self.logger.info(f"Attached to browser server at {endpoint}")
+                except Exception as e:
+                    self.logger.warning(f"Could not attach to browser server at {endpoint}, launching Chromium: {e}")
+            if self.pool is None:
+                self.pool = PagePool(size=self.pool_size, headless=self.headless, on_page=self._prepare_page)
+            # Only a single-page pool exposes its page to the calling thread
+            self.page = self.pool.page
             self.logger.info("Browser initialized successfully")
         except Exception as e:
             self.logger.error(f"Error initializing browser: {e}")
@@ -49,14 +71,10 @@ class eCourtsScraper:
     def close(self):
         """Close browser and cleanup"""
         try:
-            if self.page:
-                self.page.close()
-            if self.context:
-                self.context.close()
-            if self.browser:
-                self.browser.close()
-            if self.playwright:
-                self.playwright.stop()
+            if self.pool:
+                self.pool.close()
+            self.captcha_solver.close()
+            self._log_blocked_requests()
             self.logger.info("Browser closed successfully")
         except Exception as e:
             self.logger.error(f"Error closing browser: {e}")
@@ -67,93 +85,204 @@ class eCourtsScraper:
     def __exit__(self, exc_type, exc_val, exc_tb):
         self.close()
 
-    def _solve_captcha_with_retry(self, max_retries: int = config.MAX_CAPTCHA_RETRIES) -> bool:
-        """Solve CAPTCHA with retry mechanism"""
+    def _prepare_page(self, page):
+        """Set up a new pool page: CAPTCHA capture and the resource profile"""
+        self._watch_captcha(page)
+        if self.blocked_urls:
+            # A DevTools blocklist, unlike page.route, keeps the HTTP cache and adds no round trip per request
+            session = page.context.new_cdp_session(page)
+            session.send("Network.enable")
+            session.send("Network.setBlockedURLs", {"urls": list(self.blocked_urls)})
+            self.blocked_requests.watch(page)
+
+    def _log_blocked_requests(self):
+        summary = self.blocked_requests.summary()
+        if summary['blocked']:
+            by_type = ', '.join(f"{kind} {count}" for kind, count in sorted(summary['by_type'].items()))
+            self.logger.info(f"Resource profile blocked {summary['blocked']} requests ({by_type})")
+
+    def _watch_captcha(self, page):
+        """Start recording CAPTCHA image responses on a new page"""
+        self._captcha_watchers[page] = CaptchaWatcher(page)
+        page.on("close", lambda closed: self._captcha_watchers.pop(closed, None))
+
+    def _captcha_bytes(self, page, captcha_img) -> bytes:
+        """Original CAPTCHA image bytes, falling back to a screenshot if no response was seen"""
+        watcher = self._captcha_watchers.get(page)
+        response = watcher.take() if watcher else None
+        if response:
+            try:
+                return response.body()
+            except Exception as e:
+                self.logger.debug(f"CAPTCHA response body unavailable: {e}")
+        return captcha_img.screenshot()
+
+    def _goto(self, page, url: str):
+        """Navigate when the request scheduler allows, reporting throttling or server errors"""
+        with self.scheduler.request(url) as slot:
+            response = page.goto(url)
+            slot.status(response.status if response else None)
+        return response
+
+    def _refresh_captcha(self, page, refresh_btn):
+        """Click refresh and wait for the new image to arrive"""
+        watcher = self._captcha_watchers.get(page)
+        matches = watcher.matches if watcher else (lambda response: config.CAPTCHA_RESPONSE_PATTERN in response.url)
+        with self.scheduler.request(page.url):
+            with page.expect_response(matches, timeout=config.CAPTCHA_REFRESH_TIMEOUT):
+                refresh_btn.click()
+
+    def _solve_captcha_with_retry(self, page, max_retries: int = config.MAX_CAPTCHA_RETRIES) -> Optional[Tuple[bytes, str]]:
+        """Solve CAPTCHA with retry mechanism, returning the image bytes and the text entered"""
         for attempt in range(max_retries):
             try:
                 self.logger.info(f"CAPTCHA solving attempt {attempt + 1}/{max_retries}")
 
                 # Wait for CAPTCHA image to load
-                captcha_img = self.page.wait_for_selector("img[id*='captcha' i], img[src*='captcha' i]", timeout=5000)
+                captcha_img = page.wait_for_selector("img[id*='captcha' i], img[src*='captcha' i]", timeout=5000)
 
                 if not captcha_img:
                     self.logger.warning("CAPTCHA image not found")
                     continue
 
-                # Get CAPTCHA image
-                captcha_bytes = captcha_img.screenshot()
+                # Get CAPTCHA image as served, without re-rendering it
+                captcha_bytes = self._captcha_bytes(page, captcha_img)
 
                 # Solve CAPTCHA
-                captcha_text = self.captcha_solver.solve_captcha(captcha_bytes)
+                result = self.captcha_solver.solve(captcha_bytes)
+                captcha_text = result.text
 
-                if not captcha_text:
-                    # Try numeric solver
-                    captcha_text = self.captcha_solver.solve_numeric_captcha(captcha_bytes)
+                if captcha_text and result.confidence < config.CAPTCHA_MIN_CONFIDENCE:
+                    # A weak read is likely wrong; a fresh CAPTCHA is cheaper than a rejected submit
+                    self.logger.info(f"CAPTCHA read {captcha_text} too uncertain ({result.confidence:.2f}), refreshing")
+                    captcha_text = None
 
                 if captcha_text:
                     # Find and fill CAPTCHA input
-                    captcha_input = self.page.query_selector("input[placeholder='Enter Captcha']")
+                    captcha_input = page.query_selector("input[placeholder='Enter Captcha']")
                     if captcha_input:
                         captcha_input.fill(captcha_text)
                         self.logger.info(f"CAPTCHA filled: {captcha_text}")
-                        return True
+                        return captcha_bytes, captcha_text
 
                 # Refresh CAPTCHA if available
-                refresh_btn = self.page.query_selector("a[onclick*='captcha' i], button[onclick*='captcha' i]")
+                refresh_btn = page.query_selector("a[onclick*='captcha' i], button[onclick*='captcha' i]")
                 if refresh_btn:
-                    refresh_btn.click()
-                    time.sleep(1)
+                    try:
+                        self._refresh_captcha(page, refresh_btn)
+                    except Exception as e:
+                        # The scheduled request has already counted this failure and backed off
+                        self.logger.error(f"Error refreshing CAPTCHA on attempt {attempt + 1}: {e}")
 
             except Exception as e:
                 self.logger.error(f"Error in CAPTCHA solving attempt {attempt + 1}: {e}")
-                time.sleep(1)
+                # Back off before the next attempt touches the portal again
+                self.scheduler.record(page.url, ok=False)
 
         self.logger.error("Failed to solve CAPTCHA after all retries")
-        return False
+        return None
+
+    def _cached(self, cnr: str, refresh: bool = False) -> Optional[Dict]:
+        """Cached result for a CNR, unless the cache is off or a refresh was asked for"""
+        if self.cache and not refresh:
+            return self.cache.get(cnr)
+        return None
+
+    def _run_on_page(self, func: Callable, *args, progress: Optional[Callable[[str], None]] = None):
+        """Run func(page, *args) on the next free page, reporting the stages it reaches to progress"""
+        if progress is None:
+            return self.pool.run(func, *args)
+
+        def run(page, *args):
+            self._progress[page] = progress
+            try:
+                return func(page, *args)
+            finally:
+                self._progress.pop(page, None)
+
+        return self.pool.run(run, *args)
+
+    def _run_coalesced(self, key: Tuple, func: Callable, *args, progress: Optional[Callable[[str], None]] = None):
+        """_run_on_page, sharing one scrape between identical calls in flight at the same time"""
+        if self.flights is None:
+            return self._run_on_page(func, *args, progress=progress)
+        return self.flights.do(key, lambda report: self._run_on_page(func, *args, progress=report), progress)
+
+    def _stage(self, page, stage: str):
+        """Report a stage of the job running on a page: navigating, solving_captcha, submitting, parsing or saving"""
+        progress = self._progress.get(page)
+        if progress:
+            try:
+                progress(stage)
+            except Exception as e:
+                self.logger.error(f"Error reporting progress: {e}")
+
+    def search_by_cnr(self, cnr: str, refresh: bool = False,
+                      progress: Optional[Callable[[str], None]] = None) -> Optional[Dict]:
+        """Search case by CNR number on the next free page, reusing a cached result unless refresh is set"""
+        return self._cached(cnr, refresh) or self._run_coalesced(cnr_key(cnr), self._search_by_cnr, cnr,
+                                                                 progress=progress)
+
+    def search_many(self, cnrs: Iterable[str], refresh: bool = False) -> Iterator[Tuple[str, Optional[Dict]]]:
+        """Search many CNRs concurrently, yielding (cnr, result) as each finishes"""
+        return self.pool.imap(lambda page, cnr: self._cached(cnr, refresh) or self._search_by_cnr(page, cnr), cnrs)
 
-    def search_by_cnr(self, cnr: str) -> Optional[Dict]:
-        """Search case by CNR number"""
+    def _search_by_cnr(self, page, cnr: str) -> Optional[Dict]:
+        """Search case by CNR number using the given page"""
         try:
             self.logger.info(f"Searching case with CNR: {cnr}")
 
             # Navigate to CNR search page
-            self.page.goto(config.ECOURTS_CNR_SEARCH_URL)
+            self._stage(page, 'navigating')
+            self._goto(page, config.ECOURTS_CNR_SEARCH_URL)
             
             # Click on the CNR Number button in the search menu
             try:
-                self.page.click("text=CNR Number", timeout=config.WAIT_TIMEOUT)
+                page.click("text=CNR Number", timeout=config.WAIT_TIMEOUT)
             except PlaywrightTimeout:
                 self.logger.error("'CNR Number' button not found. Taking a screenshot.")
-                self.page.screenshot(path="cnr_button_not_found.png")
+                page.screenshot(path="cnr_button_not_found.png")
                 return None
 
             # Wait for the page to load and check for the CNR input field
             try:
-                cnr_input = self.page.wait_for_selector("#cino", timeout=config.WAIT_TIMEOUT)
+                cnr_input = page.wait_for_selector("#cino", timeout=config.WAIT_TIMEOUT)
                 cnr_input.fill(cnr)
             except PlaywrightTimeout:
                 self.logger.error("CNR input field not found. Taking a screenshot.")
-                self.page.screenshot(path="cnr_input_not_found.png")
+                page.screenshot(path="cnr_input_not_found.png")
                 return None
 
             # Solve CAPTCHA
-            if not self._solve_captcha_with_retry():
+            self._stage(page, 'solving_captcha')
+            solved = self._solve_captcha_with_retry(page)
+            if not solved:
                 return None
 
             # Click search
-            search_btn = self.page.query_selector("button:has-text('Search')")
+            search_btn = page.query_selector("button:has-text('Search')")
             if search_btn:
-                search_btn.click()
-                self.page.wait_for_load_state('networkidle')
+                self._stage(page, 'submitting')
+                with self.scheduler.request(page.url):
+                    search_btn.click()
+                    page.wait_for_load_state('networkidle')
             else:
                 self.logger.error("Search button not found.")
-                self.page.screenshot(path="search_button_not_found.png")
+                page.screenshot(path="search_button_not_found.png")
                 return None
 
             # Extract case information
-            case_info = self._extract_case_info(cnr)
+            self._stage(page, 'parsing')
+            case_info = self._extract_case_info(page, cnr)
 
             if case_info:
+                self._stage(page, 'saving')
+                if case_info.get('case_type') or case_info.get('case_number'):
+                    # Case details only render once the portal accepts the CAPTCHA
+                    self.captcha_solver.record_accepted(*solved)
+                    if self.cache:
+                        self.cache.put(cnr, case_info)
+
                 # Save to JSON
                 filename = f"case_{sanitize_filename(cnr)}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
                 save_json(case_info, filename)
@@ -163,226 +292,382 @@ class eCourtsScraper:
 
         except Exception as e:
             self.logger.error(f"Error searching by CNR: {e}")
-            self.page.screenshot(path="error_searching_by_cnr.png")
+            page.screenshot(path="error_searching_by_cnr.png")
             return None
 
-    def _extract_case_info(self, cnr: str) -> Optional[Dict]:
+    def _extract_case_info(self, page, cnr: str) -> Optional[Dict]:
         """Extract case information from the page"""
         try:
-            html = self.page.content()
-            soup = BeautifulSoup(html, 'lxml')
-            case_info = CaseInfo(cnr=cnr)
-
-            # Case Details Table
-            details_table = soup.find('table', class_='case_details_table')
-            if details_table:
-                rows = details_table.find_all('tr')
-                for row in rows:
-                    cells = row.find_all('td')
-                    if len(cells) > 1:
-                        label = cells[0].get_text(strip=True)
-                        if 'Case Type' in label:
-                            case_info.case_type = cells[1].get_text(strip=True)
-                        elif 'Filing Number' in label:
-                            # Filing number is in the same row as filing date
-                            case_info.filing_date = cells[3].get_text(strip=True)
-                        elif 'Registration Number' in label:
-                            case_info.case_number = cells[1].get_text(strip=True)
-                            # Registration date is in the same row
-                            case_info.registration_date = cells[3].get_text(strip=True)
-
-            # Case Status Table
-            status_table = soup.find('table', class_='case_status_table')
-            if status_table:
-                rows = status_table.find_all('tr')
-                for row in rows:
-                    cells = row.find_all('td')
-                    if len(cells) > 1:
-                        label = cells[0].get_text(strip=True)
-                        value = cells[1].get_text(strip=True)
-                        if 'Next Hearing Date' in label:
-                            case_info.next_hearing = value
-                        elif 'Case Stage' in label:
-                            case_info.status = value
-                        elif 'Court Number and Judge' in label:
-                            case_info.court_name = value
-
-            # Petitioner and Advocate Table
-            petitioner_table = soup.find('table', class_='Petitioner_Advocate_table')
-            if petitioner_table:
-                case_info.petitioner = petitioner_table.get_text(strip=True)
-
-            # Respondent and Advocate Table
-            respondent_table = soup.find('table', class_='Respondent_Advocate_table')
-            if respondent_table:
-                case_info.respondent = respondent_table.get_text(strip=True)
-
-            return case_info.to_dict()
+            html = page.content()
+            return parse_case_info_dict(html, cnr)
 
         except Exception as e:
             self.logger.error(f"Error extracting case info: {e}")
             return None
 
-    def check_case_listed(self, cnr: str, date: str) -> Optional[Dict]:
+    def check_case_listed(self, cnr: str, date: str, refresh: bool = False,
+                          progress: Optional[Callable[[str], None]] = None) -> Optional[Dict]:
         """Check if case is listed on specific date"""
+        result = self.check_case_listed_on_dates(cnr, [date], refresh=refresh, progress=progress)
+        if not result:
+            return None
+        return {
+            'cnr': cnr,
+            'date_checked': date,
+            'is_listed': result['dates'][0]['is_listed'],
+            'case_info': result['case_info']
+        }
+
+    def check_case_listed_on_dates(self, cnr: str, dates: Iterable[str], refresh: bool = False,
+                                   progress: Optional[Callable[[str], None]] = None) -> Optional[Dict]:
+        """Check whether a case is listed on each of several dates from one case fetch"""
         try:
-            self.logger.info(f"Checking if case {cnr} is listed on {date}")
+            days = normalize_dates(dates)
+            self.logger.info(f"Checking if case {cnr} is listed on {len(days)} dates")
 
-            # First get case info
-            case_info = self.search_by_cnr(cnr)
+            case_info = self.search_by_cnr(cnr, refresh=refresh, progress=progress)
 
             if not case_info:
                 return None
 
-            # Check if next hearing matches the date
-            next_hearing = case_info.get('next_hearing', '')
-
-            result = {
+            verdicts = listing_verdicts(case_info, days)
+            return {
                 'cnr': cnr,
-                'date_checked': date,
-                'is_listed': date in next_hearing if next_hearing else False,
+                'next_hearing': case_info.get('next_hearing'),
+                'dates': verdicts,
+                'listed_dates': [verdict['date'] for verdict in verdicts if verdict['is_listed']],
                 'case_info': case_info
             }
 
-            return result
-
         except Exception as e:
             self.logger.error(f"Error checking case listing: {e}")
             return None
 
-    def check_case_today(self, cnr: str) -> Optional[Dict]:
+    def check_case_today(self, cnr: str, refresh: bool = False,
+                         progress: Optional[Callable[[str], None]] = None) -> Optional[Dict]:
         """Check if case is listed today"""
         today = get_today_date()
-        return self.check_case_listed(cnr, today)
+        return self.check_case_listed(cnr, today, refresh=refresh, progress=progress)
 
-    def check_case_tomorrow(self, cnr: str) -> Optional[Dict]:
+    def check_case_tomorrow(self, cnr: str, refresh: bool = False,
+                            progress: Optional[Callable[[str], None]] = None) -> Optional[Dict]:
         """Check if case is listed tomorrow"""
         tomorrow = get_tomorrow_date()
-        return self.check_case_listed(cnr, tomorrow)
+        return self.check_case_listed(cnr, tomorrow, refresh=refresh, progress=progress)
 
     def download_cause_list(self, state: str, district: str, court_complex: str, 
                            court_name: Optional[str] = None, date: Optional[str] = None, 
-                           list_type: str = "Civil") -> Optional[str]:
-        """Download cause list for specified parameters"""
+                           list_type: str = "Civil", progress: Optional[Callable[[str], None]] = None) -> Optional[str]:
+        """Download cause list for specified parameters on the next free page"""
+        key = cause_list_key(state, district, court_complex, court_name, date, list_type)
+        return self._run_coalesced(key, self._download_cause_list, state, district, court_complex,
+                                   court_name, date, list_type, progress=progress)
+
+    def download_all_cause_lists(self, state: str, district: str, court_complex: str, date: Optional[str] = None,
+                                 list_types: Sequence[str] = ("Civil", "Criminal"), refresh: bool = False) -> Dict:
+        """Download the cause lists of every court in a complex in parallel across the page pool.
+
+        The courts are read from the court dropdown once (or from the court hierarchy
+        cache), then each court and list type is downloaded on the next free page.
+        Returns a manifest of files and failures, which is also saved as JSON.
+        """
+        date = date or get_today_date()
+        started = datetime.now()
+        courts = self.court_options(state, district, court_complex, refresh=refresh) or []
+        jobs = [(court, list_type) for court in courts for list_type in list_types]
+        self.logger.info(f"Downloading {len(jobs)} cause lists for {len(courts)} courts in {court_complex} on {date}")
+
+        def download(page, job):
+            return self._download_court_cause_list(page, state, district, court_complex, date, *job)
+
+        results = [result for _, result in self.pool.imap(download, jobs)]
+        # Pages finish out of order; list results in court and list type order
+        order = {(court['code'], list_type): index for index, (court, list_type) in enumerate(jobs)}
+        results.sort(key=lambda result: order[(result['court_code'], result['list_type'])])
+
+        manifest = cause_list_manifest(state, district, court_complex, date, list_types, started, results)
+        manifest['manifest'] = str(save_json(manifest, cause_list_manifest_filename(state, district, court_complex, date)))
+        self.logger.info(f"Downloaded {manifest['downloaded']} cause lists, {manifest['failed']} failed; "
+                         f"manifest saved to {manifest['manifest']}")
+        return manifest
+
+    def _download_court_cause_list(self, page, state: str, district: str, court_complex: str, date: str,
+                                   court: Dict, list_type: str) -> Dict:
+        """Download one court's list for download_all_cause_lists; never raises, so one court cannot stop the rest"""
+        result = {'court': court['name'], 'court_code': court['code'], 'list_type': list_type,
+                  'status': 'failed', 'file': None, 'error': None}
+        try:
+            result['file'] = self._download_cause_list(page, state, district, court_complex, court['name'],
+                                                       date, list_type)
+        except Exception as e:
+            result['error'] = str(e)
+        if result['file']:
+            result['status'] = 'downloaded'
+        elif not result['error']:
+            result['error'] = "No cause list downloaded"
+        return result
+
+    def _download_cause_list(self, page, state: str, district: str, court_complex: str,
+                             court_name: Optional[str] = None, date: Optional[str] = None,
+                             list_type: str = "Civil") -> Optional[str]:
+        """Download cause list using the given page"""
         try:
             if not date:
                 date = get_today_date()
 
             self.logger.info(f"Downloading cause list for {state}/{district}/{court_complex} on {date}")
 
-            # Navigate to cause list page
-            self.page.goto(config.ECOURTS_CAUSELIST_URL)
-            self.page.click("text=Cause List") # Click the cause list button again
-
-            # Select state
-            state_value = self.page.select_option("select[name='sess_state_code']", label=state)[0]
-            self.page.evaluate(f"fillDistrict({state_value})")
-            self.page.wait_for_load_state('networkidle')
-
-            # Select district
-            district_value = self.page.select_option("select[name='sees_dist_code']", label=district)[0]
-            self.page.evaluate(f"fillCourtComplex({district_value})")
-            self.page.wait_for_load_state('networkidle')
-
-            # Select court complex
-            self.page.select_option("select[id='court_complex_code']", label=court_complex)
-            self.page.dispatch_event("select[id='court_complex_code']", 'change')
-            try:
-                self.page.wait_for_function("() => document.getElementById('CL_court_no').options.length > 1", timeout=config.WAIT_TIMEOUT)
-            except PlaywrightTimeout:
-                self.logger.error("Court name dropdown not populated. Taking a screenshot.")
-                self.page.screenshot(path="court_name_dropdown_not_populated.png")
+            self._stage(page, 'navigating')
+            self._open_cause_list_form(page)
+            names = (state, district, court_complex, court_name)
+            codes = self.court_hierarchy.resolve(*names)
+            if codes:
+                # Cached codes skip the round trips that fill each dropdown
+                page.evaluate(SET_VALUES_SCRIPT, form_values(codes))
+            elif not self._walk_court_hierarchy(page, names):
+                page.screenshot(path="court_name_dropdown_not_populated.png")
                 return None
 
-            # Select court name if provided
-            if court_name:
-                self.page.select_option("select[name='CL_court_no']", label=court_name)
-            else:
-                # Select first available court
-                self.page.query_selector("#CL_court_no option:nth-child(2)").click()
+            # The complex, and a named court, get their own files, so lists of one district do not overwrite each other
+            court_parts = (court_complex, court_name)
 
             # Fill date
-            self.page.fill("#causelist_date", date)
+            page.fill("#causelist_date", date)
 
             # Solve CAPTCHA
-            if not self._solve_captcha_with_retry():
+            self._stage(page, 'solving_captcha')
+            solved = self._solve_captcha_with_retry(page)
+            if not solved:
                 self.logger.error("Failed to solve CAPTCHA")
                 return None
 
             # Click appropriate button (Civil/Criminal)
             if list_type.lower() == "civil":
-                submit_btn = self.page.query_selector("button:has-text('Civil')")
+                submit_btn = page.query_selector("button:has-text('Civil')")
             else:
-                submit_btn = self.page.query_selector("button:has-text('Criminal')")
+                submit_btn = page.query_selector("button:has-text('Criminal')")
 
-            if submit_btn:
-                # Setup download handler
-                with self.page.expect_download() as download_info:
-                    submit_btn.click()
-                    time.sleep(3)
+            if not submit_btn:
+                return None
 
-                # Check if download occurred
-                try:
-                    download = download_info.value
-                    filename = f"causelist_{sanitize_filename(state)}_{sanitize_filename(district)}_{date.replace('-', '')}_{list_type}.pdf"
-                    filepath = config.PDF_OUTPUT_DIR / filename
-                    download.save_as(filepath)
-                    self.logger.info(f"Cause list downloaded: {filepath}")
+            # Branch on whichever answer comes first instead of waiting out the download timeout
+            self._stage(page, 'submitting')
+            outcome = self._submit_cause_list(page, submit_btn)
+            if outcome.kind == 'download':
+                self._stage(page, 'saving')
+                filename = cause_list_filename(state, district, date, list_type, 'pdf', *court_parts)
+                filepath = ensure_dir(config.PDF_OUTPUT_DIR) / filename
+                outcome.download.save_as(filepath)
+                self.logger.info(f"Cause list downloaded: {filepath}")
+                self._save_pdf_cause_list(filepath, state, district, court_complex, date, list_type, court_name)
+                self.captcha_solver.record_accepted(*solved)
+                return str(filepath)
+
+            if outcome.kind == 'table':
+                self._stage(page, 'parsing')
+                cause_list_data = self._extract_cause_list_from_page(page, state, district, court_complex, date, list_type)
+
+                if cause_list_data:
+                    self._stage(page, 'saving')
+                    cause_list_data['court_name'] = court_name or ""
+                    filename = cause_list_filename(state, district, date, list_type, 'json', *court_parts)
+                    filepath = save_json(cause_list_data, filename)
+                    self._index_cause_list(filepath)
+                    if cause_list_data['total_cases']:
+                        self.captcha_solver.record_accepted(*solved)
+                    self.logger.info(f"Cause list data saved: {filepath}")
                     return str(filepath)
-                except:
-                    # If no download, try to extract from page
-                    self.logger.info("No PDF download, attempting to extract from page")
-                    cause_list_data = self._extract_cause_list_from_page(state, district, court_complex, date, list_type)
+            elif outcome.kind == 'timeout':
+                self.logger.error("No answer to the cause list submit")
+            else:
+                self.logger.warning(f"No cause list for {court_name or court_complex} on {date}: {outcome.message}")
 
-                    if cause_list_data:
-                        filename = f"causelist_{sanitize_filename(state)}_{sanitize_filename(district)}_{date.replace('-', '')}_{list_type}.json"
-                        filepath = save_json(cause_list_data, filename)
-                        self.logger.info(f"Cause list data saved: {filepath}")
-                        return str(filepath)
+            if codes and outcome.kind in ('error', 'message', 'timeout'):
+                # The cached codes may have gone stale on the portal; forget them and retry once
+                # through the dropdowns (the retry walks the form, so it cannot come back here)
+                self.logger.warning(f"Retrying {court_complex} with court codes read from the form")
+                self.court_hierarchy.invalidate(state, district, court_complex)
+                return self._download_cause_list(page, state, district, court_complex, court_name, date, list_type)
 
             return None
 
         except Exception as e:
             self.logger.error(f"Error downloading cause list: {e}")
-            self.page.screenshot(path="error_downloading_cause_list.png")
+            page.screenshot(path="error_downloading_cause_list.png")
             return None
 
-    def _extract_cause_list_from_page(self, state: str, district: str, court_complex: str, 
+    def _submit_cause_list(self, page, submit_btn) -> CauseListOutcome:
+        """Click a cause list submit button and wait for the first answer: a download, the result table,
+        a message or an error banner"""
+        page.evaluate(CLEAR_SCRIPT, script_args())
+        watcher = DownloadWatcher(page)
+        try:
+            with self.scheduler.request(page.url, config.CAUSE_LIST_SLOW_THRESHOLD) as slot:
+                submit_btn.click()
+                deadline = time.monotonic() + config.CAUSE_LIST_RESULT_TIMEOUT / 1000
+                # Download events are dispatched while the page is watched, so check for one between watches
+                while watcher.download is None:
+                    remaining = (deadline - time.monotonic()) * 1000
+                    if remaining <= 0:
+                        slot.fail()
+                        return CauseListOutcome('timeout')
+                    try:
+                        answer = page.wait_for_function(OUTCOME_SCRIPT, arg=script_args(),
+                                                        timeout=min(remaining, config.CAUSE_LIST_POLL_INTERVAL))
+                        return CauseListOutcome(**answer.json_value())
+                    except PlaywrightTimeout:
+                        continue
+                return CauseListOutcome('download', download=watcher.download)
+        finally:
+            watcher.close()
+
+    def _open_cause_list_form(self, page):
+        """Load the cause list form"""
+        self._goto(page, config.ECOURTS_CAUSELIST_URL)
+        page.click("text=Cause List") # Click the cause list button again
+
+    def _read_court_options(self, page, level: str) -> List[Dict]:
+        """Options currently loaded in one dropdown of the cause list form"""
+        return clean_options(page.eval_on_selector_all(f"{SELECTORS[level]} option", OPTIONS_SCRIPT))
+
+    def _choose_court_level(self, page, level: str, code: str) -> List[Dict]:
+        """Select a code in one dropdown of the cause list form; returns the options the portal loads into the next"""
+        selector = SELECTORS[level]
+        if level == LEVELS[-1]:
+            page.select_option(selector, value=code)
+            return []
+
+        next_level = LEVELS[LEVELS.index(level) + 1]
+        # Drop the previous options so the wait below ends only once the new ones arrive
+        page.eval_on_selector(SELECTORS[next_level], "select => { select.length = 1; }")
+        page.select_option(selector, value=code)
+        # Each choice makes the portal fetch the next level's options
+        with self.scheduler.request(page.url) as slot:
+            if level == 'state':
+                page.evaluate("code => fillDistrict(code)", code)
+            elif level == 'district':
+                page.evaluate("code => fillCourtComplex(code)", code)
+            else:
+                page.dispatch_event(selector, 'change')
+            try:
+                page.wait_for_function("selector => document.querySelector(selector).options.length > 1",
+                                       arg=SELECTORS[next_level], timeout=config.WAIT_TIMEOUT)
+            except PlaywrightTimeout:
+                slot.fail()
+                self.logger.warning(f"No {next_level.replace('_', ' ')} options loaded for {level.replace('_', ' ')} {code}")
+                return []
+        return self._read_court_options(page, next_level)
+
+    def _walk_court_hierarchy(self, page, names: Sequence[Optional[str]]) -> Optional[Tuple[Dict[str, str], List[Dict]]]:
+        """Choose each named level of the cause list form in turn, recording the options seen;
+        returns the chosen codes and the options loaded below the last one"""
+        options = self._read_court_options(page, LEVELS[0])
+        self.court_hierarchy.set_options([], options, save=False)
+        codes, path = {}, []
+        try:
+            for level, name in zip(LEVELS, names):
+                option = find_option(options, name)
+                if option is None:
+                    self.logger.error(f"No {level.replace('_', ' ')} named {name!r} in the cause list form")
+                    return None
+                codes[level] = option['code']
+                path.append(option['name'])
+                options = self._choose_court_level(page, level, option['code'])
+                if level != LEVELS[-1]:
+                    self.court_hierarchy.set_options(path, options, save=False)
+            return codes, options
+        finally:
+            self.court_hierarchy.save()
+
+    def court_options(self, state: Optional[str] = None, district: Optional[str] = None,
+                      court_complex: Optional[str] = None, refresh: bool = False) -> Optional[List[Dict]]:
+        """Codes and names of the states, or of the districts, court complexes or courts below
+        the given names; from the court hierarchy cache unless missing, stale or refreshed"""
+        path = [name for name in (state, district, court_complex) if name]
+        if not refresh:
+            cached = self.court_hierarchy.options(*path)
+            if cached is not None:
+                return cached
+        return self.pool.run(self._fetch_court_options, path)
+
+    def _fetch_court_options(self, page, path: List[str]) -> Optional[List[Dict]]:
+        try:
+            self._open_cause_list_form(page)
+            walked = self._walk_court_hierarchy(page, path)
+            return walked[1] if walked else None
+        except Exception as e:
+            self.logger.error(f"Error fetching court options: {e}")
+            return None
+
+    def refresh_court_hierarchy(self, states: Optional[Iterable[str]] = None) -> Dict[str, int]:
+        """Fetch every district, court complex and court of the given states (all by default)
+        into the court hierarchy cache; returns the number of cached entries per level"""
+        return self.pool.run(self._refresh_court_hierarchy, list(states or []))
+
+    def _refresh_court_hierarchy(self, page, states: List[str]) -> Dict[str, int]:
+        self._open_cause_list_form(page)
+        options = self._read_court_options(page, 'state')
+        self.court_hierarchy.set_options([], options)
+        wanted = options
+        if states:
+            wanted = []
+            for name in states:
+                state = find_option(options, name)
+                if state:
+                    wanted.append(state)
+                else:
+                    self.logger.warning(f"No state named {name!r} in the cause list form")
+
+        for state in wanted:
+            self.logger.info(f"Fetching courts of {state['name']}")
+            districts = self._choose_court_level(page, 'state', state['code'])
+            self.court_hierarchy.set_options([state['name']], districts, save=False)
+            for district in districts:
+                path = [state['name'], district['name']]
+                complexes = self._choose_court_level(page, 'district', district['code'])
+                self.court_hierarchy.set_options(path, complexes, save=False)
+                for court_complex in complexes:
+                    courts = self._choose_court_level(page, 'court_complex', court_complex['code'])
+                    self.court_hierarchy.set_options(path + [court_complex['name']], courts, save=False)
+            # Save per state so an interrupted refresh keeps what it fetched
+            self.court_hierarchy.save()
+        return self.court_hierarchy.counts()
+
+    def _save_pdf_cause_list(self, pdf_path, state: str, district: str, court_complex: str,
+                             date: str, list_type: str, court_name: Optional[str] = None):
+        """Save the entries of a downloaded cause list PDF as JSON, like the HTML path"""
+        if not config.PARSE_CAUSE_LIST_PDFS:
+            return
+        try:
+            cause_list_data = parse_cause_list_pdf(pdf_path, state, district, court_complex, date, list_type,
+                                                   court_name or "")
+            filepath = save_json(cause_list_data, cause_list_filename(state, district, date, list_type, 'json',
+                                                                      court_complex, court_name))
+            self.logger.info(f"Parsed {cause_list_data['total_cases']} entries from {pdf_path} into {filepath}")
+            self._index_cause_list(filepath)
+        except Exception as e:
+            self.logger.error(f"Error parsing cause list PDF: {e}")
+
+    def _index_cause_list(self, filepath):
+        """Add a saved cause list to the search index"""
+        if not self.cause_list_index:
+            return
+        try:
+            entries = self.cause_list_index.index_file(filepath)
+            self.logger.info(f"Indexed {entries} cause list entries from {filepath}")
+        except Exception as e:
+            self.logger.error(f"Error indexing cause list: {e}")
+
+    def _extract_cause_list_from_page(self, page, state: str, district: str, court_complex: str, 
                                       date: str, list_type: str) -> Optional[Dict]:
         """Extract cause list data from HTML page"""
         try:
-            # Wait for table to load
-            table = self.page.wait_for_selector("table", timeout=10000)
-
-            if not table:
-                return None
+            # Wait for the result table, not just any table on the page
+            page.wait_for_selector(f"{CAUSE_LIST_CONTAINER} table", timeout=10000)
 
-            entries = []
-            rows = self.page.query_selector_all("table tr")
-
-            for row in rows[1:]:  # Skip header
-                cells = row.query_selector_all("td")
-                if len(cells) >= 3:
-                    entry = CauseListEntry(
-                        serial_number=cells[0].inner_text().strip(),
-                        case_number=cells[1].inner_text().strip(),
-                        petitioner=cells[2].inner_text().strip() if len(cells) > 2 else None,
-                        respondent=cells[3].inner_text().strip() if len(cells) > 3 else None,
-                        advocate=cells[4].inner_text().strip() if len(cells) > 4 else None
-                    )
-                    entries.append(entry)
-
-            cause_list = CauseList(
-                date=date,
-                state=state,
-                district=district,
-                court_complex=court_complex,
-                court_name="",
-                list_type=list_type,
-                entries=entries
-            )
-
-            return cause_list.to_dict()
+            # Fetch the whole result in one round trip and parse it here
+            html = page.inner_html(CAUSE_LIST_CONTAINER)
+            return parse_cause_list(html, state, district, court_complex, date, list_type).to_dict()
 
         except Exception as e:
             self.logger.error(f"Error extracting cause list from page: {e}")
@@ -0,0 +1,128 @@
+"""
+Single-flight coalescing: identical lookups already in flight share one scrape
+"""
+import asyncio
+import re
+import threading
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Tuple
+from .utils import setup_logger, parse_date, get_today_date
+
+def _name(value: Optional[str]) -> str:
+    return re.sub(r'\s+', ' ', value or '').strip().casefold()
+
+def cnr_key(cnr: str) -> Tuple:
+    """Flight key for a CNR search; CNRs differ only in case and stray spaces"""
+    return ('cnr', re.sub(r'\s+', '', cnr or '').upper())
+
+def cause_list_key(state: str, district: str, court_complex: str, court_name: Optional[str] = None,
+                   date: Optional[str] = None, list_type: str = "Civil") -> Tuple:
+    """Flight key for a cause list download; names ignore case and spacing, a missing date means today"""
+    text = date or get_today_date()
+    day = parse_date(text)
+    return ('cause_list', _name(state), _name(district), _name(court_complex), _name(court_name),
+            day.isoformat() if day else text.strip(), _name(list_type))
+
+class _Flight:
+    """One scrape in flight and the progress callbacks of everyone waiting on it"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error: Optional[BaseException] = None
+        self.listeners: List[Callable[[str], None]] = []
+
+class SingleFlight:
+    """Coalesce identical calls made from several threads at the same time.
+
+    The first caller for a key runs the function; callers arriving with the
+    same key before it returns wait for it and get the same result, or the
+    same exception. Nothing is kept once the call returns, so later calls
+    scrape again (the case cache is what answers repeat lookups).
+    """
+
+    def __init__(self):
+        self.logger = setup_logger(__name__)
+        self._flights: Dict[Hashable, _Flight] = {}
+        self._lock = threading.Lock()
+        self._counts = {'leaders': 0, 'shared': 0}
+
+    def do(self, key: Hashable, func: Callable[[Callable[[str], None]], Any],
+           progress: Optional[Callable[[str], None]] = None) -> Any:
+        """Run func(report) once per key in flight; report passes stages on to every caller's progress"""
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+                self._counts['leaders'] += 1
+            else:
+                self._counts['shared'] += 1
+            if progress:
+                flight.listeners.append(progress)
+
+        if not leader:
+            self.logger.info(f"Joining lookup already in flight for {key}")
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        try:
+            flight.result = func(lambda stage: self._report(flight, stage))
+            return flight.result
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+
+    def _report(self, flight: _Flight, stage: str):
+        with self._lock:
+            listeners = list(flight.listeners)
+        for listener in listeners:
+            try:
+                listener(stage)
+            except Exception as e:
+                self.logger.error(f"Error reporting progress: {e}")
+
+    def stats(self) -> Dict:
+        """Calls that ran a scrape, calls that shared one, and keys in flight now"""
+        with self._lock:
+            return {**self._counts, 'in_flight': len(self._flights)}
+
+class AsyncSingleFlight:
+    """SingleFlight for coroutines on one event loop.
+
+    The scrape runs as its own task, so a caller that is cancelled stops
+    waiting without cancelling the scrape the other callers share.
+    """
+
+    def __init__(self):
+        self.logger = setup_logger(__name__)
+        self._flights: Dict[Hashable, asyncio.Task] = {}
+        self._counts = {'leaders': 0, 'shared': 0}
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[Any]]) -> Any:
+        """Await func() once per key in flight"""
+        task = self._flights.get(key)
+        if task is None:
+            task = self._flights[key] = asyncio.ensure_future(func())
+            task.add_done_callback(lambda done: self._land(key, done))
+            self._counts['leaders'] += 1
+        else:
+            self.logger.info(f"Joining lookup already in flight for {key}")
+            self._counts['shared'] += 1
+        return await asyncio.shield(task)
+
+    def _land(self, key: Hashable, task: asyncio.Task):
+        if self._flights.get(key) is task:
+            del self._flights[key]
+        if not task.cancelled():
+            # Mark the exception retrieved, in case every caller was cancelled
+            task.exception()
+
+    def stats(self) -> Dict:
+        """Calls that ran a scrape, calls that shared one, and keys in flight now"""
+        return {**self._counts, 'in_flight': len(self._flights)}
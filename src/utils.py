@@ -4,12 +4,22 @@ Utility functions for eCourts Scraper
 import json
 import logging
 from pathlib import Path
-from datetime import datetime
+from datetime import datetime, date, timedelta
+from typing import Dict, Iterable, List, Optional, Sequence, Union
+from dateutil import parser as date_parser
 import config
 
+def ensure_dir(directory: Path) -> Path:
+    """Create a directory (and its parents) if missing, right before something is written there"""
+    directory.mkdir(parents=True, exist_ok=True)
+    return directory
+
 def setup_logger(name: str) -> logging.Logger:
-    """Setup logger with file and console handlers"""
+    """Setup logger with file and console handlers; a logger set up before is returned as it is"""
     logger = logging.getLogger(name)
+    if logger.handlers:
+        # Every instance of a class sets up the same logger; more handlers would repeat each line
+        return logger
     logger.setLevel(getattr(logging, config.LOG_LEVEL))
 
     # Console handler
@@ -19,7 +29,7 @@ def setup_logger(name: str) -> logging.Logger:
     console_handler.setFormatter(console_formatter)
 
     # File handler
-    log_file = config.LOG_DIR / f"ecourts_{datetime.now().strftime('%Y%m%d')}.log"
+    log_file = ensure_dir(config.LOG_DIR) / f"ecourts_{datetime.now().strftime('%Y%m%d')}.log"
     file_handler = logging.FileHandler(log_file)
     file_handler.setLevel(logging.DEBUG)
     file_formatter = logging.Formatter(config.LOG_FORMAT)
@@ -32,14 +42,14 @@ def setup_logger(name: str) -> logging.Logger:
 
 def save_json(data: dict, filename: str, output_dir: Path = config.JSON_OUTPUT_DIR) -> Path:
     """Save data as JSON file"""
-    filepath = output_dir / filename
+    filepath = ensure_dir(output_dir) / filename
     with open(filepath, 'w', encoding='utf-8') as f:
         json.dump(data, f, indent=2, ensure_ascii=False)
     return filepath
 
 def save_pdf(pdf_content: bytes, filename: str, output_dir: Path = config.PDF_OUTPUT_DIR) -> Path:
     """Save PDF content to file"""
-    filepath = output_dir / filename
+    filepath = ensure_dir(output_dir) / filename
     with open(filepath, 'wb') as f:
         f.write(pdf_content)
     return filepath
@@ -52,13 +62,64 @@ def format_date(date_str: str, input_format: str = "%d-%m-%Y", output_format: st
     except:
         return date_str
 
+def parse_date(text: str) -> Optional[date]:
+    """Parse a portal date such as '10th November 2025' or '10-11-2025' (day first, unless ISO)"""
+    if not text or not text.strip():
+        return None
+    try:
+        return date.fromisoformat(text.strip())
+    except ValueError:
+        pass
+    try:
+        # Parsing against two different defaults shows whether the text left out the day, month or year
+        first = date_parser.parse(text, dayfirst=True, default=datetime(2000, 1, 1))
+        second = date_parser.parse(text, dayfirst=True, default=datetime(2001, 2, 2))
+    except (ValueError, OverflowError):
+        return None
+    return first.date() if first.date() == second.date() else None
+
+def parse_date_spec(spec: str, max_dates: int = config.MAX_LISTING_DATES) -> List[date]:
+    """Expand comma-separated dates and inclusive 'start..end' ranges of at most `max_dates` days"""
+    dates = []
+    for part in spec.split(','):
+        part = part.strip()
+        if not part:
+            continue
+        if '..' in part:
+            start_text, end_text = part.split('..', 1)
+            start, end = parse_date(start_text), parse_date(end_text)
+            if not start or not end or end < start:
+                raise ValueError(f"Invalid date range: {part}")
+            if (end - start).days + 1 > max_dates:
+                raise ValueError(f"Date range {part} spans {(end - start).days + 1} days; at most {max_dates} allowed")
+            dates.extend(start + timedelta(days=offset) for offset in range((end - start).days + 1))
+        else:
+            day = parse_date(part)
+            if not day:
+                raise ValueError(f"Invalid date: {part}")
+            dates.append(day)
+    return dates
+
+def normalize_dates(dates: Iterable[Union[str, date]], max_dates: int = config.MAX_LISTING_DATES) -> List[date]:
+    """Sorted, de-duplicated dates from date objects, date strings or range specs; at most `max_dates` of them"""
+    result = set()
+    for day in dates:
+        result.update([day] if isinstance(day, date) else parse_date_spec(day, max_dates))
+        if len(result) > max_dates:
+            raise ValueError(f"More than {max_dates} dates requested")
+    return sorted(result)
+
+def listing_verdicts(case_info: Dict, dates: Iterable[date]) -> List[Dict]:
+    """Whether a case is listed on each date, judged from its next hearing and known listings"""
+    hearings = {parse_date(text) for text in [case_info.get('next_hearing'), *(case_info.get('listed_on') or [])] if text}
+    return [{'date': day.strftime("%d-%m-%Y"), 'is_listed': day in hearings} for day in dates]
+
 def get_today_date(format: str = "%d-%m-%Y") -> str:
     """Get today's date in specified format"""
     return datetime.now().strftime(format)
 
 def get_tomorrow_date(format: str = "%d-%m-%Y") -> str:
     """Get tomorrow's date in specified format"""
-    from datetime import timedelta
     tomorrow = datetime.now() + timedelta(days=1)
     return tomorrow.strftime(format)
 
@@ -68,3 +129,35 @@ def sanitize_filename(filename: str) -> str:
     for char in invalid_chars:
         filename = filename.replace(char, '_')
     return filename
+
+def cause_list_filename(state: str, district: str, date: str, list_type: str, extension: str,
+                        court_complex: Optional[str] = None, court: Optional[str] = None) -> str:
+    """Build the output filename for a downloaded cause list; the court complex, and the court when
+    named, keep the lists of complexes and courts in one district apart"""
+    # Underscores separate the fields, so keep them out of the names
+    parts = [sanitize_filename(part).replace('_', '-') for part in (state, district)]
+    parts += [date.replace('-', ''), list_type]
+    parts += [sanitize_filename(part).replace('_', '-') for part in (court_complex, court) if part]
+    return f"causelist_{'_'.join(parts)}.{extension}"
+
+def cause_list_manifest(state: str, district: str, court_complex: str, date: str, list_types: Sequence[str],
+                        started: datetime, results: List[Dict]) -> Dict:
+    """Summary of a download of every court's cause lists in a complex, with one result per court and list type"""
+    return {
+        'state': state,
+        'district': district,
+        'court_complex': court_complex,
+        'date': date,
+        'list_types': list(list_types),
+        'started_at': started.isoformat(timespec='seconds'),
+        'finished_at': datetime.now().isoformat(timespec='seconds'),
+        'courts': len({result['court_code'] for result in results}),
+        'downloaded': sum(1 for result in results if result['file']),
+        'failed': sum(1 for result in results if not result['file']),
+        'results': results
+    }
+
+def cause_list_manifest_filename(state: str, district: str, court_complex: str, date: str) -> str:
+    """Output filename for a cause list manifest; kept apart from the causelist_*.json lists"""
+    return (f"manifest_{sanitize_filename(state)}_{sanitize_filename(district)}_"
+            f"{sanitize_filename(court_complex)}_{date.replace('-', '')}.json")
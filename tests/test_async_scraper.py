@@ -0,0 +1,199 @@
+"""
+Unit tests for the async scraper's CNR search and cause list download, on fake pages
+"""
+import asyncio
+import re
+import tempfile
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+from unittest import mock
+from playwright.async_api import TimeoutError as AsyncPlaywrightTimeout
+import config
+from src.async_scraper import AsyncECourtsScraper
+from src.cache import CaseCache
+from src.cause_list_outcome import CauseListOutcome
+from src.court_hierarchy import SET_VALUES_SCRIPT, form_values
+from src.scheduler import RequestScheduler
+from src.utils import setup_logger
+from tests.test_court_hierarchy import cached_hierarchy
+
+with open(config.BASE_DIR / "case_info_page.html", encoding='utf-8') as f:
+    CASE_HTML = f.read()
+
+ROWS = ''.join(f"<tr><td>{i}</td><td>O.S./{i}/2024</td><td>Petitioner {i}</td><td>Respondent {i}</td>"
+               f"<td>Adv. {i}</td></tr>" for i in range(1, 4))
+CAUSE_LIST_HTML = (f"<table><tr><th>Sr No</th><th>Case</th><th>Petitioner</th><th>Respondent</th>"
+                   f"<th>Advocate</th></tr>{ROWS}</table>")
+
+class FakeElement:
+    def __init__(self, page, selector):
+        self.page = page
+        self.selector = selector
+
+    async def fill(self, value):
+        self.page.filled[self.selector] = value
+
+    async def click(self):
+        self.page.clicks.append(self.selector)
+
+class FakePage:
+    """Async page that serves fixed HTML and records what the scraper does; `missing` selectors time out"""
+
+    def __init__(self, html: str = "", missing=()):
+        self.url = "about:blank"
+        self.html = html
+        self.missing = set(missing)
+        self.clicks = []
+        self.filled = {}
+        self.evaluated = []
+
+    async def goto(self, url):
+        self.url = url
+        return SimpleNamespace(status=200)
+
+    async def click(self, selector, timeout=None):
+        self.clicks.append(selector)
+
+    async def wait_for_selector(self, selector, timeout=None):
+        if selector in self.missing:
+            raise AsyncPlaywrightTimeout(f"Timeout waiting for {selector}")
+        return FakeElement(self, selector)
+
+    async def query_selector(self, selector):
+        return None if selector in self.missing else FakeElement(self, selector)
+
+    async def fill(self, selector, value):
+        self.filled[selector] = value
+
+    async def evaluate(self, script, arg=None):
+        self.evaluated.append((script, arg))
+
+    async def wait_for_load_state(self, state=None):
+        pass
+
+    async def content(self):
+        return self.html
+
+    async def inner_html(self, selector):
+        return self.html
+
+class FakeDownload:
+    def __init__(self):
+        self.saved_to = None
+
+    async def save_as(self, path):
+        self.saved_to = Path(path)
+
+class AsyncScraperTestCase(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.dir = Path(tmp.name)
+        self.saved = {}
+        self.scraper = AsyncECourtsScraper.__new__(AsyncECourtsScraper)
+        self.scraper.logger = setup_logger("test")
+        self.scraper.scheduler = RequestScheduler(delay=0)
+        self.scraper.captcha_solver = mock.Mock()
+        # Parse on the default thread pool rather than starting worker processes
+        self.scraper._parse_executor = None
+        self.scraper.cause_list_index = None
+        self.scraper.cache = CaseCache(self.dir / "cases.sqlite3")
+        self.scraper.flights = None
+        self.scraper.court_hierarchy = cached_hierarchy(self.dir / "courts.json")
+
+        async def solved(page):
+            return b"png", "abc123"
+
+        self.scraper._solve_captcha_with_retry = solved
+        for patcher in (mock.patch('src.async_scraper.save_json', self.save_json),
+                        mock.patch.object(config, 'CASE_PARSE_PROCESSES', 0)):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def save_json(self, data, filename):
+        self.saved[filename] = data
+        return self.dir / filename
+
+class TestSearchByCnr(AsyncScraperTestCase):
+    def test_saves_parsed_case(self):
+        page = FakePage(CASE_HTML)
+        case_info = asyncio.run(self.scraper._search_by_cnr(page, "KARC010037582023"))
+        self.assertEqual(case_info['case_number'], "778/2023")
+        self.assertEqual(page.url, config.ECOURTS_CNR_SEARCH_URL)
+        self.assertEqual(page.filled, {"#cino": "KARC010037582023"})
+        self.assertEqual(page.clicks, ["text=CNR Number", "button:has-text('Search')"])
+        self.scraper.captcha_solver.record_accepted.assert_called_once_with(b"png", "abc123")
+        [(filename, saved)] = self.saved.items()
+        self.assertTrue(re.fullmatch(r"case_KARC010037582023_\d{8}_\d{6}\.json", filename), filename)
+        self.assertEqual(saved, case_info)
+
+    def test_result_is_cached(self):
+        page = FakePage(CASE_HTML)
+        self.scraper._on_page = lambda func, *args: func(page, *args)
+        first = asyncio.run(self.scraper.search_by_cnr("KARC010037582023"))
+        page.html = ""
+        self.assertEqual(asyncio.run(self.scraper.search_by_cnr("KARC010037582023")), first)
+        self.assertEqual(len(self.saved), 1)
+        # A refresh goes back to the portal
+        self.assertIsNone(asyncio.run(self.scraper.search_by_cnr("KARC010037582023", refresh=True))['case_number'])
+
+    def test_missing_cnr_input(self):
+        page = FakePage(CASE_HTML, missing={"#cino"})
+        self.assertIsNone(asyncio.run(self.scraper._search_by_cnr(page, "KARC010037582023")))
+        self.assertEqual(self.saved, {})
+
+    def test_missing_search_button(self):
+        page = FakePage(CASE_HTML, missing={"button:has-text('Search')"})
+        self.assertIsNone(asyncio.run(self.scraper._search_by_cnr(page, "KARC010037582023")))
+        self.scraper.captcha_solver.record_accepted.assert_not_called()
+
+class TestDownloadCauseList(AsyncScraperTestCase):
+    def submit(self, outcome: CauseListOutcome):
+        async def submit(page, button):
+            page.clicks.append(button.selector)
+            return outcome
+
+        self.scraper._submit_cause_list = submit
+
+    def download(self, page, list_type="Civil"):
+        return asyncio.run(self.scraper._download_cause_list(page, "Karnataka", "Bangalore", "City Civil Court",
+                                                             "Court 1", "03-11-2025", list_type))
+
+    def test_result_table_is_saved(self):
+        self.submit(CauseListOutcome('table'))
+        page = FakePage(CAUSE_LIST_HTML)
+        filepath = self.download(page)
+
+        filename = "causelist_Karnataka_Bangalore_03112025_Civil_City Civil Court_Court 1.json"
+        self.assertEqual(filepath, str(self.dir / filename))
+        self.assertEqual(self.saved[filename]['total_cases'], 3)
+        self.assertEqual(self.saved[filename]['court_name'], "Court 1")
+        # Cached codes fill the form without walking the dropdowns
+        codes = {'state': '3', 'district': '20', 'court_complex': '1030134@2,3@N', 'court': '2^5'}
+        self.assertEqual(page.evaluated, [(SET_VALUES_SCRIPT, form_values(codes))])
+        self.assertEqual(page.filled, {"#causelist_date": "03-11-2025"})
+        self.assertEqual(page.clicks, ["text=Cause List", "button:has-text('Civil')"])
+        self.scraper.captcha_solver.record_accepted.assert_called_once_with(b"png", "abc123")
+
+    def test_pdf_download_is_saved(self):
+        download = FakeDownload()
+        self.submit(CauseListOutcome('download', download=download))
+        page = FakePage()
+        with mock.patch.object(config, 'PDF_OUTPUT_DIR', self.dir / "pdfs"), \
+                mock.patch.object(config, 'PARSE_CAUSE_LIST_PDFS', False):
+            filepath = self.download(page, list_type="Criminal")
+
+        self.assertEqual(download.saved_to,
+                         self.dir / "pdfs" / "causelist_Karnataka_Bangalore_03112025_Criminal_City Civil Court_Court 1.pdf")
+        self.assertEqual(filepath, str(download.saved_to))
+        self.assertEqual(page.clicks[-1], "button:has-text('Criminal')")
+
+    def test_missing_submit_button(self):
+        self.submit(CauseListOutcome('table'))
+        page = FakePage(CAUSE_LIST_HTML, missing={"button:has-text('Civil')"})
+        self.assertIsNone(self.download(page))
+        self.assertEqual(self.saved, {})
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,34 @@
+"""
+Unit tests for the offline benchmark suite
+"""
+import unittest
+from benchmarks.suite import build_cases, compare, measure
+
+class TestBenchmarkSuite(unittest.TestCase):
+    def test_cases_run_offline(self):
+        cases = build_cases(rows=20)
+        self.assertEqual(set(cases), {'parse_case_info', 'parse_cause_list', 'case_info_to_dict',
+                                      'cause_list_to_dict', 'captcha_denoise', 'captcha_thresholds',
+                                      'captcha_solve'})
+        for func in cases.values():
+            self.assertIsNotNone(func())
+
+    def test_measure_reports_throughput_and_memory(self):
+        result = measure(lambda: [0] * 1000, min_time=0.01)
+        self.assertGreater(result['ops_per_sec'], 0)
+        self.assertGreater(result['peak_kib'], 0)
+
+    def test_compare_flags_slowdown_and_memory_growth(self):
+        baseline = {'fast': {'ops_per_sec': 100.0, 'peak_kib': 10.0},
+                    'lean': {'ops_per_sec': 100.0, 'peak_kib': 10.0}}
+        results = {'fast': {'ops_per_sec': 70.0, 'peak_kib': 10.0},
+                   'lean': {'ops_per_sec': 95.0, 'peak_kib': 13.0},
+                   'new': {'ops_per_sec': 1.0, 'peak_kib': 1.0}}
+        regressions = compare(results, baseline, tolerance=0.2)
+        self.assertEqual(len(regressions), 2)
+        self.assertTrue(regressions[0].startswith('fast:'))
+        self.assertTrue(regressions[1].startswith('lean:'))
+        self.assertEqual(compare(results, baseline, tolerance=0.5), [])
+
+if __name__ == '__main__':
+    unittest.main()
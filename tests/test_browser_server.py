@@ -0,0 +1,147 @@
+"""
+Unit tests for finding and attaching to a warm browser server
+"""
+import json
+import os
+import tempfile
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from pathlib import Path
+from unittest import mock
+from src.browser_server import BrowserServer, find_server, read_server_state, server_endpoint
+from src.page_pool import find_free_port
+from src.scraper import eCourtsScraper
+from src.utils import setup_logger
+
+def devtools_handler(payload: dict):
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            body = json.dumps(payload).encode()
+            self.send_response(200 if self.path == '/json/version' else 404)
+            self.send_header('Content-Type', 'application/json')
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    return Handler
+
+WEBSOCKET = 'ws://127.0.0.1/devtools/browser/3f1c'
+
+class TestFindServer(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.state_dir = Path(tmp.name) / "state"
+        self.state_dir.mkdir(mode=0o700)
+        self.state_file = self.state_dir / "browser_server.json"
+
+    def serve(self, payload: dict) -> int:
+        server = HTTPServer(('127.0.0.1', 0), devtools_handler(payload))
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        return server.server_address[1]
+
+    def record(self, port: int, websocket: str = WEBSOCKET):
+        self.state_file.write_text(json.dumps({'endpoint': server_endpoint(port), 'websocket': websocket,
+                                               'pid': os.getpid()}))
+        self.state_file.chmod(0o600)
+
+    def test_finds_recorded_browser(self):
+        port = self.serve({'Browser': 'Chrome/120', 'webSocketDebuggerUrl': WEBSOCKET})
+        self.record(port)
+        self.assertEqual(find_server(self.state_file), server_endpoint(port))
+
+    def test_ignores_unrecorded_browser(self):
+        port = self.serve({'Browser': 'Chrome/120', 'webSocketDebuggerUrl': WEBSOCKET})
+        self.assertIsNone(find_server(self.state_file))
+        # A different browser now answering on the recorded port is not ours
+        self.record(port, websocket='ws://127.0.0.1/devtools/browser/other')
+        self.assertIsNone(find_server(self.state_file))
+
+    def test_ignores_other_services(self):
+        self.record(self.serve({'status': 'ok'}))
+        self.assertIsNone(find_server(self.state_file))
+
+    def test_nothing_listening(self):
+        self.record(find_free_port())
+        self.assertIsNone(find_server(self.state_file))
+
+    @unittest.skipUnless(hasattr(os, 'getuid'), "permission bits are POSIX only")
+    def test_ignores_state_others_can_write(self):
+        port = self.serve({'Browser': 'Chrome/120', 'webSocketDebuggerUrl': WEBSOCKET})
+        self.record(port)
+        self.state_dir.chmod(0o777)
+        self.assertIsNone(read_server_state(self.state_file))
+        self.assertIsNone(find_server(self.state_file))
+
+    def test_server_records_and_removes_its_browser(self):
+        port = self.serve({'Browser': 'Chrome/120', 'webSocketDebuggerUrl': WEBSOCKET})
+        server = BrowserServer(port=port, state_file=self.state_dir / "new" / "browser_server.json")
+        server._process = mock.Mock(pid=4321)
+        server._write_state()
+        self.assertEqual(find_server(server.state_file), server_endpoint(port))
+        if hasattr(os, 'getuid'):
+            self.assertEqual(server.state_file.parent.stat().st_mode & 0o777, 0o700)
+        server.close()
+        self.assertFalse(server.state_file.exists())
+
+    def test_refuses_port_held_by_another_browser(self):
+        port = self.serve({'Browser': 'Chrome/120', 'webSocketDebuggerUrl': WEBSOCKET})
+        server = BrowserServer(port=port, state_file=self.state_file)
+        with self.assertRaises(RuntimeError):
+            server.start()
+
+class FakePool:
+    """Page pool that refuses endpoints listed in `broken`"""
+    broken = set()
+    created = []
+
+    def __init__(self, size=1, headless=True, on_page=None, endpoint=None):
+        if endpoint in self.broken:
+            raise RuntimeError("connection refused")
+        self.endpoint = endpoint
+        self.page = None
+        self.created.append(self)
+
+class TestScraperAttach(unittest.TestCase):
+    def setUp(self):
+        self.scraper = eCourtsScraper.__new__(eCourtsScraper)
+        self.scraper.logger = setup_logger("test")
+        self.scraper.pool_size = 1
+        self.scraper.headless = True
+        self.scraper.pool = None
+        FakePool.broken = set()
+        FakePool.created = []
+        patcher = mock.patch('src.scraper.PagePool', FakePool)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def initialize(self, browser_server: bool, endpoint):
+        self.scraper.browser_server = browser_server
+        with mock.patch('src.scraper.find_server', return_value=endpoint):
+            self.scraper._initialize_browser()
+        return self.scraper.pool
+
+    def test_attaches_to_running_server(self):
+        self.assertEqual(self.initialize(True, "http://127.0.0.1:9333").endpoint, "http://127.0.0.1:9333")
+
+    def test_launches_without_server(self):
+        self.assertIsNone(self.initialize(True, None).endpoint)
+
+    def test_launches_when_attach_fails(self):
+        FakePool.broken = {"http://127.0.0.1:9333"}
+        self.assertIsNone(self.initialize(True, "http://127.0.0.1:9333").endpoint)
+
+    def test_opt_out_never_probes(self):
+        self.scraper.browser_server = False
+        with mock.patch('src.scraper.find_server') as probe:
+            self.scraper._initialize_browser()
+        probe.assert_not_called()
+        self.assertIsNone(self.scraper.pool.endpoint)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+"""
+Unit tests for the long-lived browser worker
+"""
+import threading
+import time
+import unittest
+from src.browser_worker import BrowserWorker
+
+class FakeScraper:
+    """Records the threads it was created, used and closed on"""
+
+    def __init__(self):
+        self.created_on = threading.get_ident()
+        self.used_on = set()
+        self.closed_on = None
+        self.active = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def search_by_cnr(self, cnr, refresh=False):
+        with self._lock:
+            self.used_on.add(threading.get_ident())
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        time.sleep(0.02)
+        with self._lock:
+            self.active -= 1
+        return {'cnr': cnr, 'refresh': refresh}
+
+    def close(self):
+        self.closed_on = threading.get_ident()
+
+class TestBrowserWorker(unittest.TestCase):
+    def setUp(self):
+        self.scrapers = []
+
+    def factory(self):
+        scraper = FakeScraper()
+        self.scrapers.append(scraper)
+        return scraper
+
+    def test_single_page_stays_on_one_thread(self):
+        worker = BrowserWorker(pages=1, factory=self.factory)
+        futures = [worker.submit('search_by_cnr', f"CNR{i}") for i in range(4)]
+        self.assertEqual(futures[2].result()['cnr'], "CNR2")
+        self.assertEqual(worker.call('search_by_cnr', "CNR9", refresh=True), {'cnr': "CNR9", 'refresh': True})
+        worker.close()
+
+        scraper, = self.scrapers
+        self.assertEqual(scraper.used_on, {scraper.created_on})
+        self.assertEqual(scraper.closed_on, scraper.created_on)
+        self.assertEqual(scraper.peak, 1)
+
+    def test_several_pages_run_side_by_side(self):
+        worker = BrowserWorker(pages=3, factory=self.factory)
+        for future in [worker.submit('search_by_cnr', f"CNR{i}") for i in range(6)]:
+            future.result()
+        worker.close()
+
+        scraper, = self.scrapers
+        self.assertGreater(scraper.peak, 1)
+        self.assertEqual(scraper.closed_on, scraper.created_on)
+
+    def test_failed_launch_is_retried(self):
+        attempts = []
+
+        def flaky():
+            attempts.append(1)
+            if len(attempts) == 1:
+                raise RuntimeError("Chromium did not start")
+            return self.factory()
+
+        worker = BrowserWorker(pages=1, factory=flaky)
+        with self.assertRaises(RuntimeError):
+            worker.call('search_by_cnr', "CNR1")
+        self.assertEqual(worker.call('search_by_cnr', "CNR1")['cnr'], "CNR1")
+        self.assertEqual(worker.stats(), {'pages': 1, 'running': True, 'pending': 0})
+        worker.close()
+
+    def test_closed_worker_rejects_jobs(self):
+        worker = BrowserWorker(pages=1, factory=self.factory)
+        worker.close()
+        self.assertEqual(self.scrapers, [])
+        with self.assertRaises(RuntimeError):
+            worker.submit('search_by_cnr', "CNR1")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+"""
+Unit tests for bulk CNR lookups
+"""
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from src.bulk import iter_cnrs, run_bulk_search
+
+class RecordingScraper:
+    """Stand-in for eCourtsScraper.search_many that records what it was asked"""
+
+    def __init__(self, missing=()):
+        self.searched = []
+        self.missing = set(missing)
+
+    def search_many(self, cnrs, refresh=False):
+        for cnr in cnrs:
+            self.searched.append(cnr)
+            yield cnr, None if cnr in self.missing else {'cnr': cnr}
+
+class TestBulkSearch(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = Path(self.tmp.name)
+        self.output = self.dir / "results.jsonl"
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_iter_cnrs_skips_blank_and_comment_lines(self):
+        source = self.dir / "cnrs.txt"
+        source.write_text("CNR1\n\n# comment\n  CNR2  \n")
+        self.assertEqual(list(iter_cnrs(str(source))), ["CNR1", "CNR2"])
+
+    def test_streams_results_and_checkpoints(self):
+        scraper = RecordingScraper(missing={"CNR2"})
+        summary = run_bulk_search(scraper, ["CNR1", "CNR2", "CNR3"], self.output)
+
+        lines = [json.loads(line) for line in self.output.read_text().splitlines()]
+        self.assertEqual([line['cnr'] for line in lines], ["CNR1", "CNR3"])
+        self.assertEqual(summary['found'], 2)
+        self.assertEqual(summary['failed'], 1)
+        checkpoint = Path(summary['checkpoint']).read_text().split()
+        self.assertEqual(checkpoint, ["CNR1", "CNR3"])
+
+    def test_resume_skips_finished_cnrs(self):
+        run_bulk_search(RecordingScraper(missing={"CNR2"}), ["CNR1", "CNR2"], self.output)
+
+        scraper = RecordingScraper()
+        summary = run_bulk_search(scraper, ["CNR1", "CNR2", "CNR3"], self.output)
+
+        self.assertEqual(scraper.searched, ["CNR2", "CNR3"])
+        self.assertEqual(summary['skipped'], 1)
+        self.assertEqual(len(self.output.read_text().splitlines()), 3)
+
+    def test_creates_missing_output_directory(self):
+        output = self.dir / "json" / "bulk.jsonl"
+        summary = run_bulk_search(RecordingScraper(), ["CNR1"], output)
+        self.assertEqual(len(output.read_text().splitlines()), 1)
+        self.assertEqual(Path(summary['checkpoint']).read_text().split(), ["CNR1"])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,55 @@
+"""
+Unit tests for the CNR result cache
+"""
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from pathlib import Path
+from src.cache import CaseCache
+
+NOW = datetime(2025, 11, 3, 10, 0)
+
+class TestCaseCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache = CaseCache(Path(self.tmp.name) / "cache.sqlite3", default_ttl=3600,
+                               hearing_ttl=600, max_ttl=14 * 86400)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_trusted_until_day_before_hearing(self):
+        expires = self.cache.expires_at({'next_hearing': '10th November 2025'}, NOW)
+        self.assertEqual(expires, datetime(2025, 11, 9))
+
+    def test_short_ttl_around_hearing(self):
+        for hearing in ('04-11-2025', '03-11-2025'):
+            expires = self.cache.expires_at({'next_hearing': hearing}, NOW)
+            self.assertEqual(expires, NOW + timedelta(seconds=600))
+
+    def test_default_ttl_without_upcoming_hearing(self):
+        for next_hearing in (None, '', 'Not available', '01-11-2025'):
+            expires = self.cache.expires_at({'next_hearing': next_hearing}, NOW)
+            self.assertEqual(expires, NOW + timedelta(seconds=3600))
+
+    def test_distant_hearing_is_capped(self):
+        expires = self.cache.expires_at({'next_hearing': '10th March 2026'}, NOW)
+        self.assertEqual(expires, NOW + timedelta(days=14))
+
+    def test_get_put_and_expiry(self):
+        case_info = {'cnr': 'KARC010037582023', 'next_hearing': '10th November 2025'}
+        self.assertIsNone(self.cache.get('KARC010037582023', NOW))
+        self.cache.put('KARC010037582023', case_info, NOW)
+        self.assertEqual(self.cache.get('KARC010037582023', NOW + timedelta(days=5)), case_info)
+        self.assertIsNone(self.cache.get('KARC010037582023', datetime(2025, 11, 9, 0, 1)))
+
+        stats = self.cache.stats()
+        self.assertEqual((stats['hits'], stats['misses']), (1, 2))
+
+    def test_invalidate(self):
+        self.cache.put('KARC010037582023', {'next_hearing': None})
+        self.cache.invalidate('KARC010037582023')
+        self.assertIsNone(self.cache.get('KARC010037582023'))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,100 @@
+"""
+Unit tests for the segment-and-classify CAPTCHA solver
+"""
+import random
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from unittest import mock
+import cv2
+import numpy as np
+from src.captcha_classifier import CaptchaClassifier, CaptchaCorpus, binarize, segment_glyphs, train_classifier
+from src.captcha_solver import CaptchaSolver
+from src.ocr import OCREngine
+
+ALPHABET = 'ABCDEFGHJKLMNPQRSTUVWXYZ23456789'
+
+def render_captcha(text: str, rng: random.Random) -> bytes:
+    """Draw a CAPTCHA-like image with a fixed font and slightly uneven spacing"""
+    image = np.full((40, 130, 3), 255, np.uint8)
+    x = 6
+    for char in text:
+        cv2.putText(image, char, (x, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.9, (30, 30, 30), 2)
+        x += 22 + rng.randint(0, 2)
+    return cv2.imencode('.png', image)[1].tobytes()
+
+class NoReadEngine(OCREngine):
+    def __init__(self):
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def recognize(self, image, whitelist=None, psm=7):
+        # The solver reads hypotheses on several threads
+        with self._lock:
+            self.calls += 1
+        return "TESS1"
+
+class TestCaptchaClassifier(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = Path(self.tmp.name)
+        self.rng = random.Random(0)
+        self.corpus = CaptchaCorpus(self.dir / "corpus")
+        for _ in range(60):
+            text = ''.join(self.rng.choice(ALPHABET) for _ in range(5))
+            self.corpus.add(render_captcha(text, self.rng), text)
+        self.model_path = self.dir / "model.npz"
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_segmentation_finds_every_glyph(self):
+        glyphs = segment_glyphs(binarize(render_captcha("AB3C9", self.rng)), 5)
+        self.assertEqual(glyphs.shape[0], 5)
+
+    def test_corpus_deduplicates_images(self):
+        image = render_captcha("ZZZZZ", self.rng)
+        before = len(self.corpus)
+        self.corpus.add(image, "ZZZZZ")
+        self.corpus.add(image, "ZZZZZ")
+        self.assertEqual(len(self.corpus), before + 1)
+
+    def test_train_and_solve(self):
+        stats = train_classifier(self.corpus, self.model_path)
+        self.assertEqual(stats['length'], 5)
+        classifier = CaptchaClassifier.load(self.model_path)
+
+        text = "K7M2Q"
+        solved, confidence = classifier.solve(render_captcha(text, self.rng))
+        self.assertEqual(solved, text)
+        self.assertGreater(confidence, 0.6)
+
+    def test_solver_prefers_confident_classifier(self):
+        train_classifier(self.corpus, self.model_path)
+        engine = NoReadEngine()
+        solver = CaptchaSolver(engine=engine, classifier=CaptchaClassifier.load(self.model_path),
+                               corpus=self.corpus)
+        self.assertEqual(solver.solve_captcha(render_captcha("P4RS8", self.rng)), "P4RS8")
+        self.assertEqual(engine.calls, 0)
+
+    def test_solver_falls_back_to_tesseract(self):
+        train_classifier(self.corpus, self.model_path)
+        engine = NoReadEngine()
+        solver = CaptchaSolver(engine=engine, classifier=CaptchaClassifier.load(self.model_path),
+                               corpus=self.corpus)
+        blank = cv2.imencode('.png', np.full((40, 130), 255, np.uint8))[1].tobytes()
+        self.assertEqual(solver.solve_captcha(blank), "TESS1")
+        # The engine's neutral confidence passes, so one OCR read follows the classifier
+        self.assertEqual(engine.calls, 1)
+
+    def test_classifier_error_falls_back_to_tesseract(self):
+        classifier = mock.Mock()
+        classifier.solve.side_effect = ValueError("model has the wrong glyph size")
+        engine = NoReadEngine()
+        solver = CaptchaSolver(engine=engine, classifier=classifier, corpus=self.corpus)
+        self.assertEqual(solver.solve_captcha(render_captcha("P4RS8", self.rng)), "TESS1")
+        self.assertEqual(engine.calls, 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,46 @@
+"""
+Unit tests for capturing CAPTCHA images from network responses
+"""
+import unittest
+from src.captcha_watcher import CaptchaWatcher
+
+class FakePage:
+    def __init__(self):
+        self.handlers = {}
+
+    def on(self, event, handler):
+        self.handlers[event] = handler
+
+    def emit(self, event, payload):
+        self.handlers[event](payload)
+
+class FakeResponse:
+    def __init__(self, url, ok=True):
+        self.url = url
+        self.ok = ok
+
+CAPTCHA_URL = "https://services.ecourts.gov.in/ecourtindia_v6/vendor/securimage/securimage_show.php?0.42"
+
+class TestCaptchaWatcher(unittest.TestCase):
+    def setUp(self):
+        self.page = FakePage()
+        self.watcher = CaptchaWatcher(self.page)
+
+    def test_keeps_latest_captcha_response(self):
+        first, second = FakeResponse(CAPTCHA_URL), FakeResponse(CAPTCHA_URL + "1")
+        self.page.emit("response", first)
+        self.page.emit("response", FakeResponse("https://services.ecourts.gov.in/ecourtindia_v6/js/main.js"))
+        self.page.emit("response", second)
+        self.assertIs(self.watcher.take(), second)
+
+    def test_take_consumes_response(self):
+        self.page.emit("response", FakeResponse(CAPTCHA_URL))
+        self.assertIsNotNone(self.watcher.take())
+        self.assertIsNone(self.watcher.take())
+
+    def test_ignores_failed_responses(self):
+        self.page.emit("response", FakeResponse(CAPTCHA_URL, ok=False))
+        self.assertIsNone(self.watcher.take())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,100 @@
+"""
+Unit tests for the cause list search index
+"""
+import json
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from src.cause_list_index import CauseListIndex, match_terms
+from src.models import CauseList, CauseListEntry
+
+def cause_list(date, court_complex, entries):
+    return CauseList(
+        date=date, state="Karnataka", district="Bangalore", court_complex=court_complex, court_name="",
+        entries=[CauseListEntry(serial_number=str(i + 1), case_number=number, petitioner=petitioner,
+                                respondent=respondent, advocate=advocate)
+                 for i, (number, petitioner, respondent, advocate) in enumerate(entries)]
+    ).to_dict()
+
+class TestCauseListIndex(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = Path(self.tmp.name)
+        self.index = CauseListIndex(self.dir / "index.sqlite3")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _save(self, name, data):
+        path = self.dir / name
+        path.write_text(json.dumps(data), encoding='utf-8')
+        return path
+
+    def test_search_by_advocate_party_and_date(self):
+        self._save("causelist_a.json", cause_list("03-11-2025", "City Civil Court", [
+            ("OS/12/2024", "Ramesh Kumar", "State of Karnataka", "S. N. Rao"),
+            ("OS/13/2024", "Suresh", "Ramesh Traders", "K. Iyer"),
+        ]))
+        self._save("causelist_b.json", cause_list("20-11-2025", "Mayo Hall", [
+            ("OS/99/2023", "Lakshmi", "BBMP", "S.N. Rao"),
+        ]))
+        self.assertEqual(self.index.update(self.dir)['indexed'], 2)
+
+        rao = self.index.search(advocate="S N Rao")
+        self.assertEqual([r['case_number'] for r in rao], ["OS/12/2024", "OS/99/2023"])
+
+        ramesh = self.index.search(party="ramesh")
+        self.assertEqual({r['case_number'] for r in ramesh}, {"OS/12/2024", "OS/13/2024"})
+
+        early = self.index.search(advocate="Rao", date_to="10-11-2025")
+        self.assertEqual([r['court_complex'] for r in early], ["City Civil Court"])
+        self.assertEqual(early[0]['date'], "2025-11-03")
+
+        self.assertEqual(len(self.index.search(advocate="Rao", court_complex="Mayo Hall")), 1)
+        self.assertEqual(len(self.index.search(advocate="Rao", court_complex="mayo hall")), 1)
+
+    def test_incremental_update(self):
+        path = self._save("causelist_a.json", cause_list("03-11-2025", "City Civil Court", [
+            ("OS/12/2024", "Ramesh Kumar", "State", "S. N. Rao"),
+        ]))
+        self.index.update(self.dir)
+        self.assertEqual(self.index.update(self.dir), {'indexed': 0, 'unchanged': 1, 'removed': 0, 'entries': 0})
+
+        self._save("causelist_a.json", cause_list("03-11-2025", "City Civil Court", [
+            ("OS/14/2024", "Meena", "State", "P. Shetty"),
+        ]))
+        os.utime(path, (path.stat().st_atime, path.stat().st_mtime + 10))
+        self.assertEqual(self.index.update(self.dir)['indexed'], 1)
+        self.assertEqual(self.index.search(advocate="Rao"), [])
+        self.assertEqual(len(self.index.search(advocate="Shetty")), 1)
+
+        path.unlink()
+        self.assertEqual(self.index.update(self.dir)['removed'], 1)
+        self.assertEqual(self.index.stats()['entries'], 0)
+
+    def test_limit_flags_truncated_results(self):
+        self._save("causelist_a.json", cause_list("03-11-2025", "City Civil Court", [
+            (f"OS/{n}/2024", "Ramesh", "State", "S. N. Rao") for n in range(3)
+        ]))
+        self.index.update(self.dir)
+        results = self.index.search(advocate="Rao", limit=2)
+        self.assertEqual([r['case_number'] for r in results], ["OS/0/2024", "OS/1/2024"])
+        self.assertTrue(results.truncated)
+        self.assertFalse(self.index.search(advocate="Rao", limit=3).truncated)
+        for limit in (0, -1):
+            with self.assertRaises(ValueError):
+                self.index.search(advocate="Rao", limit=limit)
+
+    def test_query_without_words_is_rejected(self):
+        with self.assertRaises(ValueError):
+            self.index.search(advocate="...")
+        with self.assertRaises(ValueError):
+            self.index.search(advocate="Rao", party="&&")
+
+    def test_query_syntax_is_escaped(self):
+        self.assertEqual(match_terms('Rao" OR advocate:*'), '"Rao" AND "OR" AND "advocate"')
+        self.assertEqual(self.index.search(advocate='Rao" OR *'), [])
+
+if __name__ == '__main__':
+    unittest.main()
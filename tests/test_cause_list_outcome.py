@@ -0,0 +1,152 @@
+"""
+Unit tests for detecting how the portal answered a cause list submit
+"""
+import asyncio
+import unittest
+from unittest import mock
+from playwright.sync_api import TimeoutError as PlaywrightTimeout
+from playwright.async_api import TimeoutError as AsyncPlaywrightTimeout
+from src.async_scraper import AsyncECourtsScraper
+from src.cause_list_outcome import DownloadWatcher
+from src.scheduler import RequestScheduler
+from src.scraper import eCourtsScraper
+from src.utils import setup_logger
+
+class FakeHandle:
+    def __init__(self, value):
+        self.value = value
+
+    def json_value(self):
+        return self.value
+
+class FakePage:
+    """Sync page whose wait_for_function plays back a script of answers, timeouts and downloads"""
+    url = "https://services.ecourts.gov.in/ecourtindia_v6/?p=cause_list/index"
+
+    def __init__(self, script=()):
+        self.handlers = {}
+        self.script = list(script)
+
+    def on(self, event, handler):
+        self.handlers[event] = handler
+
+    def remove_listener(self, event, handler):
+        if self.handlers.get(event) == handler:
+            del self.handlers[event]
+
+    def emit(self, event, payload):
+        self.handlers[event](payload)
+
+    def evaluate(self, script, arg=None):
+        pass
+
+    def wait_for_function(self, script, arg=None, timeout=None):
+        step = self.script.pop(0) if self.script else 'timeout'
+        if step == 'download':
+            self.emit("download", "report.pdf")
+        if isinstance(step, dict):
+            return FakeHandle(step)
+        raise PlaywrightTimeout("Timeout exceeded")
+
+class FakeButton:
+    def click(self):
+        pass
+
+def sync_scraper() -> eCourtsScraper:
+    scraper = eCourtsScraper.__new__(eCourtsScraper)
+    scraper.logger = setup_logger("test")
+    scraper.scheduler = RequestScheduler(delay=0)
+    return scraper
+
+class TestDownloadWatcher(unittest.TestCase):
+    def test_keeps_first_download_and_detaches(self):
+        page = FakePage()
+        watcher = DownloadWatcher(page)
+        page.emit("download", "first.pdf")
+        page.emit("download", "second.pdf")
+        self.assertEqual(watcher.download, "first.pdf")
+        watcher.close()
+        self.assertNotIn("download", page.handlers)
+
+    def test_arrived_resolves_before_and_after(self):
+        async def run():
+            page = FakePage()
+            watcher = DownloadWatcher(page)
+            pending = watcher.arrived()
+            self.assertFalse(pending.done())
+            page.emit("download", "report.pdf")
+            self.assertEqual(await pending, "report.pdf")
+            self.assertEqual(await watcher.arrived(), "report.pdf")
+
+        asyncio.run(run())
+
+class TestSubmitCauseList(unittest.TestCase):
+    def test_download_ends_the_watch(self):
+        page = FakePage(['timeout', 'download', {'kind': 'table'}])
+        outcome = sync_scraper()._submit_cause_list(page, FakeButton())
+        self.assertEqual((outcome.kind, outcome.download), ('download', "report.pdf"))
+        self.assertNotIn("download", page.handlers)
+
+    def test_page_answer_returns_at_once(self):
+        page = FakePage([{'kind': 'message', 'message': 'Record not found'}])
+        outcome = sync_scraper()._submit_cause_list(page, FakeButton())
+        self.assertEqual((outcome.kind, outcome.message), ('message', 'Record not found'))
+
+    def test_no_answer_times_out(self):
+        with mock.patch('config.CAUSE_LIST_RESULT_TIMEOUT', 50), mock.patch('config.CAUSE_LIST_POLL_INTERVAL', 10):
+            outcome = sync_scraper()._submit_cause_list(FakePage(), FakeButton())
+        self.assertEqual(outcome.kind, 'timeout')
+
+class AsyncFakePage(FakePage):
+    """Async page whose wait_for_function answers after a delay, or never"""
+
+    def __init__(self, answer=None, delay=0.0):
+        super().__init__()
+        self.answer = answer
+        self.delay = delay
+
+    async def evaluate(self, script, arg=None):
+        pass
+
+    async def wait_for_function(self, script, arg=None, timeout=None):
+        await asyncio.sleep(self.delay)
+        if self.answer is None:
+            raise AsyncPlaywrightTimeout("Timeout exceeded")
+        return AsyncFakeHandle(self.answer)
+
+class AsyncFakeHandle(FakeHandle):
+    async def json_value(self):
+        return self.value
+
+class AsyncFakeButton:
+    def __init__(self, page, download=None):
+        self.page = page
+        self.download = download
+
+    async def click(self):
+        if self.download:
+            asyncio.get_running_loop().call_later(0.01, self.page.emit, "download", self.download)
+
+class TestAsyncSubmitCauseList(unittest.TestCase):
+    def setUp(self):
+        self.scraper = AsyncECourtsScraper.__new__(AsyncECourtsScraper)
+        self.scraper.logger = setup_logger("test")
+        self.scraper.scheduler = RequestScheduler(delay=0)
+
+    def test_download_beats_slow_page(self):
+        page = AsyncFakePage({'kind': 'table'}, delay=5)
+        outcome = asyncio.run(self.scraper._submit_cause_list(page, AsyncFakeButton(page, "report.pdf")))
+        self.assertEqual((outcome.kind, outcome.download), ('download', "report.pdf"))
+
+    def test_error_banner(self):
+        page = AsyncFakePage({'kind': 'error', 'message': 'Invalid Captcha'})
+        outcome = asyncio.run(self.scraper._submit_cause_list(page, AsyncFakeButton(page)))
+        self.assertEqual((outcome.kind, outcome.message), ('error', 'Invalid Captcha'))
+
+    def test_timeout(self):
+        page = AsyncFakePage()
+        outcome = asyncio.run(self.scraper._submit_cause_list(page, AsyncFakeButton(page)))
+        self.assertEqual(outcome.kind, 'timeout')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,142 @@
+"""
+Unit tests for the court hierarchy cache
+"""
+import asyncio
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+from src.async_scraper import AsyncECourtsScraper
+from src.cause_list_outcome import CauseListOutcome
+from src.court_hierarchy import CourtHierarchy, SELECTORS, clean_options, find_option, form_values
+from src.scraper import eCourtsScraper
+from src.utils import setup_logger
+
+NOW = 1_750_000_000.0
+
+class TestCourtHierarchy(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp.name) / "courts.json"
+        self.hierarchy = CourtHierarchy(self.path, max_age=3600)
+        self.hierarchy.set_options([], [{'code': '3', 'name': 'Karnataka'}, {'code': '26', 'name': 'Delhi'}], now=NOW)
+        self.hierarchy.set_options(['Karnataka'], [{'code': '20', 'name': 'Bangalore'}], now=NOW)
+        self.hierarchy.set_options(['Karnataka', 'Bangalore'],
+                                   [{'code': '1030134@2,3@N', 'name': 'City Civil Court'}], now=NOW)
+        self.hierarchy.set_options(['Karnataka', 'Bangalore', 'City Civil Court'],
+                                   [{'code': '2^5', 'name': 'Court 1'}, {'code': '2^6', 'name': 'Court 2'}], now=NOW)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_resolve_codes(self):
+        codes = self.hierarchy.resolve('karnataka', 'Bangalore', 'City  Civil Court', 'Court 2', now=NOW)
+        self.assertEqual(codes, {'state': '3', 'district': '20', 'court_complex': '1030134@2,3@N', 'court': '2^6'})
+        # Without a court name the first court is used, as the form walk does
+        self.assertEqual(self.hierarchy.resolve('Karnataka', 'Bangalore', 'City Civil Court', now=NOW)['court'], '2^5')
+        self.assertIsNone(self.hierarchy.resolve('Delhi', 'Central', 'Patiala House', now=NOW))
+        self.assertIsNone(self.hierarchy.resolve('Karnataka', 'Bangalore', 'City Civil Court', 'Court 9', now=NOW))
+
+    def test_persists_across_instances(self):
+        reloaded = CourtHierarchy(self.path, max_age=3600)
+        self.assertEqual(reloaded.options('Karnataka', now=NOW), [{'code': '20', 'name': 'Bangalore'}])
+        self.assertEqual(reloaded.counts(), {'state': 2, 'district': 1, 'court_complex': 1, 'court': 2})
+
+    def test_stale_options_are_missing(self):
+        self.assertIsNotNone(self.hierarchy.options(now=NOW + 3600))
+        self.assertIsNone(self.hierarchy.options(now=NOW + 3601))
+        self.assertIsNone(self.hierarchy.resolve('Karnataka', 'Bangalore', 'City Civil Court', now=NOW + 3601))
+        self.assertIsNone(self.hierarchy.options('Delhi', now=NOW))
+
+    def test_refreshing_a_level_keeps_known_children(self):
+        self.hierarchy.set_options([], [{'code': '3', 'name': 'Karnataka'}, {'code': '29', 'name': 'Goa'}], now=NOW)
+        self.assertEqual(self.hierarchy.options('Karnataka', now=NOW), [{'code': '20', 'name': 'Bangalore'}])
+        self.assertIsNone(self.hierarchy.options('Delhi', now=NOW))
+
+    def test_invalidate(self):
+        self.hierarchy.invalidate('Karnataka', 'Bangalore')
+        self.assertIsNone(self.hierarchy.options('Karnataka', 'Bangalore', now=NOW))
+        self.assertIsNone(CourtHierarchy(self.path).resolve('Karnataka', 'Bangalore', 'City Civil Court', now=NOW))
+
+    def test_reload_if_changed(self):
+        reader = CourtHierarchy(self.path, max_age=3600)
+        self.hierarchy.set_options(['Karnataka'], [{'code': '21', 'name': 'Mysore'}], now=NOW)
+        self.assertEqual(reader.options('Karnataka', now=NOW), [{'code': '20', 'name': 'Bangalore'}])
+        reader.reload_if_changed()
+        self.assertEqual(reader.options('Karnataka', now=NOW), [{'code': '21', 'name': 'Mysore'}])
+
+    def test_unreadable_file_starts_empty(self):
+        self.path.write_text('{not json')
+        self.assertIsNone(CourtHierarchy(self.path).options())
+
+class TestFormHelpers(unittest.TestCase):
+    def test_clean_options_drops_placeholders(self):
+        raw = [['', 'Select State'], ['0', 'Select District'], ['3', 'Karnataka']]
+        self.assertEqual(clean_options(raw), [{'code': '3', 'name': 'Karnataka'}])
+
+    def test_find_option(self):
+        options = [{'code': '1', 'name': 'Court 1'}, {'code': '2', 'name': 'Court 2'}]
+        self.assertEqual(find_option(options, ' court 2 ')['code'], '2')
+        self.assertEqual(find_option(options, None)['code'], '1')
+        self.assertIsNone(find_option([], None))
+
+    def test_form_values(self):
+        self.assertEqual(form_values({'state': '3', 'court': '2^5'}),
+                         [[SELECTORS['state'], '3'], [SELECTORS['court'], '2^5']])
+
+def cached_hierarchy(path: Path) -> CourtHierarchy:
+    """Fresh hierarchy with one court complex and its courts"""
+    hierarchy = CourtHierarchy(path)
+    hierarchy.set_options([], [{'code': '3', 'name': 'Karnataka'}])
+    hierarchy.set_options(['Karnataka'], [{'code': '20', 'name': 'Bangalore'}])
+    hierarchy.set_options(['Karnataka', 'Bangalore'], [{'code': '1030134@2,3@N', 'name': 'City Civil Court'}])
+    hierarchy.set_options(['Karnataka', 'Bangalore', 'City Civil Court'], [{'code': '2^5', 'name': 'Court 1'}])
+    return hierarchy
+
+class TestStaleCachedCodes(unittest.TestCase):
+    """A submit the portal rejects after filling cached codes invalidates them and walks the form once"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.submits = []
+        self.walks = []
+
+    def stub(self, scraper, outcomes, wrap=lambda value: value):
+        scraper.logger = setup_logger("test")
+        scraper.court_hierarchy = cached_hierarchy(Path(self.tmp.name) / "courts.json")
+        scraper._stage = lambda page, stage: None
+        scraper._open_cause_list_form = lambda page: wrap(None)
+        scraper._solve_captcha_with_retry = lambda page: wrap((b"png", "abc123"))
+        scraper._walk_court_hierarchy = lambda page, names: wrap(self.walks.append(names) or ({}, []))
+
+        def submit(page, button):
+            self.submits.append(button)
+            return wrap(outcomes.pop(0))
+
+        scraper._submit_cause_list = submit
+        return scraper
+
+    def test_rejected_submit_retries_through_the_form(self):
+        scraper = self.stub(eCourtsScraper.__new__(eCourtsScraper),
+                            [CauseListOutcome('error', 'Invalid court'), CauseListOutcome('message', 'No records')])
+        self.assertIsNone(scraper._download_cause_list(mock.MagicMock(), "Karnataka", "Bangalore",
+                                                       "City Civil Court", None, "03-11-2025"))
+        self.assertEqual(len(self.submits), 2)
+        self.assertEqual(self.walks, [("Karnataka", "Bangalore", "City Civil Court", None)])
+        self.assertIsNone(scraper.court_hierarchy.options("Karnataka", "Bangalore", "City Civil Court"))
+
+    def test_async_rejected_submit_retries_through_the_form(self):
+        async def value(result):
+            return result
+
+        page = mock.MagicMock(evaluate=mock.AsyncMock(), fill=mock.AsyncMock(), query_selector=mock.AsyncMock())
+        scraper = self.stub(AsyncECourtsScraper.__new__(AsyncECourtsScraper),
+                            [CauseListOutcome('timeout'), CauseListOutcome('timeout')], wrap=value)
+        self.assertIsNone(asyncio.run(scraper._download_cause_list(page, "Karnataka", "Bangalore",
+                                                                   "City Civil Court", None, "03-11-2025")))
+        self.assertEqual(len(self.submits), 2)
+        self.assertEqual(len(self.walks), 1)
+
+if __name__ == '__main__':
+    unittest.main()
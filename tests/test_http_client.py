@@ -0,0 +1,142 @@
+"""
+Tests for the browser-free HTTP transport against a local stand-in server
+"""
+import json
+import sqlite3
+import tempfile
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from unittest import mock
+from urllib.parse import parse_qs, urlparse
+import config
+from src.cache import CaseCache
+from src.http_client import ECourtsHttpClient
+from src.models import CaptchaResult
+
+APP_TOKEN = "abc123"
+CAPTCHA_TEXT = "X7K2P"
+
+with open(config.BASE_DIR / "case_info_page.html", encoding='utf-8') as f:
+    CASE_PAGE = f.read()
+
+class PortalHandler(BaseHTTPRequestHandler):
+    """Minimal stand-in for the eCourts landing, CAPTCHA and CNR search endpoints"""
+    protocol_version = 'HTTP/1.1'
+
+    def setup(self):
+        super().setup()
+        self.server.connections += 1
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, body: bytes, content_type: str):
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        path = urlparse(self.path).path
+        if path == '/' + config.ECOURTS_CAPTCHA_PATH:
+            self.server.captchas_served += 1
+            self._send(b'\x89PNG stand-in', 'image/png')
+        else:
+            self._send(f'<input type="hidden" id="app_token" value="{APP_TOKEN}">'.encode(), 'text/html')
+
+    def do_POST(self):
+        self.server.searches += 1
+        length = int(self.headers['Content-Length'])
+        form = parse_qs(self.rfile.read(length).decode())
+        if form['app_token'] != [APP_TOKEN]:
+            reply = {'errormsg': 'Invalid Request'}
+        elif form['fcaptcha_code'] != [CAPTCHA_TEXT]:
+            reply = {'errormsg': 'Invalid Captcha', 'app_token': APP_TOKEN}
+        elif form['cino'] == ['MISSING']:
+            reply = {'errormsg': 'This Case Code does not exists', 'app_token': APP_TOKEN}
+        else:
+            reply = {'casetype_list': CASE_PAGE, 'app_token': APP_TOKEN}
+        self._send(json.dumps(reply).encode(), 'application/json')
+
+class ScriptedSolver:
+    """Returns queued CAPTCHA answers in order, then the correct one"""
+
+    def __init__(self, answers=()):
+        self.answers = list(answers)
+
+    def solve(self, image_bytes):
+        text = self.answers.pop(0) if self.answers else CAPTCHA_TEXT
+        return CaptchaResult(text=text, confidence=0.0 if text is None else 0.9)
+
+    def record_accepted(self, image_bytes, text):
+        self.accepted = text
+
+    def close(self):
+        pass
+
+class TestHttpClient(unittest.TestCase):
+    def setUp(self):
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), PortalHandler)
+        self.server.connections = 0
+        self.server.captchas_served = 0
+        self.server.searches = 0
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.base_url = f"http://127.0.0.1:{self.server.server_address[1]}/"
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_search_parses_case_fragment(self):
+        with ECourtsHttpClient(self.base_url, captcha_solver=ScriptedSolver(), use_cache=False) as client:
+            case_info = client.search_by_cnr("KARC010037582023")
+        self.assertEqual(case_info['case_number'], "778/2023")
+        self.assertEqual(case_info['next_hearing'], "10th November 2025")
+
+    def test_rejected_captcha_is_retried(self):
+        with ECourtsHttpClient(self.base_url, captcha_solver=ScriptedSolver(["WRONG"]), use_cache=False) as client:
+            case_info = client.search_by_cnr("KARC010037582023")
+        self.assertIsNotNone(case_info)
+        self.assertEqual(self.server.captchas_served, 2)
+
+    def test_uncertain_captcha_is_refreshed_without_submitting(self):
+        with ECourtsHttpClient(self.base_url, captcha_solver=ScriptedSolver([None]), use_cache=False) as client:
+            case_info = client.search_by_cnr("KARC010037582023")
+        self.assertIsNotNone(case_info)
+        self.assertEqual(self.server.captchas_served, 2)
+        self.assertEqual(self.server.searches, 1)
+
+    def test_portal_error_returns_none(self):
+        with ECourtsHttpClient(self.base_url, captcha_solver=ScriptedSolver(), use_cache=False) as client:
+            self.assertIsNone(client.search_by_cnr("MISSING"))
+
+    def test_lookups_reuse_keep_alive_connection(self):
+        with ECourtsHttpClient(self.base_url, captcha_solver=ScriptedSolver(), use_cache=False) as client:
+            client.search_by_cnr("KARC010037582023")
+            client.search_by_cnr("KARC010037592023")
+        self.assertEqual(self.server.connections, 1)
+
+    def test_cached_result_skips_portal(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = CaseCache(Path(tmp) / "cache.sqlite3")
+            with ECourtsHttpClient(self.base_url, captcha_solver=ScriptedSolver(), cache=cache) as client:
+                first = client.search_by_cnr("KARC010037582023")
+                second = client.search_by_cnr("KARC010037582023")
+                client.search_by_cnr("KARC010037582023", refresh=True)
+            self.assertEqual(first, second)
+            self.assertEqual(self.server.searches, 2)
+            self.assertEqual(cache.stats()['hits'], 1)
+
+    def test_unexpected_error_does_not_stop_a_batch(self):
+        cache = mock.Mock()
+        cache.get.side_effect = [sqlite3.OperationalError("database is locked"), None]
+        with ECourtsHttpClient(self.base_url, captcha_solver=ScriptedSolver(), cache=cache, workers=1) as client:
+            results = dict(client.search_many(["KARC010037582023", "KARC010037592023"]))
+        self.assertIsNone(results["KARC010037582023"])
+        self.assertEqual(results["KARC010037592023"]['case_number'], "778/2023")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,132 @@
+"""
+Unit tests for web UI jobs and the progress the scraper reports
+"""
+import threading
+import time
+import unittest
+from src.browser_worker import BrowserWorker
+from src.jobs import JobManager
+from src.scraper import eCourtsScraper
+from src.utils import setup_logger
+
+class FakeScraper:
+    """Reports two stages, then answers from a canned table"""
+
+    def __init__(self):
+        self.release = threading.Event()
+        self.release.set()
+
+    def search_by_cnr(self, cnr, refresh=False, progress=None):
+        progress('navigating')
+        self.release.wait(5)
+        progress('parsing')
+        if cnr == 'BROKEN':
+            raise RuntimeError("page crashed")
+        return {'cnr': cnr} if cnr != 'MISSING' else None
+
+    def close(self):
+        pass
+
+class TestJobManager(unittest.TestCase):
+    def setUp(self):
+        self.scraper = FakeScraper()
+        self.worker = BrowserWorker(pages=2, factory=lambda: self.scraper)
+        self.jobs = JobManager(self.worker)
+
+    def tearDown(self):
+        self.scraper.release.set()
+        self.worker.close()
+
+    def run_job(self, cnr):
+        job = self.jobs.submit('search_cnr', 'search_by_cnr', {'cnr': cnr}, 'Case not found')
+        while not job.is_finished:
+            self.jobs.wait(job, len(job.events), timeout=5)
+        return job
+
+    def test_records_stages_then_result(self):
+        job = self.run_job('ABCD01')
+        self.assertEqual([event['stage'] for event in job.events], ['navigating', 'parsing', 'done'])
+        self.assertEqual((job.status, job.result, job.error), ('done', {'cnr': 'ABCD01'}, None))
+
+    def test_empty_result_fails_with_message(self):
+        job = self.run_job('MISSING')
+        self.assertEqual((job.status, job.error), ('failed', 'Case not found'))
+
+    def test_exception_fails_job(self):
+        job = self.run_job('BROKEN')
+        self.assertEqual((job.status, job.error, job.stage), ('failed', 'page crashed', 'failed'))
+
+    def test_wait_returns_new_events_or_times_out(self):
+        self.scraper.release.clear()
+        job = self.jobs.submit('search_cnr', 'search_by_cnr', {'cnr': 'ABCD01'}, 'Case not found')
+        first = self.jobs.wait(job, 0, timeout=5)
+        self.assertEqual([event['stage'] for event in first], ['navigating'])
+        start = time.monotonic()
+        self.assertEqual(self.jobs.wait(job, 1, timeout=0.05), [])
+        self.assertGreaterEqual(time.monotonic() - start, 0.04)
+        self.assertEqual(self.jobs.get(job.id).status, 'running')
+
+    def test_batch_keeps_submission_order(self):
+        calls = [('search_cnr', 'search_by_cnr', {'cnr': cnr}, 'Case not found') for cnr in ('A1', 'MISSING', 'B2')]
+        batch_id, submitted = self.jobs.submit_batch(calls)
+        for job in submitted:
+            while not job.is_finished:
+                self.jobs.wait(job, len(job.events), timeout=5)
+        jobs = self.jobs.batch(batch_id)
+        self.assertEqual([job.params['cnr'] for job in jobs], ['A1', 'MISSING', 'B2'])
+        self.assertEqual([job.status for job in jobs], ['done', 'failed', 'done'])
+        self.assertIsNone(self.jobs.batch('unknown'))
+
+    def test_prunes_oldest_finished_jobs(self):
+        self.jobs.max_jobs = 2
+        first = self.run_job('A1')
+        second = self.run_job('B2')
+        third = self.run_job('C3')
+        self.assertIsNone(self.jobs.get(first.id))
+        self.assertIsNotNone(self.jobs.get(second.id))
+        self.assertIsNotNone(self.jobs.get(third.id))
+
+    def test_prunes_expired_jobs(self):
+        self.jobs.ttl = 0
+        first = self.run_job('A1')
+        self.run_job('B2')
+        self.assertIsNone(self.jobs.get(first.id))
+
+    def test_submit_after_close_leaves_no_job(self):
+        self.worker.close()
+        with self.assertRaises(RuntimeError):
+            self.jobs.submit('search_cnr', 'search_by_cnr', {'cnr': 'A1'}, 'Case not found')
+        self.assertEqual(self.jobs._jobs, {})
+
+class InlinePool:
+    def run(self, func, *args):
+        return func(object(), *args)
+
+class TestScraperProgress(unittest.TestCase):
+    def setUp(self):
+        self.scraper = eCourtsScraper.__new__(eCourtsScraper)
+        self.scraper.logger = setup_logger("test")
+        self.scraper.pool = InlinePool()
+        self.scraper._progress = {}
+
+    def test_stages_reach_the_job_on_that_page(self):
+        stages = []
+
+        def lookup(page, cnr):
+            self.scraper._stage(page, 'navigating')
+            self.scraper._stage(page, 'parsing')
+            return cnr
+
+        self.assertEqual(self.scraper._run_on_page(lookup, 'A1', progress=stages.append), 'A1')
+        self.assertEqual(stages, ['navigating', 'parsing'])
+        self.assertEqual(self.scraper._progress, {})
+
+    def test_failing_callback_does_not_break_lookup(self):
+        def broken(stage):
+            raise ValueError("client gone")
+
+        lookup = lambda page: self.scraper._stage(page, 'navigating') or 'ok'
+        self.assertEqual(self.scraper._run_on_page(lookup, progress=broken), 'ok')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,94 @@
+"""
+Unit tests for OCR backends
+"""
+import unittest
+from unittest import mock
+from PIL import Image
+import config
+from src.captcha_solver import CaptchaSolver
+from src.ocr import OCREngine, TesseractEngine, create_ocr_engine, split_batch_output, NUMERIC_WHITELIST
+
+class FixedEngine(OCREngine):
+    """Engine returning canned reads, to exercise CaptchaSolver without Tesseract"""
+
+    def __init__(self, text, confidence=0.5, spawns_process=False):
+        self.text = text
+        self.confidence = confidence
+        self.spawns_process = spawns_process
+        self.calls = []
+
+    def recognize_with_confidence(self, image, whitelist=None, psm=7):
+        self.calls.append(whitelist)
+        return self.text, self.confidence
+
+class TestOCREngines(unittest.TestCase):
+    def test_create_tesseract_engine(self):
+        self.assertIsInstance(create_ocr_engine('tesseract'), TesseractEngine)
+
+    def test_unknown_backend(self):
+        with self.assertRaises(ValueError):
+            create_ocr_engine('nope')
+
+    def test_split_batch_output(self):
+        self.assertEqual(split_batch_output("AB12\n\fCD34\n\f", 3), ["AB12", "CD34", ""])
+
+class TestCaptchaSolverEngine(unittest.TestCase):
+    def setUp(self):
+        self.image = Image.new('L', (120, 40), 255)
+
+    def test_solver_uses_injected_engine(self):
+        engine = FixedEngine(" A b-12 \n")
+        solver = CaptchaSolver(engine=engine)
+        image_bytes = self._png_bytes()
+        self.assertEqual(solver.solve_captcha(image_bytes), "Ab12")
+
+    def test_confident_first_read_is_enough(self):
+        engine = FixedEngine("Ab12", confidence=0.9)
+        solver = CaptchaSolver(engine=engine)
+        solver.classifier = None
+        result = solver.solve(self._png_bytes())
+        solver.close()
+        self.assertEqual(len(engine.calls), 1)
+        self.assertEqual((result.text, result.confidence), ("Ab12", 0.9))
+
+    def test_weak_first_read_fans_out(self):
+        engine = FixedEngine("Ab12", confidence=0.2)
+        solver = CaptchaSolver(engine=engine)
+        solver.classifier = None
+        with mock.patch.object(solver, '_denoise', wraps=solver._denoise) as denoise:
+            result = solver.solve(self._png_bytes())
+        solver.close()
+        self.assertEqual(denoise.call_count, 1)
+        self.assertEqual(result.text, "Ab12")
+        # Every threshold, whitelist and segmentation mode is read once
+        expected = len(config.CAPTCHA_THRESHOLDS) * len(config.CAPTCHA_WHITELISTS) * len(config.CAPTCHA_PSM_MODES)
+        self.assertEqual(len(engine.calls), expected)
+        self.assertEqual(len(result.alternatives), expected)
+        # Agreement between reads lifts the weak confidence of each
+        self.assertGreater(result.confidence, 0.2)
+
+    def test_subprocess_engine_reads_few_hypotheses(self):
+        engine = FixedEngine("Ab12", confidence=0.2, spawns_process=True)
+        solver = CaptchaSolver(engine=engine)
+        solver.classifier = None
+        solver.solve(self._png_bytes())
+        solver.close()
+        self.assertEqual(len(engine.calls), 1 + config.CAPTCHA_SUBPROCESS_READS)
+        # The numeric whitelist is the last resort, not part of the capped retry
+        self.assertNotIn(NUMERIC_WHITELIST, engine.calls)
+
+    def test_solve_without_plausible_read(self):
+        solver = CaptchaSolver(engine=FixedEngine("x"))
+        result = solver.solve(self._png_bytes())
+        solver.close()
+        self.assertIsNone(result.text)
+        self.assertEqual(result.confidence, 0.0)
+
+    def _png_bytes(self):
+        import io
+        buffer = io.BytesIO()
+        self.image.save(buffer, format='PNG')
+        return buffer.getvalue()
+
+if __name__ == '__main__':
+    unittest.main()
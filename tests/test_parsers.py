@@ -0,0 +1,96 @@
+"""
+Unit tests for eCourts page parsers
+"""
+import re
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+import config
+from src.parsers import parse_case_info, parse_case_info_dict, parse_cause_list
+
+class TestParseCaseInfo(unittest.TestCase):
+    def setUp(self):
+        with open(config.BASE_DIR / "case_info_page.html", encoding='utf-8') as f:
+            self.html = f.read()
+
+    def test_case_details(self):
+        case_info = parse_case_info(self.html, "KARC010037582023")
+        self.assertEqual(case_info.case_type, "SPL.C - SPECIAL CASES")
+        self.assertEqual(case_info.case_number, "778/2023")
+        self.assertEqual(case_info.filing_date, "05-10-2023")
+        self.assertEqual(case_info.registration_date, "06-10-2023")
+
+    def test_case_status(self):
+        case_info = parse_case_info(self.html, "KARC010037582023")
+        self.assertEqual(case_info.next_hearing, "10th November 2025")
+        self.assertEqual(case_info.status, "APPEARANCE OF ACCUSSED")
+        self.assertEqual(case_info.court_name, "454-ADDL DISTRICT AND SESSIONS JUDGE")
+        self.assertEqual(case_info.first_hearing, "06th October 2023")
+        self.assertEqual(case_info.sub_stage, "WARRANT TO ACCUSED")
+
+    def test_parties_keep_line_breaks_as_spaces(self):
+        case_info = parse_case_info(self.html, "KARC010037582023")
+        self.assertEqual(case_info.petitioner, "1) Raichur West PS")
+        self.assertTrue(case_info.respondent.startswith("1) AMARAMMA W/O HANUMATHARAYA 2) Tarabayi"))
+
+    def test_acts_and_fir(self):
+        case_info = parse_case_info(self.html, "KARC010037582023")
+        self.assertEqual([act.to_dict() for act in case_info.acts], [
+            {'act': "INDIAN PENAL CODE", 'sections': "467, 468, 471, 420, R/W"},
+            {'act': "Scheduled Castes and the Scheduled Tribes (Prevention of Atrocities) Act",
+             'sections': "3(1)(4)"}
+        ])
+        self.assertEqual(case_info.fir.to_dict(),
+                         {'police_station': "RAICHUR WEST PS", 'fir_number': "0113", 'year': "2016"})
+
+    def test_hearing_history(self):
+        case_info = parse_case_info(self.html, "KARC010037582023")
+        self.assertEqual(len(case_info.history), 12)
+        self.assertEqual(case_info.history[0].to_dict(), {
+            'judge': "ADDL DISTRICT AND SESSIONS JUDGE", 'business_on_date': "06-10-2023",
+            'hearing_date': "18-01-2024", 'purpose': "APPEARANCE OF ACCUSSED"
+        })
+        self.assertEqual(case_info.listed_on[:2], ["06-10-2023", "18-01-2024"])
+        self.assertEqual(len(case_info.listed_on), 12)
+
+    def test_bytes_in_worker_process(self):
+        with ProcessPoolExecutor(max_workers=1) as executor:
+            result = executor.submit(parse_case_info_dict, self.html.encode('utf-8'), "KARC010037582023").result()
+        self.assertEqual(result, parse_case_info(self.html, "KARC010037582023").to_dict())
+
+    def test_empty_page(self):
+        case_info = parse_case_info("<html></html>", "KARC010037582023")
+        self.assertIsNone(case_info.case_type)
+        self.assertEqual(case_info.cnr, "KARC010037582023")
+        self.assertEqual(case_info.history, [])
+        self.assertIsNone(case_info.fir)
+        self.assertIsNone(parse_case_info("", "KARC010037582023").case_number)
+
+class TestParseCauseList(unittest.TestCase):
+    def setUp(self):
+        with open(config.BASE_DIR / "cause_list_page.html", encoding='utf-8') as f:
+            page = f.read()
+        rows = ''.join(
+            f"<tr><td>{i}</td><td>O.S./{i}/2024</td><td>Petitioner {i}</td><td>Respondent {i}</td><td>Adv. {i}</td></tr>"
+            for i in range(1, 4)
+        )
+        table = f"<table><tr><th>Sr No</th><th>Case</th><th>Petitioner</th><th>Respondent</th><th>Advocate</th></tr>{rows}</table>"
+        decoy = "<table><tr><td>a</td></tr><tr><td>x</td><td>y</td><td>z</td></tr></table>"
+        # A layout table ahead of the results must not be mistaken for the cause list
+        page = re.sub(r'(<body[^>]*>)', lambda m: m.group(1) + decoy, page, count=1)
+        self.html = page.replace('<div id="res_cause_list"></div>', f'<div id="res_cause_list">{table}</div>')
+
+    def test_entries_from_result_table(self):
+        cause_list = parse_cause_list(self.html, "Karnataka", "Bangalore", "City Civil Court", "03-11-2025", "Civil")
+        self.assertEqual(len(cause_list.entries), 3)
+        self.assertEqual(cause_list.entries[0].to_dict(), {
+            'serial_number': "1", 'case_number': "O.S./1/2024", 'case_type': None,
+            'petitioner': "Petitioner 1", 'respondent': "Respondent 1", 'advocate': "Adv. 1"
+        })
+
+    def test_no_results(self):
+        with open(config.BASE_DIR / "cause_list_page.html", encoding='utf-8') as f:
+            cause_list = parse_cause_list(f.read(), "Karnataka", "Bangalore", "City Civil Court", "03-11-2025", "Civil")
+        self.assertEqual(cause_list.entries, [])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,122 @@
+"""
+Unit tests for the cause list PDF parser
+"""
+import tempfile
+import unittest
+from pathlib import Path
+from src.pdf_parser import (iter_cause_list_entries, parse_cause_list_pdf, parse_cause_list_pdfs, metadata_from_filename,
+                            _header_columns)
+
+COLUMNS = (40, 90, 220, 460)  # Sr. No., Case Number, Party Name, Advocate
+
+def write_pdf(path: Path, pages):
+    """Write a minimal PDF; each page is a list of (x, y, text) placed in Helvetica 9pt"""
+    objects = ["<< /Type /Catalog /Pages 2 0 R >>", None,
+               "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for items in pages:
+        stream = "".join(
+            f"BT /F1 9 Tf {x} {y} Td ({text.replace('(', '[').replace(')', ']')}) Tj ET\n" for x, y, text in items
+        )
+        objects.append(f"<< /Length {len(stream)} >>\nstream\n{stream}endstream")
+        objects.append(f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+                       f"/Resources << /Font << /F1 3 0 R >> >> /Contents {len(objects)} 0 R >>")
+        kids.append(f"{len(objects)} 0 R")
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {len(kids)} >>"
+
+    out = "%PDF-1.4\n"
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += f"{number} 0 obj\n{body}\nendobj\n"
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n"
+    out += "".join(f"{offset:010d} 00000 n \n" for offset in offsets)
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n"
+    path.write_bytes(out.encode('latin-1'))
+
+def row(y, *cells):
+    return [(x, y, text) for x, text in zip(COLUMNS, cells) if text]
+
+HEADER = row(760, "Sr. No.", "Case Number", "Party Name", "Advocate")
+
+class TestPdfParser(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp.name) / "causelist_Karnataka_Bangalore_03112025_Civil.pdf"
+        write_pdf(self.path, [
+            [(200, 800, "CITY CIVIL COURT, BENGALURU - CAUSE LIST")] + HEADER +
+            row(740, "1", "O.S./1234/2021", "Ramesh Kumar Vs State of Karnataka", "S. N. Rao") +
+            row(720, "2", "O.S./77/2022", "Lakshmi Devi", "K. Iyer") +
+            row(708, None, None, "Vs") +
+            row(696, None, None, "Bruhat Bengaluru Mahanagara Palike", "P. Shetty") +
+            row(680, "3", "M.A./5/2023", "Suresh", "M. Gowda"),
+            # The third entry's respondent runs onto the next page, under a repeated header
+            HEADER +
+            row(740, None, None, "versus Karnataka Bank Ltd") +
+            row(720, "4", "E.P./9/2020", "Anil Vs Sunil", None),
+        ])
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_entries_across_pages(self):
+        entries = [entry.to_dict() for entry in iter_cause_list_entries(self.path)]
+        self.assertEqual([e['serial_number'] for e in entries], ["1", "2", "3", "4"])
+        self.assertEqual(entries[0], {
+            'serial_number': "1", 'case_number': "O.S./1234/2021", 'case_type': None,
+            'petitioner': "Ramesh Kumar", 'respondent': "State of Karnataka", 'advocate': "S. N. Rao"
+        })
+        self.assertEqual(entries[1]['petitioner'], "Lakshmi Devi")
+        self.assertEqual(entries[1]['respondent'], "Bruhat Bengaluru Mahanagara Palike")
+        self.assertEqual(entries[1]['advocate'], "K. Iyer P. Shetty")
+        self.assertEqual(entries[2]['respondent'], "Karnataka Bank Ltd")
+        self.assertIsNone(entries[3]['advocate'])
+
+    def test_matches_html_cause_list_shape(self):
+        cause_list = parse_cause_list_pdf(self.path, **metadata_from_filename(self.path))
+        self.assertEqual(cause_list['date'], "03-11-2025")
+        self.assertEqual(cause_list['state'], "Karnataka")
+        self.assertEqual(cause_list['list_type'], "Civil")
+        self.assertEqual(cause_list['total_cases'], 4)
+
+    def test_court_from_filename(self):
+        metadata = metadata_from_filename("causelist_Karnataka_Bangalore_03112025_Criminal_City Civil Court_Court 1.pdf")
+        self.assertEqual(metadata['court_complex'], "City Civil Court")
+        self.assertEqual(metadata['court_name'], "Court 1")
+        self.assertEqual(metadata['list_type'], "Criminal")
+        metadata = metadata_from_filename("causelist_Karnataka_Bangalore_03112025_Civil_Mayo Hall.pdf")
+        self.assertEqual(metadata['court_complex'], "Mayo Hall")
+        self.assertNotIn('court_name', metadata)
+        self.assertNotIn('court_complex', metadata_from_filename("causelist_Karnataka_Bangalore_03112025_Civil.pdf"))
+        self.assertEqual(metadata_from_filename("causelist_Karnataka_Bangalore_03112025_Civil_a_b_extra.pdf"), {})
+
+    def test_batch_on_process_pool(self):
+        broken = Path(self.tmp.name) / "broken.pdf"
+        broken.write_bytes(b"not a pdf")
+        results = dict(parse_cause_list_pdfs([self.path, broken], workers=2))
+        self.assertEqual(results[self.path]['total_cases'], 4)
+        self.assertIsNone(results[broken])
+
+def fields(*cells):
+    header = _header_columns([(x * 100.0, text) for x, text in enumerate(cells)])
+    return header and [field for _, field in header]
+
+class TestHeaderColumns(unittest.TestCase):
+    def test_advocate_columns_are_not_parties(self):
+        self.assertEqual(fields("Sr. No.", "Case Number", "Petitioner", "Petitioner Advocate",
+                                "Respondent", "Respondent Advocate"),
+                         ['serial_number', 'case_number', 'petitioner', 'advocate', 'respondent', 'advocate'])
+        self.assertEqual(fields("S.No", "Case No.", "Name of Parties", "Name of Advocate"),
+                         ['serial_number', 'case_number', 'party', 'advocate'])
+        self.assertEqual(fields("Sl No", "Case Details", "Appellant Vs Respondent", "Counsel for Appellant", "Stage"),
+                         ['serial_number', 'case_number', 'petitioner', 'advocate'])
+
+    def test_entry_rows_are_not_headers(self):
+        self.assertIsNone(fields("12", "Crl. Case 45/2024", "State Vs Accused Ramu", "K. Iyer"))
+        # A continuation row mentioning a case and the accused
+        self.assertIsNone(fields("Case transferred", "accused absent"))
+        self.assertIsNone(fields("Case called", "Petitioner absent", "Remarks: adjourned", "Next date", "S. N. Rao"))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+"""
+Unit tests for resource profiles
+"""
+import unittest
+from src.resource_profile import BLOCKED_ERROR, BlockedRequests, blocked_patterns, is_blocked
+
+BASE = "https://services.ecourts.gov.in/ecourtindia_v6"
+
+class FakePage:
+    def __init__(self):
+        self.handlers = {}
+
+    def on(self, event, handler):
+        self.handlers[event] = handler
+
+class FakeRequest:
+    def __init__(self, resource_type, failure):
+        self.resource_type = resource_type
+        self.failure = failure
+
+class TestResourceProfile(unittest.TestCase):
+    def test_lean_keeps_what_the_flows_need(self):
+        for url in (f"{BASE}/vendor/securimage/securimage_show.php?0.42", f"{BASE}/js/jquery.min.js",
+                    f"{BASE}/?p=cause_list/submitCauseList", f"{BASE}/css/bootstrap.min.css"):
+            self.assertFalse(is_blocked(url, 'lean'), url)
+
+    def test_lean_blocks_fonts_images_and_trackers(self):
+        for url in (f"{BASE}/fonts/fa-solid-900.woff2?v=5", f"{BASE}/images/Emblem.PNG",
+                    "https://www.googletagmanager.com/gtag/js?id=G-1"):
+            self.assertTrue(is_blocked(url, 'lean'), url)
+
+    def test_matches_case_sensitively_like_chromium(self):
+        self.assertTrue(is_blocked(f"{BASE}/images/Emblem.PNG", 'lean'))
+        # Only all-lower and all-upper extensions are listed
+        self.assertFalse(is_blocked(f"{BASE}/images/Emblem.Png", 'lean'))
+
+    def test_extension_must_end_the_path(self):
+        for url in (f"{BASE}/?p=casestatus/viewBusiness&img=seal.png&app_token=1", f"{BASE}/js/app.pngfix.js",
+                    f"{BASE}/js/fonts.woff.loader.js"):
+            self.assertFalse(is_blocked(url, 'lean'), url)
+        self.assertTrue(is_blocked(f"{BASE}/images/logo.svg?v=3", 'lean'))
+
+    def test_minimal_also_blocks_css(self):
+        self.assertTrue(is_blocked(f"{BASE}/css/bootstrap.min.css?v=2", 'minimal'))
+        self.assertFalse(is_blocked(f"{BASE}/js/main.js", 'minimal'))
+
+    def test_off_and_unknown_profiles(self):
+        self.assertEqual(blocked_patterns('off'), ())
+        with self.assertRaises(ValueError):
+            blocked_patterns('everything')
+
+    def test_counts_blocked_requests_only(self):
+        page = FakePage()
+        blocked = BlockedRequests()
+        blocked.watch(page)
+        page.handlers["requestfailed"](FakeRequest("font", BLOCKED_ERROR))
+        page.handlers["requestfailed"](FakeRequest("image", BLOCKED_ERROR))
+        page.handlers["requestfailed"](FakeRequest("image", BLOCKED_ERROR))
+        page.handlers["requestfailed"](FakeRequest("xhr", "net::ERR_CONNECTION_RESET"))
+        self.assertEqual(blocked.summary(), {'blocked': 3, 'by_type': {'font': 1, 'image': 2}})
+
+if __name__ == '__main__':
+    unittest.main()
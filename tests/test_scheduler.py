@@ -0,0 +1,180 @@
+"""
+Unit tests for the request scheduler
+"""
+import asyncio
+import threading
+import time
+import unittest
+from unittest import mock
+from src.models import CaptchaResult
+from src.scheduler import RequestScheduler, host_of
+from src.scraper import eCourtsScraper
+from src.utils import setup_logger
+
+URL = "https://services.ecourts.gov.in/ecourtindia_v6/"
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+class TestRequestScheduler(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.scheduler = RequestScheduler(delay=0.5, burst=2, concurrency=2, backoff_base=2.0,
+                                          backoff_max=10.0, slow_threshold=5.0, clock=self.clock)
+
+    def test_burst_then_paced(self):
+        self.assertEqual([self.scheduler.reserve(URL) for _ in range(4)], [0.0, 0.0, 0.5, 1.0])
+        # Idle time refills the bucket, but never past the burst
+        self.clock.now = 100.0
+        self.assertEqual([self.scheduler.reserve(URL) for _ in range(3)], [0.0, 0.0, 0.5])
+
+    def test_hosts_are_paced_separately(self):
+        for _ in range(2):
+            self.scheduler.reserve(URL)
+        self.assertEqual(self.scheduler.reserve("https://example.org/captcha"), 0.0)
+        self.assertEqual(host_of(URL), "services.ecourts.gov.in")
+
+    def test_zero_delay_disables_pacing(self):
+        scheduler = RequestScheduler(delay=0, burst=1, clock=self.clock)
+        self.assertEqual([scheduler.reserve(URL) for _ in range(5)], [0.0] * 5)
+
+    def test_backoff_grows_and_resets(self):
+        with mock.patch('src.scheduler.random.uniform', side_effect=lambda low, high: high):
+            self.scheduler.record(URL, ok=False)
+            self.assertEqual(self.scheduler.reserve(URL), 2.0)
+            self.scheduler.record(URL, ok=False)
+            self.scheduler.record(URL, ok=False)
+            self.assertEqual(self.scheduler.reserve(URL), 8.0)
+            for _ in range(3):
+                self.scheduler.record(URL, ok=False)
+            self.assertEqual(self.scheduler.reserve(URL), 10.0)
+
+            self.clock.now = 100.0
+            self.scheduler.record(URL, ok=True, elapsed=1.0)
+            self.scheduler.record(URL, ok=False)
+            self.assertEqual(self.scheduler.reserve(URL), 2.0)
+
+    def test_slow_response_backs_off(self):
+        self.scheduler.record(URL, ok=True, elapsed=6.0)
+        self.assertGreaterEqual(self.scheduler.reserve(URL), 1.0)
+        self.assertEqual(self.scheduler.stats()[host_of(URL)]['errors'], 1)
+
+    def test_slow_threshold_per_request(self):
+        with self.scheduler.request(URL, slow_threshold=10.0):
+            self.clock.now += 6.0
+        self.assertEqual(self.scheduler.stats()[host_of(URL)]['errors'], 0)
+        with self.scheduler.request(URL, slow_threshold=10.0):
+            self.clock.now += 11.0
+        self.assertEqual(self.scheduler.stats()[host_of(URL)]['errors'], 1)
+
+    def test_request_records_status_and_exceptions(self):
+        scheduler = RequestScheduler(delay=0, backoff_base=0.01, clock=self.clock)
+        with scheduler.request(URL) as slot:
+            slot.status(200)
+        with scheduler.request(URL) as slot:
+            slot.status(503)
+        with self.assertRaises(RuntimeError):
+            with scheduler.request(URL):
+                raise RuntimeError("connection reset")
+        stats = scheduler.stats()[host_of(URL)]
+        self.assertEqual((stats['requests'], stats['errors']), (3, 2))
+
+    def test_concurrency_cap(self):
+        scheduler = RequestScheduler(delay=0, concurrency=2)
+        lock = threading.Lock()
+        active, peak = [0], [0]
+
+        def work():
+            with scheduler.request(URL):
+                with lock:
+                    active[0] += 1
+                    peak[0] = max(peak[0], active[0])
+                time.sleep(0.02)
+                with lock:
+                    active[0] -= 1
+
+        threads = [threading.Thread(target=work) for _ in range(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(peak[0], 2)
+
+    def test_pacing_does_not_hold_a_slot(self):
+        scheduler = RequestScheduler(delay=0.5, burst=1, concurrency=1)
+        slots = scheduler._host_state(URL).slots
+        free_while_paced = []
+
+        def sleep(seconds):
+            free_while_paced.append(slots.acquire(blocking=False))
+            slots.release()
+
+        with mock.patch('src.scheduler.time.sleep', sleep):
+            for _ in range(2):
+                with scheduler.request(URL):
+                    pass
+        self.assertEqual(free_while_paced, [True])
+
+    def test_async_request(self):
+        scheduler = RequestScheduler(delay=0, concurrency=1)
+        active, peak = [0], [0]
+
+        async def work():
+            async with scheduler.arequest(URL) as slot:
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+                await asyncio.sleep(0.01)
+                active[0] -= 1
+                slot.status(200)
+
+        async def run():
+            await asyncio.gather(*(work() for _ in range(3)))
+
+        asyncio.run(run())
+        self.assertEqual(peak[0], 1)
+        self.assertEqual(scheduler.stats()[host_of(URL)]['requests'], 3)
+
+    def test_async_request_across_event_loops(self):
+        scheduler = RequestScheduler(delay=0, concurrency=1)
+
+        async def work():
+            async with scheduler.arequest(URL):
+                await asyncio.sleep(0.01)
+
+        async def run():
+            # Contended, so the second caller waits on the semaphore
+            await asyncio.gather(work(), work())
+
+        asyncio.run(run())
+        asyncio.run(run())
+        self.assertEqual(scheduler.stats()[host_of(URL)]['requests'], 4)
+
+class UnreadableCaptchaPage:
+    """Page whose CAPTCHA never reads and whose refresh times out"""
+    url = URL
+
+    def wait_for_selector(self, selector, timeout=None):
+        return mock.Mock(screenshot=lambda: b"png")
+
+    def query_selector(self, selector):
+        return mock.Mock()
+
+    def expect_response(self, predicate, timeout=None):
+        raise TimeoutError("CAPTCHA refresh timed out")
+
+class TestCaptchaRetryBackoff(unittest.TestCase):
+    def test_failed_refresh_is_recorded_once(self):
+        scraper = eCourtsScraper.__new__(eCourtsScraper)
+        scraper.logger = setup_logger("test")
+        scraper.scheduler = RequestScheduler(delay=0, backoff_base=0.001, backoff_max=0.001)
+        scraper.captcha_solver = mock.Mock(solve=lambda image: CaptchaResult())
+        scraper._captcha_watchers = {}
+        self.assertIsNone(scraper._solve_captcha_with_retry(UnreadableCaptchaPage(), max_retries=2))
+        self.assertEqual(scraper.scheduler.stats()[host_of(URL)], {'requests': 2, 'errors': 2, 'waited': 0.0})
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,7 +1,12 @@
 """
 Unit tests for eCourts Scraper
 """
+import tempfile
+import threading
 import unittest
+from pathlib import Path
+from unittest import mock
+from src.page_pool import PagePool, launch_chromium
 from src.scraper import eCourtsScraper
 from src.captcha_solver import CaptchaSolver
 from src.utils import setup_logger, format_date
@@ -22,6 +27,10 @@ class TestUtils(unittest.TestCase):
         logger = setup_logger("test")
         self.assertIsNotNone(logger)
 
+    def test_logger_setup_is_idempotent(self):
+        handlers = list(setup_logger("test").handlers)
+        self.assertEqual(setup_logger("test").handlers, handlers)
+
 class TestScraper(unittest.TestCase):
     def setUp(self):
         self.scraper = eCourtsScraper(headless=True)
@@ -33,5 +42,152 @@ class TestScraper(unittest.TestCase):
         self.assertIsNotNone(self.scraper)
         self.assertIsNotNone(self.scraper.page)
 
+class FakePlaywrightPage:
+    def __init__(self, context=None):
+        self.context = context
+        self.closed = False
+
+    def set_default_timeout(self, timeout):
+        pass
+
+    def is_closed(self):
+        return self.closed
+
+class FakeContext:
+    def __init__(self):
+        self.closed = False
+
+    def new_page(self):
+        if self.closed:
+            raise RuntimeError("Target page, context or browser has been closed")
+        return FakePlaywrightPage(self)
+
+    def close(self):
+        self.closed = True
+
+class FakeBrowser:
+    def new_context(self, **options):
+        return FakeContext()
+
+    def close(self):
+        pass
+
+class FakePlaywright:
+    """Stands in for sync_playwright() in each pool worker, attaching to no real browser"""
+
+    def __init__(self):
+        self.chromium = mock.Mock(connect_over_cdp=lambda endpoint: FakeBrowser())
+
+    def start(self):
+        return self
+
+    def stop(self):
+        pass
+
+class TestPagePool(unittest.TestCase):
+    def setUp(self):
+        patcher = mock.patch('src.page_pool.sync_playwright', FakePlaywright)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.prepared = []
+        self.pool = PagePool(size=2, on_page=self.prepared.append, endpoint="http://127.0.0.1:9")
+        self.addCleanup(self.pool.close)
+
+    def test_pool_runs_on_free_pages(self):
+        self.assertIsNone(self.pool.page)
+        self.assertEqual(len(self.prepared), 2)
+        # Each job waits for the other, so they only finish if they run on both pages at once
+        both_running = threading.Barrier(2)
+
+        def job(page):
+            both_running.wait(timeout=5)
+            return page
+
+        futures = [self.pool.submit(job) for _ in range(4)]
+        pages = [future.result(timeout=10) for future in futures]
+        self.assertEqual({id(page) for page in pages}, {id(page) for page in self.prepared})
+
+    def test_closed_page_is_replaced(self):
+        def crash(page):
+            page.closed = True
+
+        self.pool.run(crash)
+        self.pool.run(crash)
+        # Pages are replaced after the job returns; closing waits for the workers to get there
+        self.pool.close()
+        self.assertEqual(len(self.prepared), 4)
+
+    def test_dead_context_is_rebuilt(self):
+        def crash(page):
+            page.closed = page.context.closed = True
+
+        self.pool.run(crash)
+        self.pool.close()
+        self.assertEqual(len(self.prepared), 3)
+
+    def test_pool_fails_jobs_once_no_page_can_be_replaced(self):
+        def crash(page):
+            page.closed = page.context.closed = True
+
+        with mock.patch.object(FakeBrowser, 'new_context', side_effect=RuntimeError("browser has been closed")):
+            self.pool.run(crash)
+            self.pool.run(crash)
+            for worker in self.pool._workers:
+                worker.join(timeout=5)
+        with self.assertRaises(RuntimeError):
+            self.pool.run(crash)
+
+class TestLaunchChromium(unittest.TestCase):
+    def launch(self, **kwargs):
+        with mock.patch('src.page_pool.subprocess.Popen') as popen:
+            launch_chromium(9222, "/tmp/profile", headless=True, executable="chrome", **kwargs)
+        return popen.call_args[0][0]
+
+    def test_sandbox_stays_on_by_default(self):
+        self.assertNotIn('--no-sandbox', self.launch())
+
+    def test_sandbox_can_be_disabled(self):
+        self.assertIn('--no-sandbox', self.launch(no_sandbox=True))
+
+class InlinePool:
+    """Runs pool jobs on the calling thread, finishing them in reverse order"""
+
+    def imap(self, func, items):
+        items = list(items)
+        for item in reversed(items):
+            yield item, func(None, item)
+
+class TestDownloadAllCauseLists(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        # The fan-out only needs the pool and the court list, not a browser
+        self.scraper = eCourtsScraper.__new__(eCourtsScraper)
+        self.scraper.logger = setup_logger("test")
+        self.scraper.pool = InlinePool()
+        self.scraper.court_options = lambda state, district, court_complex, refresh=False: [
+            {'code': '2^5', 'name': 'Court 1'}, {'code': '2^6', 'name': 'Court 2'}]
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_every_court_and_list_type(self):
+        def download(page, state, district, court_complex, court_name, date, list_type):
+            if court_name == 'Court 2' and list_type == 'Criminal':
+                raise RuntimeError("page crashed")
+            return f"{court_name}-{list_type}.pdf"
+
+        self.scraper._download_cause_list = download
+        with mock.patch('src.scraper.save_json', lambda data, name: Path(self.tmp.name) / name):
+            manifest = self.scraper.download_all_cause_lists("Karnataka", "Bangalore", "City Civil Court",
+                                                             "03-11-2025")
+
+        self.assertEqual([(r['court'], r['list_type'], r['status']) for r in manifest['results']], [
+            ('Court 1', 'Civil', 'downloaded'), ('Court 1', 'Criminal', 'downloaded'),
+            ('Court 2', 'Civil', 'downloaded'), ('Court 2', 'Criminal', 'failed'),
+        ])
+        self.assertEqual(manifest['results'][3]['error'], "page crashed")
+        self.assertEqual((manifest['courts'], manifest['downloaded'], manifest['failed']), (2, 3, 1))
+        self.assertTrue(manifest['manifest'].endswith("manifest_Karnataka_Bangalore_City Civil Court_03112025.json"))
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,180 @@
+"""
+Unit tests for coalescing identical lookups in flight
+"""
+import asyncio
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from src.async_scraper import AsyncECourtsScraper
+from src.scraper import eCourtsScraper
+from src.single_flight import AsyncSingleFlight, SingleFlight, cause_list_key, cnr_key
+from src.utils import get_today_date, setup_logger
+
+class TestKeys(unittest.TestCase):
+    def test_cnr_ignores_case_and_spaces(self):
+        self.assertEqual(cnr_key(' mhau01 0012342025'), cnr_key('MHAU010012342025'))
+
+    def test_cause_list_normalizes_names_and_dates(self):
+        self.assertEqual(cause_list_key('Maharashtra', 'Pune', 'Pune  District Court', None, '2025-10-20', 'civil'),
+                         cause_list_key(' maharashtra', 'PUNE', 'pune district court', '', '20-10-2025', 'Civil'))
+        self.assertEqual(cause_list_key('A', 'B', 'C'), cause_list_key('A', 'B', 'C', date=get_today_date()))
+        self.assertNotEqual(cause_list_key('A', 'B', 'C', list_type='Civil'),
+                            cause_list_key('A', 'B', 'C', list_type='Criminal'))
+
+class TestSingleFlight(unittest.TestCase):
+    def setUp(self):
+        self.flights = SingleFlight()
+        self.started = threading.Event()
+        self.release = threading.Event()
+        self.calls = 0
+
+    def scrape(self, report, result='case', error=None):
+        self.calls += 1
+        report('navigating')
+        self.started.set()
+        self.release.wait(5)
+        report('parsing')
+        if error:
+            raise error
+        return result
+
+    def run_together(self, count, **kwargs):
+        """Start one leader, let count - 1 callers join it, then let the scrape finish"""
+        stages = [[] for _ in range(count)]
+
+        def call(index):
+            try:
+                return self.flights.do('key', lambda report: self.scrape(report, **kwargs), stages[index].append)
+            except Exception as e:
+                return e
+
+        with ThreadPoolExecutor(max_workers=count) as executor:
+            futures = [executor.submit(call, 0)]
+            self.started.wait(5)
+            futures += [executor.submit(call, index) for index in range(1, count)]
+            while self.flights.stats()['shared'] < count - 1:
+                time.sleep(0.005)
+            self.release.set()
+            return [future.result() for future in futures], stages
+
+    def test_callers_share_one_scrape(self):
+        results, stages = self.run_together(4)
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(results, ['case'] * 4)
+        self.assertEqual(stages[0], ['navigating', 'parsing'])
+        # Callers that joined late see the stages from then on
+        self.assertTrue(all(stage[-1:] == ['parsing'] for stage in stages))
+        self.assertEqual(self.flights.stats(), {'leaders': 1, 'shared': 3, 'in_flight': 0})
+
+    def test_error_reaches_every_caller(self):
+        error = RuntimeError("CAPTCHA failed")
+        results, _ = self.run_together(3, error=error)
+        self.assertEqual(results, [error] * 3)
+        self.assertEqual(self.flights.stats()['in_flight'], 0)
+
+    def test_later_calls_run_again(self):
+        self.release.set()
+        self.flights.do('key', self.scrape)
+        self.flights.do('key', self.scrape)
+        self.assertEqual(self.calls, 2)
+
+    def test_broken_progress_callback_is_contained(self):
+        self.release.set()
+
+        def broken(stage):
+            raise ValueError("client gone")
+
+        self.assertEqual(self.flights.do('key', self.scrape, broken), 'case')
+
+class TestAsyncSingleFlight(unittest.TestCase):
+    def test_shares_result_and_survives_cancelled_caller(self):
+        async def run():
+            flights = AsyncSingleFlight()
+            calls = []
+
+            async def scrape():
+                calls.append(1)
+                await asyncio.sleep(0.05)
+                return 'case'
+
+            first = asyncio.ensure_future(flights.do('key', scrape))
+            await asyncio.sleep(0)
+            second = asyncio.ensure_future(flights.do('key', scrape))
+            await asyncio.sleep(0)
+            first.cancel()
+            self.assertEqual(await second, 'case')
+            self.assertEqual(len(calls), 1)
+            self.assertEqual(flights.stats(), {'leaders': 1, 'shared': 1, 'in_flight': 0})
+
+        asyncio.run(run())
+
+    def test_error_reaches_every_caller(self):
+        async def run():
+            flights = AsyncSingleFlight()
+
+            async def scrape():
+                await asyncio.sleep(0.01)
+                raise RuntimeError("CAPTCHA failed")
+
+            results = await asyncio.gather(flights.do('key', scrape), flights.do('key', scrape),
+                                           return_exceptions=True)
+            self.assertEqual([str(result) for result in results], ["CAPTCHA failed"] * 2)
+
+        asyncio.run(run())
+
+class InlinePool:
+    """Runs each job on the calling thread with a page of its own"""
+
+    def run(self, func, *args):
+        return func(object(), *args)
+
+class TestScraperCoalescing(unittest.TestCase):
+    def setUp(self):
+        self.scraper = eCourtsScraper.__new__(eCourtsScraper)
+        self.scraper.logger = setup_logger("test")
+        self.scraper.pool = InlinePool()
+        self.scraper.cache = None
+        self.scraper.flights = SingleFlight()
+        self.scraper._progress = {}
+        self.searched = []
+        self.release = threading.Event()
+
+        def search(page, cnr):
+            self.searched.append(cnr)
+            self.release.wait(5)
+            return {'cnr': cnr}
+
+        self.scraper._search_by_cnr = search
+
+    def test_same_cnr_searched_once(self):
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            futures = [executor.submit(self.scraper.search_by_cnr, cnr) for cnr in ('MHAU01', 'mhau01', 'DLHC02')]
+            while self.scraper.flights.stats()['in_flight'] < 2 or self.scraper.flights.stats()['shared'] < 1:
+                time.sleep(0.005)
+            self.release.set()
+            results = [future.result() for future in futures]
+        self.assertEqual(sorted(self.searched), ['DLHC02', 'MHAU01'])
+        self.assertEqual(results[0], results[1])
+
+    def test_async_cause_list_downloaded_once(self):
+        scraper = AsyncECourtsScraper.__new__(AsyncECourtsScraper)
+        scraper.flights = AsyncSingleFlight()
+        downloads = []
+
+        async def on_page(func, *args):
+            downloads.append(args)
+            await asyncio.sleep(0.01)
+            return 'output/pdf/list.pdf'
+
+        scraper._on_page = on_page
+
+        async def run():
+            return await asyncio.gather(scraper.download_cause_list('Delhi', 'New Delhi', 'Patiala House'),
+                                        scraper.download_cause_list('delhi', 'new delhi', 'patiala house'))
+
+        self.assertEqual(asyncio.run(run()), ['output/pdf/list.pdf'] * 2)
+        self.assertEqual(len(downloads), 1)
+
+if __name__ == '__main__':
+    unittest.main()
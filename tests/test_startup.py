@@ -0,0 +1,40 @@
+"""
+Unit tests for CLI startup: cheap invocations must not load the scraping stack or touch the disk
+"""
+import subprocess
+import sys
+import unittest
+from benchmarks.startup import COMMANDS, ROOT, heavy_imports, import_times
+
+class TestStartup(unittest.TestCase):
+    def test_help_skips_heavy_imports(self):
+        times = import_times(COMMANDS['cli --help'])
+        self.assertIn('config', times)
+        self.assertEqual(heavy_imports(times), [])
+
+    def test_argument_errors_skip_heavy_imports(self):
+        self.assertEqual(heavy_imports(import_times(['cli.py', '--type', 'Unknown'])), [])
+
+    def test_light_modules_skip_scraper(self):
+        times = import_times(['-c', 'import src.utils, src.single_flight'])
+        self.assertNotIn('src.scraper', times)
+        self.assertEqual(heavy_imports(times), [])
+
+    def test_config_import_creates_nothing(self):
+        code = ("import pathlib\n"
+                "calls = []\n"
+                "pathlib.Path.mkdir = lambda self, *args, **kwargs: calls.append(self)\n"
+                "import config\n"
+                "print(len(calls))")
+        completed = subprocess.run([sys.executable, '-c', code], cwd=ROOT, capture_output=True, text=True)
+        self.assertEqual(completed.stdout.strip(), '0')
+
+    def test_package_exports_resolve_lazily(self):
+        import src
+        from src.scraper import eCourtsScraper
+        self.assertIs(src.eCourtsScraper, eCourtsScraper)
+        with self.assertRaises(AttributeError):
+            src.missing
+
+if __name__ == '__main__':
+    unittest.main()
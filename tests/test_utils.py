@@ -0,0 +1,94 @@
+"""
+Unit tests for date helpers
+"""
+import tempfile
+import unittest
+from datetime import date, datetime
+from pathlib import Path
+from src.utils import (parse_date, parse_date_spec, normalize_dates, listing_verdicts, cause_list_filename,
+                       cause_list_manifest, cause_list_manifest_filename, save_json, save_pdf)
+
+class TestParseDate(unittest.TestCase):
+    def test_portal_formats(self):
+        for text in ('10th November 2025', '10-11-2025', '10/11/2025', '2025-11-10'):
+            self.assertEqual(parse_date(text), date(2025, 11, 10))
+
+    def test_unparseable(self):
+        self.assertIsNone(parse_date('Not available'))
+        self.assertIsNone(parse_date(''))
+
+    def test_strict(self):
+        # Stray words are not skipped, and a missing day, month or year is not filled in from today
+        for text in ('Listed on 10-11-2025', 'November', '5', 'November 2025', '10 November'):
+            self.assertIsNone(parse_date(text), text)
+
+class TestDateSpecs(unittest.TestCase):
+    def test_list_and_range(self):
+        self.assertEqual(parse_date_spec("03-11-2025, 05-11-2025..07-11-2025"),
+                         [date(2025, 11, 3), date(2025, 11, 5), date(2025, 11, 6), date(2025, 11, 7)])
+
+    def test_invalid_specs(self):
+        for spec in ("someday", "07-11-2025..03-11-2025", "03-11-2025..later"):
+            with self.assertRaises(ValueError):
+                parse_date_spec(spec)
+
+    def test_ranges_are_capped(self):
+        self.assertEqual(len(parse_date_spec("01-01-2025..31-12-2025", max_dates=365)), 365)
+        with self.assertRaises(ValueError):
+            parse_date_spec("01-01-1925..31-12-2025")
+        with self.assertRaises(ValueError):
+            normalize_dates(["01-11-2025..05-11-2025", "10-11-2025..14-11-2025"], max_dates=9)
+
+    def test_normalize_merges_and_sorts(self):
+        self.assertEqual(normalize_dates(["04-11-2025", date(2025, 11, 3), "03-11-2025..04-11-2025"]),
+                         [date(2025, 11, 3), date(2025, 11, 4)])
+
+class TestListingVerdicts(unittest.TestCase):
+    def test_compares_normalized_dates(self):
+        case_info = {'next_hearing': '10th November 2025', 'listed_on': []}
+        verdicts = listing_verdicts(case_info, parse_date_spec("09-11-2025..11-11-2025"))
+        self.assertEqual(verdicts, [
+            {'date': '09-11-2025', 'is_listed': False},
+            {'date': '10-11-2025', 'is_listed': True},
+            {'date': '11-11-2025', 'is_listed': False},
+        ])
+
+    def test_known_listings_count(self):
+        case_info = {'next_hearing': None, 'listed_on': ['03-11-2025']}
+        self.assertTrue(listing_verdicts(case_info, [date(2025, 11, 3)])[0]['is_listed'])
+
+class TestCauseListNames(unittest.TestCase):
+    def test_court_keeps_files_apart(self):
+        self.assertEqual(cause_list_filename("Karnataka", "Bangalore", "03-11-2025", "Civil", "pdf"),
+                         "causelist_Karnataka_Bangalore_03112025_Civil.pdf")
+        self.assertEqual(cause_list_filename("Karnataka", "Bangalore", "03-11-2025", "Civil", "pdf",
+                                             "City Civil Court", "Court_1/Hall 2"),
+                         "causelist_Karnataka_Bangalore_03112025_Civil_City Civil Court_Court-1-Hall 2.pdf")
+        # Without a court the complex still keeps complexes of one district apart
+        self.assertEqual(cause_list_filename("Karnataka", "Bangalore", "03-11-2025", "Civil", "json",
+                                             "Mayo Hall", None),
+                         "causelist_Karnataka_Bangalore_03112025_Civil_Mayo Hall.json")
+
+    def test_manifest(self):
+        results = [
+            {'court': "Court 1", 'court_code': "2^5", 'list_type': "Civil", 'file': "a.pdf"},
+            {'court': "Court 1", 'court_code': "2^5", 'list_type': "Criminal", 'file': None},
+            {'court': "Court 2", 'court_code': "2^6", 'list_type': "Civil", 'file': "b.json"},
+        ]
+        manifest = cause_list_manifest("Karnataka", "Bangalore", "City Civil Court", "03-11-2025",
+                                       ("Civil", "Criminal"), datetime(2025, 11, 3, 6, 0), results)
+        self.assertEqual((manifest['courts'], manifest['downloaded'], manifest['failed']), (2, 2, 1))
+        self.assertEqual(manifest['started_at'], "2025-11-03T06:00:00")
+        self.assertFalse(cause_list_manifest_filename("Karnataka", "Bangalore", "City Civil Court",
+                                                      "03-11-2025").startswith("causelist_"))
+
+class TestSaveFiles(unittest.TestCase):
+    def test_creates_missing_directories(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            json_path = save_json({'a': 1}, "a.json", Path(tmp) / "json")
+            pdf_path = save_pdf(b"%PDF", "a.pdf", Path(tmp) / "pdfs")
+            self.assertEqual(json_path.read_text(encoding='utf-8').strip(), '{\n  "a": 1\n}')
+            self.assertEqual(pdf_path.read_bytes(), b"%PDF")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,101 +1,195 @@
 """
 Flask Web Application for eCourts Scraper
 """
-from flask import Flask, render_template, request, jsonify, send_file
+from flask import Flask, Response, render_template, request, jsonify, send_file
+from concurrent.futures import TimeoutError as JobTimeout
+from typing import Dict, Tuple
+import atexit
+import json
 import os
 import sys
+import threading
 from pathlib import Path
 
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from src.scraper import eCourtsScraper
-from src.utils import get_today_date, get_tomorrow_date
+from src.browser_worker import BrowserWorker
+from src.cache import CaseCache
+from src.cause_list_index import CauseListIndex
+from src.jobs import JobManager
+from src.court_hierarchy import CourtHierarchy
+from src.utils import get_today_date, get_tomorrow_date, normalize_dates
 import config
 
 app = Flask(__name__)
 
-# Store active scraper instance
-scraper = None
+# One warm browser for the life of the server; handlers queue lookups on it
+worker = None
+jobs = None
+cause_list_index = None
+case_cache = None
+court_hierarchy = None
+worker_lock = threading.Lock()
 
-def get_scraper():
-    global scraper
-    if scraper is None:
-        scraper = eCourtsScraper(headless=True)
-    return scraper
+def get_worker() -> BrowserWorker:
+    global worker
+    with worker_lock:
+        if worker is None:
+            worker = BrowserWorker()
+        return worker
+
+def get_jobs() -> JobManager:
+    global jobs
+    browser = get_worker()
+    with worker_lock:
+        if jobs is None:
+            jobs = JobManager(browser)
+        return jobs
+
+def get_cause_list_index() -> CauseListIndex:
+    """Search index, brought up to date with the saved cause lists once; the scraper indexes each list it saves"""
+    global cause_list_index
+    with worker_lock:
+        if cause_list_index is None:
+            cause_list_index = CauseListIndex()
+            cause_list_index.update()
+        return cause_list_index
+
+def get_case_cache() -> CaseCache:
+    global case_cache
+    with worker_lock:
+        if case_cache is None:
+            case_cache = CaseCache()
+        return case_cache
+
+def get_court_hierarchy() -> CourtHierarchy:
+    """Court hierarchy cache, re-read only when the scraper has saved new options to it"""
+    global court_hierarchy
+    with worker_lock:
+        if court_hierarchy is None:
+            court_hierarchy = CourtHierarchy()
+    court_hierarchy.reload_if_changed()
+    return court_hierarchy
+
+@atexit.register
+def shutdown_worker():
+    global worker, jobs
+    with worker_lock:
+        if worker:
+            worker.close()
+            worker = None
+            jobs = None
+
+def job_timeout_response():
+    return jsonify({'error': 'The lookup is taking too long; try again shortly'}), 504
 
 @app.route('/')
 def index():
     return render_template('index.html')
 
+def search_cnr_call(data: Dict) -> Tuple[str, Dict, str]:
+    """Scraper method, arguments and not-found error for a CNR search request"""
+    cnr = data.get('cnr')
+    if not cnr:
+        raise ValueError('CNR number is required')
+    return 'search_by_cnr', {'cnr': cnr, 'refresh': bool(data.get('refresh'))}, 'Case not found'
+
+def check_listing_call(data: Dict) -> Tuple[str, Dict, str]:
+    """Scraper method, arguments and not-found error for a listing check request"""
+    cnr = data.get('cnr')
+    check_type = data.get('type', 'today')  # 'today' or 'tomorrow'
+    # A list of dates and/or 'start..end' ranges, answered from one case fetch
+    dates = data.get('dates')
+
+    if not cnr:
+        raise ValueError('CNR number is required')
+
+    kwargs = {'cnr': cnr, 'refresh': bool(data.get('refresh'))}
+    if dates:
+        if isinstance(dates, str):
+            dates = [dates]
+        if not isinstance(dates, list) or not all(isinstance(day, str) for day in dates):
+            raise ValueError('dates must be a date string or a list of them')
+        normalize_dates(dates)
+        return 'check_case_listed_on_dates', {**kwargs, 'dates': dates}, 'Could not check listing'
+    if check_type == 'today':
+        return 'check_case_today', kwargs, 'Could not check listing'
+    return 'check_case_tomorrow', kwargs, 'Could not check listing'
+
+def download_causelist_call(data: Dict) -> Tuple[str, Dict, str]:
+    """Scraper method, arguments and not-found error for a cause list download request"""
+    state = data.get('state')
+    district = data.get('district')
+    court_complex = data.get('court_complex')
+
+    if not all([state, district, court_complex]):
+        raise ValueError('State, district, and court complex are required')
+
+    return 'download_cause_list', {
+        'state': state,
+        'district': district,
+        'court_complex': court_complex,
+        'court_name': data.get('court_name'),
+        'date': data.get('date') or get_today_date(),
+        'list_type': data.get('list_type', 'Civil')
+    }, 'Failed to download cause list'
+
+JOB_TYPES = {
+    'search_cnr': search_cnr_call,
+    'check_listing': check_listing_call,
+    'download_causelist': download_causelist_call,
+}
+
 @app.route('/search_cnr', methods=['POST'])
 def search_cnr():
     try:
-        data = request.json
-        cnr = data.get('cnr')
-
-        if not cnr:
-            return jsonify({'error': 'CNR number is required'}), 400
+        method, kwargs, failure = search_cnr_call(request.json or {})
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
 
-        s = get_scraper()
-        result = s.search_by_cnr(cnr)
+    try:
+        result = get_worker().call(method, **kwargs)
 
         if result:
             return jsonify({'success': True, 'data': result})
         else:
-            return jsonify({'error': 'Case not found'}), 404
+            return jsonify({'error': failure}), 404
 
+    except JobTimeout:
+        return job_timeout_response()
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 @app.route('/check_listing', methods=['POST'])
 def check_listing():
     try:
-        data = request.json
-        cnr = data.get('cnr')
-        check_type = data.get('type', 'today')  # 'today' or 'tomorrow'
-
-        if not cnr:
-            return jsonify({'error': 'CNR number is required'}), 400
-
-        s = get_scraper()
+        method, kwargs, failure = check_listing_call(request.json or {})
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
 
-        if check_type == 'today':
-            result = s.check_case_today(cnr)
-        else:
-            result = s.check_case_tomorrow(cnr)
+    try:
+        result = get_worker().call(method, **kwargs)
 
         if result:
             return jsonify({'success': True, 'data': result})
         else:
-            return jsonify({'error': 'Could not check listing'}), 404
+            return jsonify({'error': failure}), 404
 
+    except JobTimeout:
+        return job_timeout_response()
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 @app.route('/download_causelist', methods=['POST'])
 def download_causelist():
     try:
-        data = request.json
-        state = data.get('state')
-        district = data.get('district')
-        court_complex = data.get('court_complex')
-        court_name = data.get('court_name')
-        date = data.get('date') or get_today_date()
-        list_type = data.get('list_type', 'Civil')
-
-        if not all([state, district, court_complex]):
-            return jsonify({'error': 'State, district, and court complex are required'}), 400
-
-        s = get_scraper()
-        result = s.download_cause_list(
-            state=state,
-            district=district,
-            court_complex=court_complex,
-            court_name=court_name,
-            date=date,
-            list_type=list_type
-        )
+        method, kwargs, failure = download_causelist_call(request.json or {})
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    try:
+        result = get_worker().call(method, **kwargs)
 
         if result:
             return jsonify({
@@ -104,32 +198,168 @@ def download_causelist():
                 'file': result
             })
         else:
-            return jsonify({'error': 'Failed to download cause list'}), 500
+            return jsonify({'error': failure}), 500
 
+    except JobTimeout:
+        return job_timeout_response()
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+def job_links(job) -> Dict:
+    return {'job_id': job.id, 'status_url': f'/jobs/{job.id}', 'events_url': f'/jobs/{job.id}/events'}
+
+@app.route('/jobs', methods=['POST'])
+def submit_job():
+    """Queue a search_cnr, check_listing or download_causelist request; answers at once with the job's URLs"""
+    data = request.json or {}
+    build = JOB_TYPES.get(data.get('job'))
+    if not build:
+        return jsonify({'error': f"job must be one of {', '.join(JOB_TYPES)}"}), 400
+    try:
+        method, kwargs, failure = build(data)
+        job = get_jobs().submit(data.get('job'), method, kwargs, failure)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except RuntimeError as e:
+        return jsonify({'error': str(e)}), 503
+    return jsonify(job_links(job)), 202
+
+@app.route('/batches', methods=['POST'])
+def submit_batch():
+    """Queue a CNR search (or, with "job": "check_listing", a listing check) for each of many CNRs"""
+    data = request.json or {}
+    job_type = data.get('job', 'search_cnr')
+    if job_type not in ('search_cnr', 'check_listing'):
+        return jsonify({'error': 'batches run search_cnr or check_listing jobs'}), 400
+    cnrs = data.get('cnrs') or []
+    if not isinstance(cnrs, list) or not all(isinstance(cnr, str) for cnr in cnrs):
+        return jsonify({'error': 'cnrs must be a list of strings'}), 400
+    cnrs = [cnr.strip() for cnr in cnrs if cnr.strip()]
+    if not cnrs:
+        return jsonify({'error': 'cnrs is required'}), 400
+    if len(cnrs) > config.WEB_MAX_BATCH:
+        return jsonify({'error': f'At most {config.WEB_MAX_BATCH} CNRs per batch'}), 400
+    try:
+        calls = [(job_type, *JOB_TYPES[job_type]({**data, 'cnr': cnr})) for cnr in dict.fromkeys(cnrs)]
+        batch_id, jobs = get_jobs().submit_batch(calls)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except RuntimeError as e:
+        return jsonify({'error': str(e)}), 503
+    return jsonify({'batch_id': batch_id, 'status_url': f'/batches/{batch_id}',
+                    'jobs': [job_links(job) for job in jobs]}), 202
+
+@app.route('/jobs/<job_id>')
+def job_status(job_id):
+    job = get_jobs().get(job_id)
+    if not job:
+        return jsonify({'error': 'Unknown or expired job'}), 404
+    return jsonify(job.to_dict())
+
+@app.route('/jobs/<job_id>/events')
+def job_events(job_id):
+    """Server-Sent Events: a "stage" event per stage the job reaches, then "done" with the finished job"""
+    jobs = get_jobs()
+    job = jobs.get(job_id)
+    if not job:
+        return jsonify({'error': 'Unknown or expired job'}), 404
+
+    def stream():
+        seen = 0
+        while True:
+            events = jobs.wait(job, seen, timeout=config.WEB_EVENTS_KEEPALIVE)
+            seen += len(events)
+            for event in events:
+                yield f"event: stage\ndata: {json.dumps(event)}\n\n"
+            if job.is_finished and len(job.events) == seen:
+                yield f"event: done\ndata: {json.dumps(job.to_dict())}\n\n"
+                return
+            if not events:
+                # Keeps proxies from closing a stream that is waiting on a slow stage
+                yield ": keep-alive\n\n"
+
+    return Response(stream(), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+@app.route('/batches/<batch_id>')
+def batch_status(batch_id):
+    batch = get_jobs().batch(batch_id)
+    if batch is None:
+        return jsonify({'error': 'Unknown or expired batch'}), 404
+    counts = {status: sum(job.status == status for job in batch) for status in ('queued', 'running', 'done', 'failed')}
+    return jsonify({'batch_id': batch_id, 'total': len(batch), **counts,
+                    'finished': all(job.is_finished for job in batch),
+                    'jobs': [job.to_dict() for job in batch]})
+
+@app.route('/search_cause_lists')
+def search_cause_lists():
+    advocate = request.args.get('advocate')
+    party = request.args.get('party')
+    if not advocate and not party:
+        return jsonify({'error': 'advocate or party is required'}), 400
+
+    try:
+        results = get_cause_list_index().search(
+            advocate=advocate,
+            party=party,
+            court_complex=request.args.get('court_complex'),
+            date_from=request.args.get('from'),
+            date_to=request.args.get('to'),
+            limit=request.args.get('limit', config.CAUSE_LIST_SEARCH_LIMIT, type=int)
+        )
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    return jsonify({'success': True, 'count': len(results), 'truncated': results.truncated, 'data': results})
+
+@app.route('/cache_stats')
+def cache_stats():
+    if not config.CASE_CACHE_ENABLED:
+        return jsonify({'enabled': False})
+    # Counters are kept in the cache database, so no browser is needed
+    return jsonify({'enabled': True, **get_case_cache().stats()})
+
+def court_options_response(*path):
+    """Names one level below a path of the court hierarchy, opening the portal only when they are not cached"""
+    try:
+        options = get_court_hierarchy().options(*path)
+        if options is None:
+            options = get_worker().call('court_options', *path)
+        if options is None:
+            return jsonify({'error': 'Could not load options from eCourts'}), 503
+        return jsonify([option['name'] for option in options])
+    except JobTimeout:
+        return job_timeout_response()
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 @app.route('/get_states')
 def get_states():
-    # Return list of Indian states
-    states = [
-        "Andaman and Nicobar", "Andhra Pradesh", "Arunachal Pradesh", "Assam", 
-        "Bihar", "Chandigarh", "Chhattisgarh", "Delhi", "Goa", "Gujarat", 
-        "Haryana", "Himachal Pradesh", "Jammu and Kashmir", "Jharkhand", 
-        "Karnataka", "Kerala", "Ladakh", "Lakshadweep", "Madhya Pradesh", 
-        "Maharashtra", "Manipur", "Meghalaya", "Mizoram", "Nagaland", 
-        "Odisha", "Puducherry", "Punjab", "Rajasthan", "Sikkim", 
-        "Tamil Nadu", "Telangana", "Tripura", "Uttarakhand", "Uttar Pradesh", 
-        "West Bengal"
-    ]
-    return jsonify(states)
-
-@app.teardown_appcontext
-def cleanup(error=None):
-    global scraper
-    if scraper:
-        scraper.close()
-        scraper = None
+    return court_options_response()
+
+@app.route('/get_districts')
+def get_districts():
+    state = request.args.get('state')
+    if not state:
+        return jsonify({'error': 'state is required'}), 400
+    return court_options_response(state)
+
+@app.route('/get_court_complexes')
+def get_court_complexes():
+    state, district = request.args.get('state'), request.args.get('district')
+    if not state or not district:
+        return jsonify({'error': 'state and district are required'}), 400
+    return court_options_response(state, district)
+
+@app.route('/get_courts')
+def get_courts():
+    path = [request.args.get(name) for name in ('state', 'district', 'court_complex')]
+    if not all(path):
+        return jsonify({'error': 'state, district and court_complex are required'}), 400
+    return court_options_response(*path)
+
+@app.route('/worker_stats')
+def worker_stats():
+    return jsonify(get_worker().stats())
 
 if __name__ == '__main__':
     print("Starting eCourts Scraper Web Interface...")